@@ -0,0 +1,203 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, NoReturn, Tuple
+
+from catalog import Catalog
+from scriptrunner import ErrorPolicy, ScriptReport
+from tools.checks import get_validation_mode, set_validation_mode
+from tools.formatting import format_error_message
+
+# The CLI of a worker process. It is created once per process (creating it loads the plugin commands), and the character
+# is swapped for each job.
+_worker_cli = None
+
+
+class CharacterResult:
+    """
+    The outcome of running the batch script on one character. Only plain values are kept, so that results are cheap to
+    send back from the worker processes.
+    """
+
+    def __init__(self, name: str, level: int, file: str):
+        assert isinstance(name, str)
+        assert isinstance(level, int)
+        assert isinstance(file, str)
+
+        self.name: str = name
+        self.level: int = level
+        self.file: str = file
+        self.output: str = ""
+        # The save files written back after the script (see 'write_back' of 'run_batch')
+        self.written: List[str] = []
+        # Set if the character could not be loaded (no commands are run)
+        self.load_error: str = None
+        self.report: ScriptReport = None
+
+    def is_ok(self) -> bool:
+        return self.load_error is None and self.report is not None and self.report.n_errors == 0
+
+    def to_dict(self) -> dict:
+        d: dict = {"name": self.name, "level": self.level, "file": self.file, "ok": self.is_ok(),
+                   "load_error": self.load_error, "output": self.output, "written": self.written}
+        if self.report is not None:
+            d.update({"n_commands": self.report.n_commands, "n_errors": self.report.n_errors,
+                      "stopped": self.report.stopped, "elapsed": self.report.elapsed,
+                      "errors": [{"command_number": number, "command": command_str, "message": message}
+                                 for number, command_str, message in self.report.errors]})
+
+        return d
+
+
+class BatchReport:
+    def __init__(self, results: List[CharacterResult], n_workers: int, elapsed: float):
+        assert isinstance(n_workers, int)
+        assert isinstance(elapsed, float)
+
+        self.results: List[CharacterResult] = results
+        self.n_workers: int = n_workers
+        self.elapsed: float = elapsed
+
+    def get_failed(self) -> List[CharacterResult]:
+        return [result for result in self.results if not result.is_ok()]
+
+    def get_summary(self) -> str:
+        summary: str = "Ran the script on " + str(len(self.results)) + " character(s) with " + str(self.n_workers) + \
+                       " worker(s) in " + str(round(self.elapsed, 3)) + " s, " + str(len(self.get_failed())) + \
+                       " with errors"
+        for result in self.get_failed():
+            if result.load_error is not None:
+                summary += "\n" + format_error_message(result.name + ": could not load " + result.file + ": " +
+                                                       result.load_error)
+            else:
+                summary += "\n" + format_error_message(result.name + ": " + str(result.report.n_errors) +
+                                                       " failed command(s)")
+
+        return summary
+
+    def to_dict(self) -> dict:
+        return {"n_characters": len(self.results), "n_failed": len(self.get_failed()), "n_workers": self.n_workers,
+                "elapsed": self.elapsed, "characters": [result.to_dict() for result in self.results]}
+
+    def write_json(self, file: Path) -> NoReturn:
+        assert isinstance(file, Path)
+
+        with open(file, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def find_batch_characters(path: Path) -> List[Tuple[str, int, Path]]:
+    """
+    :param path: A save directory
+    :return: The name, latest saved level and save file of every character of the directory
+    """
+    assert isinstance(path, Path)
+
+    catalog: Catalog = Catalog(path)
+    characters: List[Tuple[str, int, Path]] = []
+    for name in catalog.get_characters():
+        levels: Dict[int, Path] = catalog.get_levels(name)
+        level: int = max(levels.keys())
+        characters.append((name, level, levels[level]))
+
+    return characters
+
+
+def run_character(name: str, level: int, file: Path, path: Path, command_strs: List[str], policy: ErrorPolicy,
+                  write_back: bool = False) -> CharacterResult:
+    """
+    Load a character and run a script on it. All output is captured in the result. This is the job of a worker process.
+
+    The characters of a job are kept in the session cache of the worker CLI, which is cleared after the job. With
+    write-back, the characters that the script changed (the character, and the characters it switched to) are saved.
+    """
+    global _worker_cli
+
+    # Imported here, so that importing this module does not import the CLI module (which imports this module)
+    from oblivionlevelmanagercli import OblivionLevelManagerCLI
+    from levelarchive import load_level
+
+    result: CharacterResult = CharacterResult(name, level, file.name)
+    try:
+        character = load_level(file, level)
+    except Exception as e:
+        result.load_error = str(e)
+        return result
+
+    if _worker_cli is None or _worker_cli.path != path:
+        with redirect_stdout(StringIO()):
+            _worker_cli = OblivionLevelManagerCLI(character, path)
+    _worker_cli.cache.put(character, saved=True)
+    _worker_cli.character = character
+
+    output: StringIO = StringIO()
+    result.report = ScriptReport()
+    with redirect_stdout(output):
+        try:
+            _worker_cli.run_commands(command_strs, policy, result.report)
+        except SystemExit:
+            # 'quit' ends the script of this character
+            pass
+    result.output = output.getvalue()
+
+    if write_back:
+        try:
+            result.written = [written_file.name for written_file in _worker_cli.cache.flush()]
+        except Exception as e:
+            result.report.add_error("(write-back)", str(e))
+    _worker_cli.cache.clear()
+
+    return result
+
+
+def run_batch(path: Path, command_strs: List[str], policy: ErrorPolicy = ErrorPolicy.STOP,
+              n_workers: int = None, write_back: bool = False) -> BatchReport:
+    """
+    Run a script on every character of a save directory, in parallel. Each character is handled by a single worker, so
+    characters are independent of each other.
+
+    :param path: The save directory
+    :param command_strs: The commands of the script
+    :param policy: What to do when a command fails (for each character)
+    :param n_workers: The number of worker processes (default: number of CPUs)
+    :param write_back: Whether to save the characters changed by the script
+    :return: The results of all characters, in the order of the character names
+    """
+    assert isinstance(path, Path)
+    assert isinstance(policy, ErrorPolicy)
+    assert isinstance(n_workers, int) or n_workers is None
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    characters: List[Tuple[str, int, Path]] = find_batch_characters(path)
+    command_strs = list(command_strs)
+
+    start: float = perf_counter()
+    is_parallel: bool = n_workers > 1 and len(characters) > 1
+    if not is_parallel:
+        results: List[CharacterResult] = [run_character(name, level, file, path, command_strs, policy, write_back)
+                                          for name, level, file in characters]
+    else:
+        n_workers = min(n_workers, len(characters))
+        # Several characters per task, so that the per-task overhead does not matter for small scripts
+        chunk_size: int = max(1, len(characters) // (4 * n_workers))
+        n: int = len(characters)
+        # Workers use the validation mode of this process
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=set_validation_mode,
+                                 initargs=(get_validation_mode(),)) as executor:
+            results = list(executor.map(run_character, [c[0] for c in characters], [c[1] for c in characters],
+                                        [c[2] for c in characters], [path] * n, [command_strs] * n, [policy] * n,
+                                        [write_back] * n, chunksize=chunk_size))
+    elapsed: float = perf_counter() - start
+
+    # Workers may have saved concurrently (with write-back, or with 'save' in the script), so catalog updates of
+    # different processes may have been lost. Appends to archives do not change the directory: the catalog cannot tell
+    if is_parallel or write_back:
+        Catalog(path).rebuild(write=True)
+
+    return BatchReport(results, n_workers, elapsed)
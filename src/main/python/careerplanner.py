@@ -0,0 +1,149 @@
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from character import Character
+from levelplanner import LevelPlan, MAX_ATTRIBUTE_VALUE, TriplePlan, solve_level
+
+# Upper bound of the per-level gain of an attribute (attributes without governing skills, i.e. Luck, always gain +1)
+MAX_ATTRIBUTE_GAIN: int = 5
+
+
+class CareerPlanner:
+    def __init__(self, character: Character, max_levels: int = 100, max_nodes: int = 2000, max_memo: int = 100000):
+        """
+        Plan the level-ups that max all attributes in the fewest levels.
+
+        :param character: The character to plan for (it is not modified)
+        :param max_levels: Plans longer than this are not considered
+        :param max_nodes: Maximum number of expanded states; the best plan found so far is returned when reached
+        :param max_memo: Maximum number of states kept in the memo table (least recently seen are dropped first)
+        """
+        assert isinstance(character, Character)
+        assert isinstance(max_levels, int)
+        assert isinstance(max_nodes, int)
+        assert isinstance(max_memo, int)
+
+        self.character: Character = character
+        self.max_levels: int = max_levels
+        self.max_nodes: int = max_nodes
+        self.max_memo: int = max_memo
+
+        attribute_idx: Dict[int, int] = {id(attribute): i for i, attribute in enumerate(character.attributes)}
+        self._skill_majors: Tuple[bool, ...] = tuple([skill.is_major for skill in character.skills])
+        self._skill_attributes: Tuple[int, ...] = tuple([attribute_idx[id(skill.attribute)]
+                                                         for skill in character.skills])
+        self._max_gains: Tuple[int, ...] = tuple([MAX_ATTRIBUTE_GAIN if len(attribute.skills) > 0 else 1
+                                                  for attribute in character.attributes])
+
+        self._memo: OrderedDict = OrderedDict()
+        self._nodes: int = 0
+        self._exhausted: bool = False
+        self._best: List[TriplePlan] = []
+        self._best_levels: int = max_levels + 1
+        self._lower_bound: int = 0
+
+    def solve(self) -> List[LevelPlan]:
+        """
+        Search the sequence of level-ups (attribute triples and skill increases of each level) that maxes all
+        attributes in the fewest levels. The first plan is for the current level of the character, and it takes into
+        account the skill increases already made in it.
+
+        :return: One plan per level (empty if the attributes cannot be maxed within 'max_levels' levels, or if the
+            search was cut by 'max_nodes' before any plan was found, see 'is_exhausted')
+        """
+        character: Character = self.character
+
+        skill_values: Tuple[int, ...] = tuple([skill.value for skill in character.skills])
+        skill_level_ups: Tuple[int, ...] = tuple([skill.level_ups for skill in character.skills])
+        attribute_values: Tuple[int, ...] = tuple([attribute.value for attribute in character.attributes])
+
+        self._memo.clear()
+        self._nodes = 0
+        self._exhausted = False
+        self._best = []
+        self._best_levels = self.max_levels + 1
+        self._lower_bound = self._get_lower_bound(attribute_values)
+
+        self._search(skill_values, skill_level_ups, attribute_values, [])
+
+        return [LevelPlan([character.attributes[a] for a in triple], list(gains),
+                          [(character.skills[i], n) for i, n in enumerate(increases) if n > 0])
+                for triple, gains, increases in self._best]
+
+    def is_optimal(self) -> bool:
+        """
+        :return: Whether the last solution is proven to be optimal (i.e. the search was not cut by 'max_nodes')
+        """
+        return len(self._best) > 0 and (not self._exhausted or len(self._best) == self._lower_bound)
+
+    def is_exhausted(self) -> bool:
+        """
+        :return: Whether the last search was cut by 'max_nodes' (i.e. an empty solution does not mean there is no plan)
+        """
+        return self._exhausted
+
+    def _search(self, skill_values: Tuple[int, ...], skill_level_ups: Tuple[int, ...],
+                attribute_values: Tuple[int, ...], path: List[TriplePlan]) -> bool:
+        # Returns true when the search can stop (i.e. a plan matching the lower bound was found)
+        depth: int = len(path)
+
+        if all([value >= MAX_ATTRIBUTE_VALUE for value in attribute_values]):
+            if depth < self._best_levels:
+                self._best = list(path)
+                self._best_levels = depth
+            return depth <= self._lower_bound
+
+        # Branch and bound: even the best case cannot beat the best plan found so far
+        if depth + self._get_lower_bound(attribute_values) >= self._best_levels:
+            return False
+
+        if self._nodes >= self.max_nodes:
+            self._exhausted = True
+            return True
+        self._nodes += 1
+
+        # A state that was already reached at the same or a smaller depth cannot lead to a better plan
+        key: bytes = _encode_state(skill_values, skill_level_ups, attribute_values)
+        seen_depth = self._memo.get(key)
+        if seen_depth is not None and seen_depth <= depth:
+            self._memo.move_to_end(key)
+            return False
+        self._memo[key] = depth
+        self._memo.move_to_end(key)
+        if len(self._memo) > self.max_memo:
+            self._memo.popitem(last=False)
+
+        children = []
+        for triple, gains, increases in solve_level(skill_values, skill_level_ups, self._skill_majors,
+                                                    self._skill_attributes, attribute_values):
+            next_attribute_values: List[int] = list(attribute_values)
+            for a, gain in zip(triple, gains):
+                next_attribute_values[a] = min(MAX_ATTRIBUTE_VALUE, next_attribute_values[a] + gain)
+            next_skill_values = tuple([v + u + n for v, u, n in zip(skill_values, skill_level_ups, increases)])
+            children.append((self._get_lower_bound(next_attribute_values), -sum(gains), sum(increases),
+                             (triple, gains, increases), next_skill_values, tuple(next_attribute_values)))
+
+        # Most promising level-ups first, so that a good plan (and therefore a tight cut-off) is found early
+        children.sort(key=lambda child: child[:3])
+
+        no_level_ups: Tuple[int, ...] = (0,) * len(skill_values)
+        for _, _, _, plan, next_skill_values, next_attribute_values in children:
+            path.append(plan)
+            stop: bool = self._search(next_skill_values, no_level_ups, next_attribute_values, path)
+            path.pop()
+            if stop:
+                return True
+
+        return False
+
+    def _get_lower_bound(self, attribute_values) -> int:
+        # Every attribute gains at most 'max gain' per level
+        return max([-(-max(0, MAX_ATTRIBUTE_VALUE - value) // max_gain)
+                    for value, max_gain in zip(attribute_values, self._max_gains)])
+
+
+def _encode_state(skill_values: Tuple[int, ...], skill_level_ups: Tuple[int, ...],
+                  attribute_values: Tuple[int, ...]) -> bytes:
+    # Compact, hashable encoding of a state (two bytes per value)
+    return array("h", skill_values + skill_level_ups + attribute_values).tobytes()
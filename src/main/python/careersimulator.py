@@ -0,0 +1,308 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Dict, List, NoReturn
+
+import numpy as np
+
+from character import Character
+from characterstate import CharacterState, GAIN_TABLE, MAJOR_SKILLS_INCREASE_PER_LEVEL, MAX_ATTRIBUTE_SKILLS_INCREASE, \
+    MAX_SKILL_VALUE
+from levelplanner import MAX_ATTRIBUTE_VALUE
+from tools.namedobject import find_unique_by_name
+
+# Careers simulated together (as the rows of the state arrays) by a worker
+DEFAULT_BATCH_SIZE: int = 10000
+
+# Key offset of each tier of attributes when sampling level-up triples (see '_sample_triples')
+_TIER_SCORE: float = 1e9
+
+
+class TrainingStrategy:
+    """
+    How a simulated player trains: each skill increase goes to a random skill, with probability proportional to the
+    weight of the skill (among the skills that are below 100).
+
+    With 'minors_first', the three attributes of each level are chosen when the level starts, and the minor skills of
+    these attributes are trained first (until the attributes reach the maximum gain), then the major skills. Otherwise,
+    the attributes are chosen at the level-up, with probability proportional to their gains.
+    """
+
+    def __init__(self, skill_weights: Dict[str, float] = None, minors_first: bool = False, default_weight: float = 1.0):
+        """
+        :param skill_weights: Weights of skills (skill name -> weight). Names are matched as by the other commands
+        :param minors_first: Whether to train the minor skills of the planned attributes before the major skills
+        :param default_weight: The weight of the skills that are not in skill_weights
+        """
+        assert isinstance(skill_weights, dict) or skill_weights is None
+        assert isinstance(minors_first, bool)
+        assert default_weight >= 0
+
+        self.skill_weights: Dict[str, float] = {} if skill_weights is None else dict(skill_weights)
+        self.minors_first: bool = minors_first
+        self.default_weight: float = default_weight
+
+        for name, weight in self.skill_weights.items():
+            if weight < 0:
+                raise ValueError("Skill weights cannot be negative: " + name)
+
+    @staticmethod
+    def parse(args: List[str]) -> "TrainingStrategy":
+        """
+        :param args: Strategy arguments: 'minors-first', 'skill=weight' and 'default=weight'
+        :return: The strategy
+        """
+        skill_weights: Dict[str, float] = {}
+        minors_first: bool = False
+        default_weight: float = 1.0
+        for arg in args:
+            if arg == "minors-first":
+                minors_first = True
+            elif "=" in arg:
+                name, weight = arg.split("=", 1)
+                if name == "default":
+                    default_weight = float(weight)
+                else:
+                    skill_weights[name] = float(weight)
+            else:
+                raise ValueError("Unknown strategy argument: " + arg)
+
+        return TrainingStrategy(skill_weights, minors_first, default_weight)
+
+    def get_weights(self, character: Character) -> np.ndarray:
+        """
+        :return: The weight of each skill of the character, in skill order
+        """
+        assert isinstance(character, Character)
+
+        weights: np.ndarray = np.full(len(character.skills), self.default_weight, dtype=np.float64)
+        for name, weight in self.skill_weights.items():
+            weights[find_unique_by_name(character.skills, name, "skill")] = weight
+
+        return weights
+
+
+class SimulationResult:
+    """
+    Distribution of the final attribute values and levels of simulated careers, as histograms (so that results of
+    different workers are merged by adding counts).
+    """
+
+    def __init__(self, attribute_names: List[str], attribute_counts: np.ndarray, level_counts: np.ndarray,
+                 elapsed: float = 0.0):
+        """
+        :param attribute_names: The attribute names
+        :param attribute_counts: Array of shape (n_attributes, n_values): number of careers that ended with each value
+        :param level_counts: Number of careers that ended at each level
+        :param elapsed: The wall time of the simulation (in seconds)
+        """
+        self.attribute_names: List[str] = attribute_names
+        self.attribute_counts: np.ndarray = attribute_counts
+        self.level_counts: np.ndarray = level_counts
+        self.elapsed: float = elapsed
+
+    def merge(self, other: "SimulationResult") -> NoReturn:
+        assert self.attribute_counts.shape == other.attribute_counts.shape
+        assert self.level_counts.shape == other.level_counts.shape
+
+        self.attribute_counts = self.attribute_counts + other.attribute_counts
+        self.level_counts = self.level_counts + other.level_counts
+
+    def get_n_careers(self) -> int:
+        return int(self.level_counts.sum())
+
+    def get_mean_attributes(self) -> np.ndarray:
+        values: np.ndarray = np.arange(self.attribute_counts.shape[1])
+
+        return (self.attribute_counts * values).sum(axis=1) / self.get_n_careers()
+
+    def get_attribute_quantiles(self, q: float) -> np.ndarray:
+        return np.array([_get_quantile(counts, q) for counts in self.attribute_counts])
+
+    def get_mean_level(self) -> float:
+        return float((self.level_counts * np.arange(len(self.level_counts))).sum() / self.get_n_careers())
+
+    def get_level_quantile(self, q: float) -> int:
+        return _get_quantile(self.level_counts, q)
+
+
+def simulate_careers(character: Character, strategy: TrainingStrategy, n_careers: int, n_levels: int,
+                     n_workers: int = None, seed: int = None, batch_size: int = DEFAULT_BATCH_SIZE) -> SimulationResult:
+    """
+    Simulate careers from the current state of a character (which is not modified): skills are increased one at a time
+    as the strategy dictates, and the character levels up (see 'Character.level_up') as soon as it can, until n_levels
+    level-ups, or until it cannot level up anymore (i.e. when no major skill can be increased). Attributes are capped at
+    100, as in 'CareerPlanner'.
+
+    :param character: The character
+    :param strategy: The training strategy
+    :param n_careers: The number of careers
+    :param n_levels: The maximum number of level-ups of each career
+    :param n_workers: The number of worker processes (default: number of CPUs)
+    :param seed: Random seed. The result does not depend on the number of workers
+    :param batch_size: The number of careers simulated together (by a single worker)
+    :return: The distribution of the final attributes and levels
+    """
+    assert isinstance(character, Character)
+    assert isinstance(strategy, TrainingStrategy)
+    assert isinstance(n_careers, int) and n_careers > 0
+    assert isinstance(n_levels, int) and n_levels >= 0
+    assert isinstance(n_workers, int) or n_workers is None
+    assert isinstance(batch_size, int) and batch_size > 0
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    state: CharacterState = CharacterState.from_character(character)
+    weights: np.ndarray = strategy.get_weights(character)
+
+    sizes: List[int] = [min(batch_size, n_careers - start) for start in range(0, n_careers, batch_size)]
+    seeds: List[np.random.SeedSequence] = np.random.SeedSequence(seed).spawn(len(sizes))
+    n: int = len(sizes)
+
+    start: float = perf_counter()
+    if n_workers == 1 or n == 1:
+        results: List[SimulationResult] = [simulate_batch(state, weights, strategy.minors_first, n_levels, size,
+                                                          batch_seed)
+                                           for size, batch_seed in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, n)) as executor:
+            results = list(executor.map(simulate_batch, [state] * n, [weights] * n, [strategy.minors_first] * n,
+                                        [n_levels] * n, sizes, seeds))
+
+    result: SimulationResult = results[0]
+    for other in results[1:]:
+        result.merge(other)
+    result.elapsed = perf_counter() - start
+
+    return result
+
+
+def simulate_batch(state: CharacterState, weights: np.ndarray, minors_first: bool, n_levels: int, n_careers: int,
+                   seed=None) -> SimulationResult:
+    """
+    Simulate careers together: the state of all careers is kept in arrays of shape (n_careers, ...), and every step
+    increases one skill of each career that is still training. This is the job of a worker process.
+
+    :param state: The initial state
+    :param weights: The weight of each skill (see 'TrainingStrategy')
+    :param minors_first: See 'TrainingStrategy'
+    :param n_levels: The maximum number of level-ups
+    :param n_careers: The number of careers
+    :param seed: Random seed (or SeedSequence)
+    :return: The distribution of the final attributes and levels
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    weights = weights.astype(np.float32)
+    skill_majors: np.ndarray = state.skill_majors
+    skill_attributes: np.ndarray = state.skill_attributes
+    matrix: np.ndarray = state.skill_attribute_matrix
+    n_attributes: int = matrix.shape[1]
+
+    skill_values: np.ndarray = np.tile(state.skill_values.astype(np.int32), (n_careers, 1))
+    skill_level_ups: np.ndarray = np.tile(state.skill_level_ups.astype(np.int32), (n_careers, 1))
+    attribute_values: np.ndarray = np.tile(state.attribute_values.astype(np.int32), (n_careers, 1))
+    levels: np.ndarray = np.full(n_careers, state.level, dtype=np.int32)
+    # Careers that can still level up
+    active: np.ndarray = np.ones(n_careers, dtype=bool)
+
+    trained_majors: np.ndarray = skill_majors & (weights > 0)
+    # Attribute scores of the plan of 'minors first': the total weight of the minor skills of each attribute
+    minor_weights: np.ndarray = np.where(skill_majors, 0.0, weights) @ matrix
+
+    for _ in range(n_levels):
+        planned: np.ndarray = None
+        if minors_first:
+            with np.errstate(divide="ignore"):
+                scores: np.ndarray = np.broadcast_to(np.log(minor_weights), attribute_values.shape)
+            planned = _sample_triples(rng, scores, attribute_values)
+            planned_skills: np.ndarray = np.zeros((n_careers, n_attributes), dtype=bool)
+            np.put_along_axis(planned_skills, planned, True, axis=1)
+            planned_skills = planned_skills[:, skill_attributes] & ~skill_majors & (weights > 0)
+
+        # Kept up to date by every increase (skill values only change at level-ups), so that each step only touches
+        # the careers that are still training
+        countable: np.ndarray = skill_majors & (skill_values < MAX_SKILL_VALUE)
+        major_increase: np.ndarray = (skill_level_ups * countable).sum(axis=1)
+        headroom: np.ndarray = (MAX_SKILL_VALUE - skill_values - skill_level_ups).astype(np.int16)
+        attribute_increases: np.ndarray = skill_level_ups @ matrix
+
+        rows: np.ndarray = np.nonzero(active)[0]
+        while True:
+            row_trainable: np.ndarray = headroom[rows] > 0
+            training: np.ndarray = major_increase[rows] < MAJOR_SKILLS_INCREASE_PER_LEVEL
+            stuck: np.ndarray = training & ~(row_trainable & trained_majors).any(axis=1)
+            active[rows[stuck]] = False
+            training &= ~stuck
+            rows = rows[training]
+            if len(rows) == 0:
+                break
+
+            row_trainable = row_trainable[training]
+            row_weights: np.ndarray = row_trainable * weights
+            if minors_first:
+                # Planned minors, while their attribute has not reached the maximum gain
+                open_minors: np.ndarray = planned_skills[rows] & row_trainable & \
+                    (attribute_increases[rows] < MAX_ATTRIBUTE_SKILLS_INCREASE)[:, skill_attributes]
+                row_weights = np.where(open_minors.any(axis=1)[:, None], open_minors * weights,
+                                       skill_majors * row_weights)
+
+            idx: np.ndarray = _sample_indices(rng, row_weights)
+            skill_level_ups[rows, idx] += 1
+            headroom[rows, idx] -= 1
+            major_increase[rows] += countable[rows, idx]
+            attribute_increases[rows, skill_attributes[idx]] += 1
+
+        rows = np.nonzero(active)[0]
+        if len(rows) == 0:
+            break
+
+        gains: np.ndarray = GAIN_TABLE[np.clip(skill_level_ups[rows] @ matrix, 0, len(GAIN_TABLE) - 1)]
+        if planned is None:
+            triples: np.ndarray = _sample_triples(rng, np.log(gains), attribute_values[rows])
+        else:
+            triples = planned[rows]
+        new_values: np.ndarray = np.take_along_axis(attribute_values[rows], triples, axis=1) + \
+            np.take_along_axis(gains, triples, axis=1)
+        # Values above 100 (e.g. set by the user) are kept
+        capped: np.ndarray = np.maximum(np.take_along_axis(attribute_values[rows], triples, axis=1),
+                                        np.minimum(new_values, MAX_ATTRIBUTE_VALUE))
+        attribute_values[rows[:, None], triples] = capped
+
+        skill_values[rows] += skill_level_ups[rows]
+        skill_level_ups[rows] = 0
+        levels[rows] += 1
+
+    n_values: int = max(MAX_ATTRIBUTE_VALUE, int(state.attribute_values.max())) + 1
+    attribute_counts: np.ndarray = np.stack([np.bincount(attribute_values[:, a], minlength=n_values)
+                                             for a in range(n_attributes)])
+    level_counts: np.ndarray = np.bincount(levels, minlength=state.level + n_levels + 1)
+
+    return SimulationResult(list(state.attribute_names), attribute_counts, level_counts)
+
+
+def _sample_indices(rng: np.random.Generator, weights: np.ndarray) -> np.ndarray:
+    # One index per row, with probability proportional to the weights of the row (inverse CDF sampling)
+    cumulative: np.ndarray = np.cumsum(weights, axis=1)
+    u: np.ndarray = rng.random(len(weights)) * cumulative[:, -1]
+
+    return (cumulative <= u[:, None]).sum(axis=1)
+
+
+def _sample_triples(rng: np.random.Generator, scores: np.ndarray, attribute_values: np.ndarray) -> np.ndarray:
+    # Three distinct attributes per row, drawn one after the other with probability proportional to exp(score) (Gumbel
+    # top-k). Attributes with a zero weight (score -inf) and maxed attributes are only chosen (in random order) if there
+    # are not enough other attributes.
+    finite: np.ndarray = np.isfinite(scores)
+    keys: np.ndarray = np.where(finite, scores + rng.gumbel(size=scores.shape), rng.random(scores.shape))
+    tiers: np.ndarray = 2 * (attribute_values >= MAX_ATTRIBUTE_VALUE) + ~finite
+
+    return np.argpartition(_TIER_SCORE * tiers - keys, 2, axis=1)[:, :3]
+
+
+def _get_quantile(counts: np.ndarray, q: float) -> int:
+    assert 0 <= q <= 1
+
+    cumulative: np.ndarray = np.cumsum(counts)
+
+    return int(np.searchsorted(cumulative, max(q * cumulative[-1], 1)))
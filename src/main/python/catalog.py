@@ -0,0 +1,218 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, NoReturn, Optional, Set
+
+from levelarchive import LevelArchive, parse_archive_file_name
+from savefile import LEGACY_SAVE_FILE_SUFFIX, parse_save_file_name
+
+CATALOG_FILE_NAME: str = ".olm-catalog.json"
+CATALOG_VERSION: int = 1
+
+
+class Catalog:
+    """
+    Index of the save files of a directory: character name -> level -> file, offset and modification time. The levels of
+    a character are saved in its level archive (see 'LevelArchive'); save files of single levels are also supported, but
+    the archive takes precedence. The offset of a level in its archive is as cataloged, the archive table is the
+    authority (e.g. after a level was saved again).
+
+    The index is kept in a file of the directory, which is only written on saves. It is stale when the directory has
+    changed after it was written (i.e. the directory mtime is newer than the catalog mtime), in which case it is lazily
+    rebuilt (in memory) with a single scan of the directory. Checking for staleness takes a stat call, or two when the
+    directory has changed; on a save, a changed directory is also listed, so that only the file of the save itself is
+    not taken for a change. A directory that does not exist has no saves.
+    """
+
+    def __init__(self, path: Path):
+        assert isinstance(path, Path)
+
+        self.path: Path = path
+        self.file: Path = path / CATALOG_FILE_NAME
+        self._characters: Dict[str, Dict[int, dict]] = None
+        # The mtime of the catalog file when it was last read or written by this object (None if it was not)
+        self._mtime: int = None
+        # The mtime of the directory when the index in memory was last known to be fresh
+        self._directory_mtime: int = None
+        # The names of the save files (and archives) of the directory, as last known
+        self._files: Set[str] = set()
+
+    def get_characters(self) -> List[str]:
+        self._ensure_fresh()
+
+        return sorted(self._characters.keys())
+
+    def get_levels(self, name: str) -> Dict[int, Path]:
+        """
+        :param name: The name of the character
+        :return: The save file of each saved level of the character (empty if the character does not exist)
+        """
+        assert isinstance(name, str)
+
+        self._ensure_fresh()
+
+        levels: Dict[int, dict] = self._characters.get(name, {})
+
+        return {level: self.path / entry["file"] for level, entry in sorted(levels.items())}
+
+    def get_entry(self, name: str, level: int) -> dict:
+        """
+        :return: The catalog entry ('file', 'offset' and 'mtime') of a saved level
+        """
+        self._ensure_fresh()
+
+        try:
+            return self._characters[name][level]
+        except KeyError:
+            raise ValueError("No save of character '" + name + "' for level " + str(level))
+
+    def add(self, name: str, level: int, file: Path, offset: int = 0) -> NoReturn:
+        """
+        Record a save and atomically update the catalog file.
+
+        :param name: The name of the character
+        :param level: The saved level
+        :param file: The file the level was saved to (in the catalog directory)
+        :param offset: The offset of the level record in the file
+        """
+        assert isinstance(name, str)
+        assert isinstance(level, int)
+        assert isinstance(file, Path)
+        assert isinstance(offset, int)
+
+        # The save itself may have created its file, which changes the directory but does not make the index stale. Any
+        # other change of the directory (e.g. a file copied in or removed, or the catalog written by another process) is
+        # picked up before writing, since writing marks the catalog as up-to-date with the directory
+        if self._characters is None or (os.stat(self.path).st_mtime_ns != self._directory_mtime and
+                                        (self._get_catalog_mtime() != self._mtime or
+                                         self._list_files() - {file.name} != self._files - {file.name})):
+            self._ensure_fresh()
+
+        self._characters.setdefault(name, {})[level] = {"file": file.name, "offset": offset,
+                                                        "mtime": file.stat().st_mtime_ns}
+        self._files.add(file.name)
+        self._write()
+
+    def rebuild(self, write: bool = False) -> NoReturn:
+        """
+        Scan the directory.
+
+        :param write: Whether to also write the catalog file (e.g. after saves that may have been missed)
+        """
+        characters: Dict[str, Dict[int, dict]] = {}
+        files: Set[str] = set()
+
+        try:
+            # Before the scan, so that changes during the scan make the index stale
+            directory_mtime: int = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            self._characters = {}
+            self._directory_mtime = None
+            self._files = set()
+            return
+
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+
+                archive_name: str = parse_archive_file_name(entry.name)
+                if archive_name is not None:
+                    files.add(entry.name)
+                    try:
+                        offsets: Dict[int, int] = LevelArchive(Path(entry.path)).get_levels()
+                    except (OSError, ValueError):
+                        # e.g. a corrupted archive: its levels cannot be loaded
+                        continue
+                    mtime: int = entry.stat().st_mtime_ns
+                    characters.setdefault(archive_name, {}).update({level: {"file": entry.name, "offset": offset,
+                                                                            "mtime": mtime}
+                                                                    for level, offset in offsets.items()})
+                    continue
+
+                parsed = parse_save_file_name(entry.name)
+                if parsed is None:
+                    continue
+                files.add(entry.name)
+                name, level = parsed
+
+                levels: Dict[int, dict] = characters.setdefault(name, {})
+                # Archives take precedence over save files, and binary files over legacy files, of the same level
+                if level in levels and _get_precedence(levels[level]["file"]) > _get_precedence(entry.name):
+                    continue
+                levels[level] = {"file": entry.name, "offset": 0, "mtime": entry.stat().st_mtime_ns}
+
+        self._characters = characters
+        self._directory_mtime = directory_mtime
+        self._files = files
+        if write:
+            self._write()
+
+    def _ensure_fresh(self) -> NoReturn:
+        try:
+            directory_mtime: int = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            self._characters = {}
+            self._directory_mtime = None
+            self._files = set()
+            return
+
+        if self._characters is not None and directory_mtime == self._directory_mtime:
+            # Nothing has changed (saves of other processes update the catalog file, which changes the directory)
+            return
+
+        catalog_mtime: int = self._get_catalog_mtime()
+        if catalog_mtime is None or directory_mtime > catalog_mtime:
+            self.rebuild()
+            return
+
+        if self._characters is None or self._mtime != catalog_mtime:
+            # Not loaded yet, or updated by another process
+            self._read()
+            self._mtime = catalog_mtime
+        self._directory_mtime = directory_mtime
+
+    def _get_catalog_mtime(self) -> Optional[int]:
+        try:
+            return self.file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _read(self) -> NoReturn:
+        with open(self.file, "r") as f:
+            data: dict = json.load(f)
+
+        if data.get("version") != CATALOG_VERSION:
+            self.rebuild()
+            return
+
+        self._characters = {name: {int(level): entry for level, entry in levels.items()}
+                            for name, levels in data["characters"].items()}
+        # Save files that are not cataloged (e.g. of a level that is also archived) are only known after a scan
+        self._files = {entry["file"] for levels in self._characters.values() for entry in levels.values()}
+
+    def _list_files(self) -> Set[str]:
+        return {file_name for file_name in os.listdir(self.path)
+                if parse_archive_file_name(file_name) is not None or parse_save_file_name(file_name) is not None}
+
+    def _write(self) -> NoReturn:
+        # A temporary file of this process and thread (a background writer may also write it, see 'SaveWriter')
+        tmp_name: str = self.file.name + "." + str(os.getpid()) + "-" + str(threading.get_ident()) + ".tmp"
+        tmp_file: Path = self.file.with_name(tmp_name)
+        with open(tmp_file, "w") as f:
+            json.dump({"version": CATALOG_VERSION, "characters": self._characters}, f)
+        os.replace(tmp_file, self.file)
+
+        # Mark the catalog as up-to-date with the directory (replacing the file has changed the directory mtime)
+        directory_mtime: int = os.stat(self.path).st_mtime_ns
+        os.utime(self.file, ns=(directory_mtime, directory_mtime))
+        self._mtime = directory_mtime
+        self._directory_mtime = directory_mtime
+
+
+def _get_precedence(file_name: str) -> int:
+    if parse_archive_file_name(file_name) is not None:
+        return 2
+
+    return 0 if file_name.endswith(LEGACY_SAVE_FILE_SUFFIX) else 1
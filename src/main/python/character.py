@@ -1,12 +1,101 @@
-from typing import List, NoReturn
+from typing import Dict, List, NoReturn, Optional, Tuple
 
-from tabulate import tabulate
+from history import Change, Edit, History
+from tools.checks import check_typed_list
+from tools.namedobject import NamedObject, NameIndex
 
-from tools.checks import is_typed_list
-from tools.namedobject import NamedObject, find_unique_by_name, get_unique_by_name, get_unique_by_names
+# When enabled, every aggregate query is checked against a full recomputation (slow; meant for tests)
+_check_counters: bool = False
+
+
+def set_counter_checks(enabled: bool) -> NoReturn:
+    """
+    Enable or disable the consistency checks of the running skill increase totals.
+
+    :param enabled: Whether to check running totals against a full recomputation on every query
+    """
+    assert isinstance(enabled, bool)
+
+    global _check_counters
+    _check_counters = enabled
+
+
+class SkillIncreaseCounters:
+    """
+    Running totals of the skill increases of a character. They are kept up to date by the skills themselves, so that
+    aggregate queries take constant time.
+    """
+    __slots__ = ("total", "major", "minor", "capped_major")
+
+    def __init__(self):
+        self.total: int = 0
+        self.major: int = 0
+        self.minor: int = 0
+        # Major skill increases of skills that have not reached 100 (i.e. the ones that count towards a level-up)
+        self.capped_major: int = 0
+
+    def add(self, skill: "Skill", sign: int = 1) -> NoReturn:
+        n: int = sign * skill.level_ups
+
+        self.total += n
+        if skill.is_major:
+            self.major += n
+            if skill.value < 100:
+                self.capped_major += n
+        else:
+            self.minor += n
+
+    def reset(self) -> NoReturn:
+        self.total = 0
+        self.major = 0
+        self.minor = 0
+        self.capped_major = 0
+
+
+# The attributes of a new character, and the skills each of them governs
+DEFAULT_ATTRIBUTES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("Strength", ("Blade", "Blunt", "Hand to Hand")),
+    ("Endurance", ("Armorer", "Block", "Heavy Armor")),
+    ("Speed", ("Athletics", "Acrobatics", "Light Armor")),
+    ("Agility", ("Security", "Sneak", "Marksman")),
+    ("Personality", ("Mercantile", "Speechcraft", "Illusion")),
+    ("Intelligence", ("Alchemy", "Conjuration", "Mysticism")),
+    ("Willpower", ("Alteration", "Destruction", "Restoration")),
+    ("Luck", ()),
+)
+
+# Sections of the printed character (see 'RenderCache')
+SECTION_SUMMARY: str = "summary"
+SECTION_ATTRIBUTES: str = "attributes"
+SECTION_SKILLS: str = "skills"
+SECTION_PLAN: str = "plan"
+ALL_SECTIONS: tuple = (SECTION_SUMMARY, SECTION_ATTRIBUTES, SECTION_SKILLS, SECTION_PLAN)
+
+
+class RenderCache:
+    """
+    Rendered text of the sections of a character (e.g. the tables printed by 'print'). Every mutation of the character
+    invalidates the sections it affects, so a cached section is always up-to-date.
+    """
+    __slots__ = ("sections",)
+
+    def __init__(self):
+        self.sections: Dict[str, str] = {}
+
+    def get(self, section: str) -> Optional[str]:
+        return self.sections.get(section)
+
+    def set(self, section: str, text: str) -> NoReturn:
+        self.sections[section] = text
+
+    def invalidate(self, *sections: str) -> NoReturn:
+        for section in sections:
+            self.sections.pop(section, None)
 
 
 class Skill(NamedObject):
+    __slots__ = ("is_major", "value", "level_ups", "attribute", "counters", "render_cache")
+
     def __init__(self, name: str, is_major: bool = False, value: int = 5):
         assert isinstance(name, str)
         assert isinstance(is_major, bool)
@@ -18,12 +107,58 @@ class Skill(NamedObject):
         self.value: int = value
         self.level_ups: int = 0
         self.attribute: Attribute = None
+        self.counters: SkillIncreaseCounters = None
+        self.render_cache: RenderCache = None
+
+    def __getstate__(self) -> dict:
+        state: dict = super().__getstate__()
+        state.pop("render_cache", None)
+
+        return state
+
+    def __setstate__(self, state: dict) -> NoReturn:
+        # Running totals and the render cache are attached by the character on load
+        self.counters = None
+        self.render_cache = None
+        super().__setstate__(state)
 
     def increase(self, value: int = 1) -> NoReturn:
+        self._track(-1)
         self.level_ups += value
+        self._track(1)
+        self._invalidate(*ALL_SECTIONS)
+
+    def set_value(self, value: int) -> NoReturn:
+        assert isinstance(value, int)
+
+        self._track(-1)
+        self.value = value
+        self._track(1)
+        self._invalidate(SECTION_SUMMARY, SECTION_SKILLS, SECTION_PLAN)
+
+    def set_major(self, is_major: bool) -> NoReturn:
+        assert isinstance(is_major, bool)
+
+        self._track(-1)
+        self.is_major = is_major
+        self._track(1)
+        self._invalidate(SECTION_SUMMARY, SECTION_SKILLS, SECTION_PLAN)
+
+    def _track(self, sign: int) -> NoReturn:
+        # Add (or remove, if sign is -1) the contribution of this skill to the running totals
+        if self.attribute is not None:
+            self.attribute.skills_increase += sign * self.level_ups
+        if self.counters is not None:
+            self.counters.add(self, sign)
+
+    def _invalidate(self, *sections: str) -> NoReturn:
+        if self.render_cache is not None:
+            self.render_cache.invalidate(*sections)
 
 
 class Attribute(NamedObject):
+    __slots__ = ("value", "skills", "skills_increase")
+
     def __init__(self, name: str, value: int = 50, skills: List[Skill] = []):
         assert isinstance(name, str)
         assert isinstance(value, int)
@@ -33,9 +168,15 @@ class Attribute(NamedObject):
 
         self.value: int = value
         self.skills: List[Skill] = []
+        self.skills_increase: int = 0
 
         self.set_skills(skills)
 
+    def __setstate__(self, state: dict) -> NoReturn:
+        # Running totals are recomputed by the character on load
+        self.skills_increase = 0
+        super().__setstate__(state)
+
     def has_skill(self, name: str) -> bool:
         # Type check is handled by 'is_named'
 
@@ -47,31 +188,32 @@ class Attribute(NamedObject):
 
         self.skills.append(skill)
         skill.attribute = self
+        self.skills_increase += skill.level_ups
 
     def set_skills(self, skills: List[Skill]) -> NoReturn:
-        assert is_typed_list(skills, Skill, True)
+        assert check_typed_list(skills, Skill, True)
 
         if skills is None or len(skills) == 0:
             self.skills = []
+            self.skills_increase = 0
         else:
             for skill in skills:
                 self.append_skill(skill)
 
+    def get_skills_increase(self) -> int:
+        if _check_counters:
+            assert self.skills_increase == get_skills_increase(self.skills)
+
+        return self.skills_increase
+
     def get_attribute_gain(self) -> int:
-        n = get_skills_increase(self.skills)
-        if n == 0:
-            return 1
-        elif 1 <= n <= 4:
-            return 2
-        elif 5 <= n <= 7:
-            return 3
-        elif 8 <= n <= 9:
-            return 4
-        elif 10 <= n:
-            return 5
+        return get_attribute_gain_for_increase(self.get_skills_increase())
 
 
 class Character(NamedObject):
+    __slots__ = ("level", "attributes", "skills", "planned_attributes", "counters", "render_cache", "history",
+                 "_attribute_index", "_skill_index")
+
     def __init__(self, name: str, level: int = 1):
         assert isinstance(name, str)
         assert isinstance(level, int)
@@ -79,22 +221,106 @@ class Character(NamedObject):
         super().__init__(name)
 
         self.level: int = level
-        self.attributes: List[Attribute] = [
-            Attribute("Strength", skills=[Skill("Blade"), Skill("Blunt"), Skill("Hand to Hand")]),
-            Attribute("Endurance", skills=[Skill("Armorer"), Skill("Block"), Skill("Heavy Armor")]),
-            Attribute("Speed", skills=[Skill("Athletics"), Skill("Acrobatics"), Skill("Light Armor")]),
-            Attribute("Agility", skills=[Skill("Security"), Skill("Sneak"), Skill("Marksman")]),
-            Attribute("Personality", skills=[Skill("Mercantile"), Skill("Speechcraft"), Skill("Illusion")]),
-            Attribute("Intelligence", skills=[Skill("Alchemy"), Skill("Conjuration"), Skill("Mysticism")]),
-            Attribute("Willpower", skills=[Skill("Alteration"), Skill("Destruction"), Skill("Restoration")]),
-            Attribute("Luck")
-        ]
+        self.set_attributes([Attribute(name, skills=[Skill(skill_name) for skill_name in skill_names])
+                             for name, skill_names in DEFAULT_ATTRIBUTES])
+
+        self.planned_attributes: List[Attribute] = []
+
+    def __getstate__(self) -> dict:
+        # Name indices and the render cache are rebuilt on load, and the history is not saved
+        state: dict = super().__getstate__()
+        state.pop("_attribute_index", None)
+        state.pop("_skill_index", None)
+        state.pop("render_cache", None)
+        state.pop("history", None)
+
+        return state
+
+    def __setstate__(self, state: dict) -> NoReturn:
+        super().__setstate__(state)
+        # Unpickled characters (e.g. legacy save files) enter the program here
+        assert check_typed_list(self.attributes, Attribute, allow_empty=False, boundary=True)
+        assert check_typed_list(self.skills, Skill, allow_empty=False, boundary=True)
+        self._build_indices()
+        # Files saved before running totals were introduced do not have them
+        self._track_skills()
+        self._attach_render_cache()
+        self.history: History = History()
+
+    def set_attributes(self, attributes: List[Attribute]) -> NoReturn:
+        """
+        Set the attributes of the character. Skills are the skills of the attributes, in attribute order. The undo
+        history is cleared.
+
+        :param attributes: The attributes (with their skills already appended)
+        """
+        assert check_typed_list(attributes, Attribute, allow_empty=False)
+
+        self.attributes: List[Attribute] = attributes
         self.skills: List[Skill] = []
 
         for attribute in self.attributes:
             self.skills.extend(attribute.skills)
 
-        self.planned_attributes: List[Attribute] = []
+        self._build_indices()
+        self._track_skills()
+        self._attach_render_cache()
+        # Set to None to disable the undo history
+        self.history: History = History()
+
+    def _build_indices(self) -> NoReturn:
+        self._attribute_index: NameIndex = NameIndex(self.attributes)
+        self._skill_index: NameIndex = NameIndex(self.skills)
+
+    def _track_skills(self) -> NoReturn:
+        # (Re)compute all running totals from scratch
+        self.counters: SkillIncreaseCounters = SkillIncreaseCounters()
+
+        for attribute in self.attributes:
+            attribute.skills_increase = sum([skill.level_ups for skill in attribute.skills])
+
+        for skill in self.skills:
+            skill.counters = self.counters
+            self.counters.add(skill)
+
+    def _attach_render_cache(self) -> NoReturn:
+        self.render_cache: RenderCache = RenderCache()
+        for skill in self.skills:
+            skill.render_cache = self.render_cache
+
+    def check_counters(self) -> NoReturn:
+        """
+        Check that all running totals agree with a full recomputation.
+
+        :raises AssertionError: If any running total is wrong
+        """
+        assert self.counters.total == get_skills_increase(self.skills)
+        assert self.counters.major == sum([skill.level_ups for skill in self.skills if skill.is_major])
+        assert self.counters.minor == get_minor_skills_increase(self.skills)
+        assert self.counters.capped_major == get_major_skills_increase(self.skills)
+        for attribute in self.attributes:
+            assert attribute.skills_increase == get_skills_increase(attribute.skills)
+
+    def get_skills_increase(self) -> int:
+        if _check_counters:
+            self.check_counters()
+
+        return self.counters.total
+
+    def get_major_skills_increase(self) -> int:
+        """
+        :return: The major skill increases that count towards a level-up (i.e. of skills that are not maxed)
+        """
+        if _check_counters:
+            self.check_counters()
+
+        return self.counters.capped_major
+
+    def get_minor_skills_increase(self) -> int:
+        if _check_counters:
+            self.check_counters()
+
+        return self.counters.minor
 
     def get_name(self) -> str:
         return self.name + "_lvl" + str(self.level).zfill(2)
@@ -103,42 +329,64 @@ class Character(NamedObject):
         assert isinstance(skill_name, str)
         assert isinstance(value, int)
 
-        idx: int = find_unique_by_name(self.skills, skill_name)
-        skill = self.skills[idx]
+        skill: Skill = self._skill_index.get_unique(skill_name)
+        level_ups: int = skill.level_ups
         skill.increase(value)
+        self._record("increase " + skill.name + " by " + str(value), (skill, "level_ups", level_ups, skill.level_ups))
 
         return skill.name, skill.attribute.name
 
     def can_level_up(self) -> bool:
-        return get_major_skills_increase(self.skills) >= 10
+        return self.get_major_skills_increase() >= 10
 
     def level_up(self, attribute_names: List[str]) -> None:
         # Type checking is performed by 'get_unique_by_names'
-        attributes: List[Attribute] = get_unique_by_names(self.attributes, attribute_names)
+        attributes: List[Attribute] = self._attribute_index.get_unique_by_names(attribute_names)
         assert len(attributes) == 3
 
         if not self.can_level_up():
             raise RuntimeError("Cannot level up yet")
 
+        # Imported here, so that start-up does not import tabulate
+        from tabulate import tabulate
+
         table = [[attribute.get_name(), attribute.get_attribute_gain()] for attribute in attributes]
         print("Will level up with the following attributes:")
         print(tabulate(table))
 
+        # Only the updated fields are recorded (the increased skills, the three attributes and the level)
+        edits: List[Edit] = [(self, "level", self.level, self.level + 1)]
         self.level += 1
 
         for attribute in attributes:
-            attribute.value += attribute.get_attribute_gain()
+            gain: int = attribute.get_attribute_gain()
+            edits.append((attribute, "value", attribute.value, attribute.value + gain))
+            attribute.value += gain
 
         for skill in self.skills:
+            if skill.level_ups != 0:
+                edits.append((skill, "value", skill.value, skill.value + skill.level_ups))
+                edits.append((skill, "level_ups", skill.level_ups, 0))
             skill.value += skill.level_ups
             skill.level_ups = 0
 
+        # All skill increases are consumed by the level-up
+        self.counters.reset()
+        for attribute in self.attributes:
+            attribute.skills_increase = 0
+
+        self.render_cache.invalidate(*ALL_SECTIONS)
+        self._record("level up to level " + str(self.level), *edits)
+
     def set_plan(self, attribute_names: List[str]) -> List[str]:
         # Type checking is performed by 'get_unique_by_names'
-        attributes: List[Attribute] = get_unique_by_names(self.attributes, attribute_names)
+        attributes: List[Attribute] = self._attribute_index.get_unique_by_names(attribute_names)
         assert len(attributes) == 2 or len(attributes) == 3
 
+        self._record("set plan " + ", ".join([attribute.name for attribute in attributes]),
+                     (self, "planned_attributes", tuple(self.planned_attributes), tuple(attributes)))
         self.planned_attributes: List[Attribute] = attributes
+        self.render_cache.invalidate(SECTION_PLAN)
 
         return [attribute.get_name() for attribute in attributes]
 
@@ -150,12 +398,12 @@ class Character(NamedObject):
 
         # Limit by major skill increase
         if skill.is_major:
-            d1: int = 10 - get_major_skills_increase(self.skills)
+            d1: int = 10 - self.get_major_skills_increase()
         else:
             d1: int = 10
 
         # Limit by attribute skill increase
-        d2: int = 10 - get_skills_increase(skill.attribute.skills)
+        d2: int = 10 - skill.attribute.get_skills_increase()
 
         # Limit by max skill level
         d3: int = 100 - skill.value
@@ -165,7 +413,9 @@ class Character(NamedObject):
     def set_level_value(self, value: int) -> int:
         assert isinstance(value, int)
 
+        self._record("set level " + str(value), (self, "level", self.level, value))
         self.level = value
+        self.render_cache.invalidate(SECTION_SUMMARY, SECTION_SKILLS, SECTION_PLAN)
 
         return self.level
 
@@ -173,8 +423,10 @@ class Character(NamedObject):
         assert isinstance(attribute_name, str)
         assert isinstance(value, int)
 
-        attribute: Attribute = get_unique_by_name(self.attributes, attribute_name)
+        attribute: Attribute = self._attribute_index.get_unique(attribute_name)
+        self._record("set " + attribute.name + " " + str(value), (attribute, "value", attribute.value, value))
         attribute.value = value
+        self.render_cache.invalidate(SECTION_ATTRIBUTES)
 
         return attribute.get_name(), attribute.value
 
@@ -182,8 +434,9 @@ class Character(NamedObject):
         assert isinstance(skill_name, str)
         assert isinstance(value, int)
 
-        skill: Skill = get_unique_by_name(self.skills, skill_name)
-        skill.value = value
+        skill: Skill = self._skill_index.get_unique(skill_name)
+        self._record("set " + skill.name + " " + str(value), (skill, "value", skill.value, value))
+        skill.set_value(value)
 
         return skill.get_name(), skill.value
 
@@ -191,25 +444,103 @@ class Character(NamedObject):
         assert isinstance(skill_name, str)
         assert isinstance(is_major, bool)
 
-        skill: Skill = get_unique_by_name(self.skills, skill_name)
-        skill.is_major = is_major
+        skill: Skill = self._skill_index.get_unique(skill_name)
+        self._record("set " + skill.name + (" major" if is_major else " minor"),
+                     (skill, "is_major", skill.is_major, is_major))
+        skill.set_major(is_major)
 
         return skill.get_name(), skill.is_major
 
+    def undo(self) -> str:
+        """
+        Undo the last change (see 'History').
+
+        :return: The description of the undone change
+        :raises ValueError: If there is nothing to undo
+        """
+        if self.history is None:
+            raise ValueError("The history is disabled")
+
+        change: Change = self.history.pop_undo()
+        for target, field, old, _ in reversed(change.edits):
+            self._apply(target, field, old)
+
+        return change.description
+
+    def redo(self) -> str:
+        """
+        Redo the last undone change.
+
+        :return: The description of the redone change
+        :raises ValueError: If there is nothing to redo
+        """
+        if self.history is None:
+            raise ValueError("The history is disabled")
+
+        change: Change = self.history.pop_redo()
+        for target, field, _, new in change.edits:
+            self._apply(target, field, new)
+
+        return change.description
+
+    def _record(self, description: str, *edits: Edit) -> NoReturn:
+        if self.history is not None:
+            self.history.record(Change(description, edits))
+
+    def _apply(self, target: object, field: str, value) -> NoReturn:
+        # Set a recorded field, through the methods that keep the running totals and the render cache up-to-date
+        if isinstance(target, Skill):
+            if field == "level_ups":
+                target.increase(value - target.level_ups)
+            elif field == "value":
+                target.set_value(value)
+            else:
+                target.set_major(value)
+        elif isinstance(target, Attribute):
+            target.value = value
+            self.render_cache.invalidate(SECTION_ATTRIBUTES)
+        elif field == "level":
+            self.level = value
+            self.render_cache.invalidate(SECTION_SUMMARY, SECTION_SKILLS, SECTION_PLAN)
+        else:
+            self.planned_attributes = list(value)
+            self.render_cache.invalidate(SECTION_PLAN)
+
+
+def get_attribute_gain_for_increase(n: int) -> int:
+    """
+    Compute the attribute multiplier (+1 to +5) that corresponds to a number of governing skill increases.
+
+    :param n: The total increase of the skills governed by an attribute
+    :return: The attribute gain for the next level-up
+    """
+    assert isinstance(n, int)
+
+    if n <= 0:
+        return 1
+    elif 1 <= n <= 4:
+        return 2
+    elif 5 <= n <= 7:
+        return 3
+    elif 8 <= n <= 9:
+        return 4
+    else:
+        return 5
+
 
 def get_skills_increase(skills: List[Skill]) -> int:
-    assert is_typed_list(skills, Skill)
+    assert check_typed_list(skills, Skill)
 
     return sum([skill.level_ups for skill in skills])
 
 
 def get_major_skills_increase(skills: List[Skill]) -> int:
-    assert is_typed_list(skills, Skill)
+    assert check_typed_list(skills, Skill)
 
     return sum([skill.level_ups for skill in skills if skill.is_major and skill.value < 100])
 
 
 def get_minor_skills_increase(skills: List[Skill]) -> int:
-    assert is_typed_list(skills, Skill)
+    assert check_typed_list(skills, Skill)
 
     return sum([skill.level_ups for skill in skills if not skill.is_major])
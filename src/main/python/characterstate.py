@@ -0,0 +1,156 @@
+from typing import List
+
+import numpy as np
+
+from character import Attribute, Character, Skill
+
+# Attribute gain for 0, 1, ..., 10 governing skill increases (same thresholds as 'get_attribute_gain_for_increase')
+GAIN_TABLE: np.ndarray = np.array([1, 2, 2, 2, 2, 3, 3, 3, 4, 4, 5], dtype=np.int8)
+
+MAX_SKILL_VALUE: int = 100
+MAJOR_SKILLS_INCREASE_PER_LEVEL: int = 10
+MAX_ATTRIBUTE_SKILLS_INCREASE: int = 10
+
+
+class CharacterState:
+    """
+    Array-backed snapshot of a character. Aggregate queries are vectorized: wherever skill values or level-ups can be
+    passed, arrays of shape (..., n_skills) are accepted, so that many hypothetical states are evaluated in one call.
+    """
+
+    def __init__(self, name: str, level: int, skill_names: List[str], attribute_names: List[str],
+                 skill_values: np.ndarray, skill_level_ups: np.ndarray, skill_majors: np.ndarray,
+                 skill_attributes: np.ndarray, attribute_values: np.ndarray, planned_attributes: List[int] = None):
+        assert isinstance(name, str)
+        assert isinstance(level, int)
+        assert len(skill_names) == len(skill_values) == len(skill_level_ups) == len(skill_majors)
+        assert len(skill_names) == len(skill_attributes)
+        assert len(attribute_names) == len(attribute_values)
+
+        self.name: str = name
+        self.level: int = level
+        self.skill_names: List[str] = list(skill_names)
+        self.attribute_names: List[str] = list(attribute_names)
+
+        self.skill_values: np.ndarray = np.array(skill_values, dtype=np.int16)
+        self.skill_level_ups: np.ndarray = np.array(skill_level_ups, dtype=np.int16)
+        self.skill_majors: np.ndarray = np.array(skill_majors, dtype=bool)
+        self.skill_attributes: np.ndarray = np.array(skill_attributes, dtype=np.intp)
+        self.attribute_values: np.ndarray = np.array(attribute_values, dtype=np.int16)
+        self.planned_attributes: List[int] = [] if planned_attributes is None else list(planned_attributes)
+
+        # One-hot skill -> attribute mapping, so that per-attribute sums are a single matrix product
+        self.skill_attribute_matrix: np.ndarray = np.zeros((len(skill_names), len(attribute_names)), dtype=np.int32)
+        self.skill_attribute_matrix[np.arange(len(skill_names)), self.skill_attributes] = 1
+
+    @staticmethod
+    def from_character(character: Character) -> "CharacterState":
+        assert isinstance(character, Character)
+
+        attribute_idx = {id(attribute): i for i, attribute in enumerate(character.attributes)}
+
+        return CharacterState(character.name,
+                              character.level,
+                              [skill.name for skill in character.skills],
+                              [attribute.name for attribute in character.attributes],
+                              [skill.value for skill in character.skills],
+                              [skill.level_ups for skill in character.skills],
+                              [skill.is_major for skill in character.skills],
+                              [attribute_idx[id(skill.attribute)] for skill in character.skills],
+                              [attribute.value for attribute in character.attributes],
+                              [attribute_idx[id(attribute)] for attribute in character.planned_attributes])
+
+    def to_character(self) -> Character:
+        attributes: List[Attribute] = [Attribute(name, int(value))
+                                       for name, value in zip(self.attribute_names, self.attribute_values)]
+
+        for i, name in enumerate(self.skill_names):
+            skill: Skill = Skill(name, bool(self.skill_majors[i]), int(self.skill_values[i]))
+            skill.level_ups = int(self.skill_level_ups[i])
+            attributes[self.skill_attributes[i]].append_skill(skill)
+
+        character: Character = Character(self.name, self.level)
+        character.set_attributes(attributes)
+        character.planned_attributes = [attributes[i] for i in self.planned_attributes]
+
+        return character
+
+    def copy(self) -> "CharacterState":
+        return CharacterState(self.name, self.level, self.skill_names, self.attribute_names, self.skill_values,
+                              self.skill_level_ups, self.skill_majors, self.skill_attributes, self.attribute_values,
+                              self.planned_attributes)
+
+    def get_skills_increase(self, skill_level_ups: np.ndarray = None) -> np.ndarray:
+        skill_level_ups = self._get_level_ups(skill_level_ups)
+
+        return skill_level_ups.sum(axis=-1)
+
+    def get_major_skills_increase(self, skill_level_ups: np.ndarray = None,
+                                  skill_values: np.ndarray = None) -> np.ndarray:
+        # Same rule as 'get_major_skills_increase': maxed skills do not count towards a level-up
+        skill_level_ups = self._get_level_ups(skill_level_ups)
+        skill_values = self._get_values(skill_values)
+
+        return (skill_level_ups * (self.skill_majors & (skill_values < MAX_SKILL_VALUE))).sum(axis=-1)
+
+    def get_minor_skills_increase(self, skill_level_ups: np.ndarray = None) -> np.ndarray:
+        skill_level_ups = self._get_level_ups(skill_level_ups)
+
+        return (skill_level_ups * ~self.skill_majors).sum(axis=-1)
+
+    def get_attribute_increases(self, skill_level_ups: np.ndarray = None) -> np.ndarray:
+        skill_level_ups = self._get_level_ups(skill_level_ups)
+
+        return skill_level_ups @ self.skill_attribute_matrix
+
+    def get_attribute_gains(self, skill_level_ups: np.ndarray = None) -> np.ndarray:
+        increases: np.ndarray = self.get_attribute_increases(skill_level_ups)
+
+        return GAIN_TABLE[np.clip(increases, 0, len(GAIN_TABLE) - 1)]
+
+    def can_level_up(self, skill_level_ups: np.ndarray = None, skill_values: np.ndarray = None) -> np.ndarray:
+        return self.get_major_skills_increase(skill_level_ups, skill_values) >= MAJOR_SKILLS_INCREASE_PER_LEVEL
+
+    def get_remaining_skill_increases(self, skill_level_ups: np.ndarray = None,
+                                      skill_values: np.ndarray = None) -> np.ndarray:
+        """
+        Vectorized 'Character.get_remaining_skill_increase' for every skill.
+
+        :return: An array of shape (..., n_skills)
+        """
+        skill_level_ups = self._get_level_ups(skill_level_ups)
+        skill_values = self._get_values(skill_values)
+
+        # Limit by major skill increase
+        major_increase: np.ndarray = self.get_major_skills_increase(skill_level_ups, skill_values)
+        d1: np.ndarray = np.where(self.skill_majors, MAJOR_SKILLS_INCREASE_PER_LEVEL - major_increase[..., None],
+                                  MAJOR_SKILLS_INCREASE_PER_LEVEL)
+
+        # Limit by attribute skill increase
+        attribute_increases: np.ndarray = self.get_attribute_increases(skill_level_ups)
+        d2: np.ndarray = MAX_ATTRIBUTE_SKILLS_INCREASE - attribute_increases[..., self.skill_attributes]
+
+        # Limit by max skill level
+        d3: np.ndarray = MAX_SKILL_VALUE - skill_values
+
+        planned: np.ndarray = np.isin(self.skill_attributes, self.planned_attributes)
+
+        return np.where(planned, np.minimum(np.minimum(d1, d2), d3), 0)
+
+    def _get_level_ups(self, skill_level_ups: np.ndarray) -> np.ndarray:
+        if skill_level_ups is None:
+            return self.skill_level_ups
+
+        skill_level_ups = np.asarray(skill_level_ups)
+        assert skill_level_ups.shape[-1] == len(self.skill_names)
+
+        return skill_level_ups
+
+    def _get_values(self, skill_values: np.ndarray) -> np.ndarray:
+        if skill_values is None:
+            return self.skill_values
+
+        skill_values = np.asarray(skill_values)
+        assert skill_values.shape[-1] == len(self.skill_names)
+
+        return skill_values
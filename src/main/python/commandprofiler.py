@@ -0,0 +1,218 @@
+import json
+from bisect import bisect_left
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, NoReturn, Tuple
+
+from character import Character
+from commands.basecommand import BaseCommand
+
+# Upper bounds (in seconds) of the latency histogram buckets. The last bucket is unbounded.
+LATENCY_BUCKETS: Tuple[float, ...] = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                                      0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_METRIC: str = "olm_command"
+
+
+class LatencyHistogram:
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds: Tuple[float, ...] = bounds
+        # One count per bucket, plus one for values above the last bound
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.max: float = 0.0
+
+    def add(self, value: float) -> NoReturn:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> NoReturn:
+        assert self.bounds == other.bounds
+
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def get_mean(self) -> float:
+        return self.sum / self.count if self.count > 0 else 0.0
+
+    def get_quantile(self, q: float) -> float:
+        """
+        Estimate a quantile as the upper bound of the bucket it falls in (the maximum for the unbounded bucket).
+
+        :param q: The quantile, in [0, 1]
+        """
+        assert 0 <= q <= 1
+
+        if self.count == 0:
+            return 0.0
+
+        cumulative: int = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= q * self.count:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+
+        return self.max
+
+
+class CommandStats:
+    def __init__(self):
+        self.calls: int = 0
+        self.exceptions: int = 0
+        self.latency: LatencyHistogram = LatencyHistogram()
+
+    def merge(self, other: "CommandStats") -> NoReturn:
+        self.calls += other.calls
+        self.exceptions += other.exceptions
+        self.latency.merge(other.latency)
+
+
+class CommandProfiler:
+    """
+    Records the wall time, number of calls and number of exceptions of commands, per command and name used to call it
+    (the command name or an alternative name). Optionally, each command is also profiled with cProfile and its profile
+    is dumped to '<profile_dir>/<command>.prof'.
+    """
+
+    def __init__(self, profile_dir: Path = None):
+        assert isinstance(profile_dir, Path) or profile_dir is None
+
+        self.profile_dir: Path = profile_dir
+        # (command, alias) -> stats
+        self.stats: Dict[Tuple[str, str], CommandStats] = {}
+        # Command -> cProfile.Profile (cProfile is only imported when profiles are captured)
+        self._profiles: Dict[str, object] = {}
+
+    def run(self, command: BaseCommand, alias: str, character: Character, args: List[str]) -> NoReturn:
+        """
+        Run a command and record its statistics. Exceptions of the command are counted and re-raised.
+
+        :param command: The command
+        :param alias: The name the command was called with
+        :param character: The character
+        :param args: The arguments of the command
+        """
+        profile = None
+        if self.profile_dir is not None:
+            profile = self._profiles.get(command.name)
+            if profile is None:
+                import cProfile
+                profile = self._profiles[command.name] = cProfile.Profile()
+
+        failed: bool = False
+        start: float = perf_counter()
+        try:
+            if profile is not None:
+                profile.enable()
+            try:
+                command.run(character, args)
+            finally:
+                if profile is not None:
+                    profile.disable()
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed: float = perf_counter() - start
+            # Looked up after the call, so that a call is not visible to itself (e.g. 'stats')
+            stats: CommandStats = self.stats.get((command.name, alias))
+            if stats is None:
+                stats = self.stats[(command.name, alias)] = CommandStats()
+            stats.calls += 1
+            stats.exceptions += failed
+            stats.latency.add(elapsed)
+
+    def reset(self) -> NoReturn:
+        self.stats = {}
+        self._profiles = {}
+
+    def get_command_stats(self) -> Dict[str, CommandStats]:
+        """
+        :return: The statistics of each command, over all its names
+        """
+        stats: Dict[str, CommandStats] = {}
+        for (command_name, _), alias_stats in sorted(self.stats.items()):
+            stats.setdefault(command_name, CommandStats()).merge(alias_stats)
+
+        return stats
+
+    def dump_profiles(self) -> List[Path]:
+        """
+        Dump the cProfile data of each command (readable with pstats or snakeviz).
+
+        :return: The written files
+        """
+        if self.profile_dir is None:
+            return []
+
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        files: List[Path] = []
+        for command_name, profile in sorted(self._profiles.items()):
+            file: Path = self.profile_dir / (command_name + ".prof")
+            profile.dump_stats(str(file))
+            files.append(file)
+
+        return files
+
+    def to_dict(self) -> dict:
+        return {"buckets": list(LATENCY_BUCKETS),
+                "commands": [{"command": command_name, "alias": alias, "calls": stats.calls,
+                              "exceptions": stats.exceptions, "seconds_sum": stats.latency.sum,
+                              "seconds_max": stats.latency.max, "bucket_counts": stats.latency.counts}
+                             for (command_name, alias), stats in sorted(self.stats.items())]}
+
+    def to_prometheus(self) -> str:
+        """
+        :return: The statistics in the Prometheus text exposition format
+        """
+        lines: List[str] = ["# HELP " + PROMETHEUS_METRIC + "_calls_total Number of command calls",
+                            "# TYPE " + PROMETHEUS_METRIC + "_calls_total counter"]
+        for (command_name, alias), stats in sorted(self.stats.items()):
+            lines.append(PROMETHEUS_METRIC + "_calls_total" + _labels(command_name, alias) + " " + str(stats.calls))
+
+        lines += ["# HELP " + PROMETHEUS_METRIC + "_exceptions_total Number of failed command calls",
+                  "# TYPE " + PROMETHEUS_METRIC + "_exceptions_total counter"]
+        for (command_name, alias), stats in sorted(self.stats.items()):
+            lines.append(PROMETHEUS_METRIC + "_exceptions_total" + _labels(command_name, alias) + " " +
+                         str(stats.exceptions))
+
+        lines += ["# HELP " + PROMETHEUS_METRIC + "_seconds Wall time of command calls",
+                  "# TYPE " + PROMETHEUS_METRIC + "_seconds histogram"]
+        for (command_name, alias), stats in sorted(self.stats.items()):
+            cumulative: int = 0
+            for bound, count in zip(list(LATENCY_BUCKETS) + ["+Inf"], stats.latency.counts):
+                cumulative += count
+                lines.append(PROMETHEUS_METRIC + "_seconds_bucket" +
+                             _labels(command_name, alias, le=str(bound)) + " " + str(cumulative))
+            lines.append(PROMETHEUS_METRIC + "_seconds_sum" + _labels(command_name, alias) + " " +
+                         repr(stats.latency.sum))
+            lines.append(PROMETHEUS_METRIC + "_seconds_count" + _labels(command_name, alias) + " " +
+                         str(stats.latency.count))
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, file: Path) -> NoReturn:
+        """
+        Export the statistics to a file: Prometheus text format for '.prom' and '.txt' files, JSON otherwise.
+        """
+        assert isinstance(file, Path)
+
+        with open(file, "w") as f:
+            if file.suffix in [".prom", ".txt"]:
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, indent=2)
+
+
+def _labels(command_name: str, alias: str, **extra: str) -> str:
+    labels: Dict[str, str] = {"command": command_name, "alias": alias}
+    labels.update(extra)
+
+    return "{" + ",".join([key + '="' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+                           for key, value in labels.items()]) + "}"
@@ -1,8 +1,8 @@
 from typing import List, NoReturn
 
 from character import Character
-from tools.checks import is_typed_list
-from tools.common import print_exception
+from commands.commandnames import get_command_names
+from tools.checks import check_typed_list
 from tools.namedobject import NamedObject
 
 
@@ -12,7 +12,8 @@ class BaseCommand(NamedObject):
 
         super().__init__(name)
 
-        self.alternative_names: List[str] = [name.lower()]
+        # Built-in commands declare their alternative names in 'ALTERNATIVE_NAMES'
+        self.alternative_names: List[str] = [alternative_name.lower() for alternative_name in get_command_names(name)]
 
     def add_alternative_name(self, name: str) -> NoReturn:
         assert isinstance(name, str)
@@ -26,16 +27,28 @@ class BaseCommand(NamedObject):
 
     def run(self, character: Character, args: List[str] = None) -> NoReturn:
         assert isinstance(character, Character)
-        assert is_typed_list(args, str, True)
+        assert check_typed_list(args, str, True, boundary=True)
 
-        try:
-            self._run(character, args)
-        except Exception as e:
-            print_exception(e)
+        # Errors are handled by the caller (printed, or subject to the error policy of scripts)
+        self._run(character, args)
 
     def _run(self, character: Character, args: List[str]) -> NoReturn:
         raise NotImplementedError("Command not implemented: " + self.name)
 
+    def changes_character(self) -> bool:
+        """
+        :return: Whether the command changes the character. Such commands are journaled for crash recovery (see
+            'CommandJournal')
+        """
+        return False
+
+    def is_replayable(self) -> bool:
+        """
+        :return: Whether the command has the same effect when it is run again on the same character state. The state
+            after a command that cannot be replayed is journaled instead of the command
+        """
+        return True
+
     def get_usage_string(self) -> str:
         return self.get_name()
         # raise NotImplementedError("Command not implemented: " + self.name)
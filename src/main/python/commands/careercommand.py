@@ -0,0 +1,60 @@
+from typing import List, NoReturn
+
+from tabulate import tabulate
+
+from careerplanner import CareerPlanner
+from character import Character
+from commands.basecommand import BaseCommand
+from levelplanner import LevelPlan
+from tools.common import tabulated_with_centered_header
+from tools.formatting import format_base, BColors
+
+
+class CareerCommand(BaseCommand):
+    def __init__(self):
+        super().__init__("career")
+
+    def get_usage_string(self) -> str:
+        return self.name + " [max-levels]"
+
+    def get_help_string(self) -> List[str]:
+        h: str = "Plan the level-ups (attributes and skill increases of each level) that max all attributes in the " + \
+                 "fewest levels, starting from the current level. Argument 'max-levels' limits the length of the " + \
+                 "plan (default: 100)."
+
+        return [h]
+
+    def _run(self, character: Character, args: List[str]) -> NoReturn:
+        if len(args) > 1:
+            raise ValueError("Too many input arguments")
+
+        max_levels: int = int(args[0]) if len(args) == 1 else 100
+
+        planner: CareerPlanner = CareerPlanner(character, max_levels)
+        plans: List[LevelPlan] = planner.solve()
+        if len(plans) == 0:
+            if planner.is_exhausted():
+                raise ValueError("The search was cut off after " + str(planner.max_nodes) + " states, before a plan " +
+                                 "was found")
+            raise ValueError("Attributes cannot be maxed within " + str(max_levels) + " levels")
+
+        career_headers = ("Level", "Attributes", "Skill increases")
+
+        table = []
+        for i, plan in enumerate(plans):
+            attributes: str = ", ".join([attribute.get_name() + " +" + str(gain)
+                                         for attribute, gain in zip(plan.attributes, plan.gains)])
+            skills: str = ", ".join([_fmt_skill(skill.get_name(), skill.is_major) + " +" + str(n)
+                                     for skill, n in plan.skill_increases])
+            table.append([character.level + i, attributes, skills])
+
+        print(tabulated_with_centered_header(tabulate(table, headers=career_headers), "CAREER"))
+        if not planner.is_optimal():
+            print("The search was cut short; the plan may not be the shortest one")
+
+
+def _fmt_skill(name: str, is_major: bool) -> str:
+    if is_major:
+        name = format_base(name, BColors.BOLD)
+
+    return name
@@ -0,0 +1,20 @@
+from typing import Dict, List
+
+# The alternative names of the built-in commands. Both the commands (see 'BaseCommand') and the CLI, which registers
+# commands before their modules are imported (see 'LazyCommand'), read them from here
+ALTERNATIVE_NAMES: Dict[str, List[str]] = {
+    "print": ["show"],
+    "set-value": ["setvalue", "set-val", "setval", "set"],
+    "increase-skill": ["increase", "inc-skill", "inc"],
+    "level-up": ["levelup", "level", "up"],
+    "solve": ["optimize"],
+    "quit": ["exit"],
+}
+
+
+def get_command_names(name: str) -> List[str]:
+    """
+    :param name: The name of a command
+    :return: The name followed by the alternative names of the command
+    """
+    return [name] + ALTERNATIVE_NAMES.get(name, [])
@@ -0,0 +1,159 @@
+from importlib import import_module
+from typing import Dict, List, NoReturn, Union
+
+from commands.basecommand import BaseCommand
+from commands.commandnames import get_command_names
+
+ENTRY_POINT_GROUP: str = "oblivion_level_manager.commands"
+
+
+class LazyCommand:
+    """
+    A command whose module is imported (and the command created) on first use. The alternative names of the command are
+    read from 'ALTERNATIVE_NAMES', so that it can be registered without being loaded.
+    """
+
+    def __init__(self, module_name: str, class_name: str, name: str, *args):
+        """
+        :param module_name: The module of the command, e.g. 'commands.printcommand'
+        :param class_name: The BaseCommand subclass
+        :param name: The command name, as set by the command
+        :param args: The arguments of the command constructor
+        """
+        assert isinstance(module_name, str)
+        assert isinstance(class_name, str)
+        assert isinstance(name, str)
+
+        self.module_name: str = module_name
+        self.class_name: str = class_name
+        self.name: str = name
+        self.alternative_names: List[str] = get_command_names(name)
+        self.args: tuple = args
+
+    def load(self) -> BaseCommand:
+        command: BaseCommand = getattr(import_module(self.module_name), self.class_name)(*self.args)
+        if command.alternative_names != self.alternative_names:
+            raise ValueError("Command '" + command.name + "' has names " + ", ".join(command.alternative_names) +
+                             " but was registered with names " + ", ".join(self.alternative_names))
+
+        return command
+
+
+class CommandRegistry:
+    """
+    Maps every command name and alternative name to its command, so that dispatching a command is a single lookup.
+    Lazy commands are loaded on first lookup.
+    """
+
+    def __init__(self, commands: List[Union[BaseCommand, LazyCommand]] = None):
+        self._commands: List[Union[BaseCommand, LazyCommand]] = []
+        self._by_name: Dict[str, Union[BaseCommand, LazyCommand]] = {}
+        # Entry point group whose plugins are loaded when first needed (see 'defer_entry_points')
+        self._entry_point_group: str = None
+
+        if commands is not None:
+            for command in commands:
+                self.register(command)
+
+    @property
+    def commands(self) -> List[BaseCommand]:
+        """
+        All commands, in registration order. Loads every lazy command and deferred plugin.
+        """
+        self._load_deferred_entry_points()
+        for command in self._commands:
+            if isinstance(command, LazyCommand):
+                self._load(command)
+
+        return list(self._commands)
+
+    def register(self, command: Union[BaseCommand, LazyCommand]) -> NoReturn:
+        """
+        Register a command under all of its names.
+
+        :param command: The command to register
+        :raises ValueError: If any of the command names is already taken by another command
+        """
+        assert isinstance(command, (BaseCommand, LazyCommand))
+
+        for name in command.alternative_names:
+            if name in self._by_name:
+                raise ValueError("Command name '" + name + "' of command '" + command.name +
+                                 "' is already used by command '" + self._by_name[name].name + "'")
+
+        self._commands.append(command)
+        for name in command.alternative_names:
+            self._by_name[name] = command
+
+    def find(self, command_name: str) -> BaseCommand:
+        assert isinstance(command_name, str)
+
+        command: Union[BaseCommand, LazyCommand] = self._by_name.get(command_name)
+        if command is None and self._entry_point_group is not None:
+            # Maybe a plugin command
+            self._load_deferred_entry_points()
+            command = self._by_name.get(command_name)
+        if command is None:
+            raise ValueError("Command not found: " + command_name)
+
+        if isinstance(command, LazyCommand):
+            command = self._load(command)
+
+        return command
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP) -> List[BaseCommand]:
+        """
+        Register plugin commands. Each entry point of the group should load a BaseCommand subclass (or any callable
+        without arguments that returns a BaseCommand).
+
+        :param group: The entry point group
+        :return: The registered plugin commands
+        """
+        assert isinstance(group, str)
+
+        from importlib.metadata import entry_points
+
+        eps = entry_points()
+        if hasattr(eps, "select"):
+            eps = eps.select(group=group)
+        else:
+            # Python < 3.10
+            eps = eps.get(group, [])
+
+        commands: List[BaseCommand] = []
+        for ep in eps:
+            command = ep.load()()
+            if not isinstance(command, BaseCommand):
+                raise TypeError("Entry point '" + ep.name + "' did not create a command")
+            self.register(command)
+            commands.append(command)
+
+        return commands
+
+    def defer_entry_points(self, group: str = ENTRY_POINT_GROUP) -> NoReturn:
+        """
+        Like 'load_entry_points', but the plugins are only loaded when a command name is not found, or when all commands
+        are requested. Scanning the installed packages is slow, so this keeps it out of the start-up.
+
+        :param group: The entry point group
+        """
+        assert isinstance(group, str)
+
+        self._entry_point_group = group
+
+    def _load_deferred_entry_points(self) -> NoReturn:
+        if self._entry_point_group is None:
+            return
+
+        group: str = self._entry_point_group
+        self._entry_point_group = None
+        self.load_entry_points(group)
+
+    def _load(self, lazy_command: LazyCommand) -> BaseCommand:
+        command: BaseCommand = lazy_command.load()
+
+        self._commands[self._commands.index(lazy_command)] = command
+        for name in command.alternative_names:
+            self._by_name[name] = command
+
+        return command
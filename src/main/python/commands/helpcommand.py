@@ -5,26 +5,33 @@ from tabulate import tabulate
 
 from character import Character
 from commands.basecommand import BaseCommand
-from tools.checks import is_typed_list
+from tools.checks import check_typed_list
 from tools.formatting import format_base, BColors
 
 
 class HelpCommand(BaseCommand):
-    def __init__(self):
+    def __init__(self, registry=None):
+        """
+        :param registry: The CommandRegistry of the commands. If given, the help is generated on first use
+        """
         super().__init__("help")
 
-        self.help: str = "not initialized yet"
+        self.registry = registry
+        self.help: str = None
 
     def _run(self, character: Character, args: List[str] = None) -> NoReturn:
-        assert is_typed_list(args, str)
+        assert check_typed_list(args, str)
 
-        print(self.help)
+        if self.help is None and self.registry is not None:
+            self.generate_help(self.registry.commands)
+
+        print("not initialized yet" if self.help is None else self.help)
 
     def get_help_string(self) -> List[str]:
         return ["Shows this help"]
 
     def generate_help(self, commands: List[BaseCommand]) -> NoReturn:
-        assert is_typed_list(commands, BaseCommand)
+        assert check_typed_list(commands, BaseCommand)
 
         table = []
         for command in commands:
@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Dict, List, NoReturn
+
+from tabulate import tabulate
+
+from character import Character
+from commands.basecommand import BaseCommand
+from catalog import Catalog
+from levelarchive import ARCHIVE_FILE_SUFFIX, LevelArchive, load_level
+from savewriter import SaveWriter
+from tools.common import tabulated_with_centered_header
+
+
+class HistoryCommand(BaseCommand):
+    def __init__(self, path: Path = Path("."), writer: SaveWriter = None):
+        assert isinstance(path, Path)
+        assert isinstance(writer, SaveWriter) or writer is None
+
+        super().__init__("history")
+
+        self.path: Path = path
+        self.catalog: Catalog = Catalog(path)
+        # Saves in progress are completed before reading
+        self.writer: SaveWriter = writer
+
+    def get_usage_string(self) -> str:
+        return self.name + " [level ...]"
+
+    def get_help_string(self) -> List[str]:
+        h: str = "Show the attributes and skill increases of the character at each saved level (or at the given " + \
+                 "levels). Only the saves of the shown levels are read (a record each, from the level archive)."
+
+        return [h]
+
+    def _run(self, character: Character, args: List[str]) -> NoReturn:
+        if not all([arg.isdigit() for arg in args]):
+            raise ValueError("Expected level numbers")
+
+        if self.writer is not None:
+            self.writer.flush()
+        files: Dict[int, Path] = self.catalog.get_levels(character.name)
+        levels: List[int] = list(files.keys()) if len(args) == 0 else [int(arg) for arg in args]
+        for level in levels:
+            if level not in files:
+                raise ValueError("No save of level " + str(level) + " of " + character.name)
+
+        # The levels in the archive are read with a single map of the archive
+        archive_levels: List[int] = [level for level in levels if files[level].suffix == ARCHIVE_FILE_SUFFIX]
+        saves: Dict[int, Character] = {} if len(archive_levels) == 0 else \
+            LevelArchive(files[archive_levels[0]]).read_levels(archive_levels)
+
+        headers: List[str] = ["Level"] + [attribute.get_name()[:3] for attribute in character.attributes] + \
+                             ["Skill increases"]
+        table = []
+        for level in levels:
+            saved: Character = saves[level] if level in saves else load_level(files[level], level)
+            table.append([level] + [attribute.value for attribute in saved.attributes] +
+                         [saved.get_skills_increase()])
+
+        print(tabulated_with_centered_header(tabulate(table, headers=headers), "HISTORY"))
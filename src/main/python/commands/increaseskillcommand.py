@@ -8,13 +8,12 @@ class IncreaseSkillCommand(BaseCommand):
     def __init__(self):
         super().__init__("increase-skill")
 
-        self.add_alternative_name("increase")
-        self.add_alternative_name("inc-skill")
-        self.add_alternative_name("inc")
-
     def get_usage_string(self) -> str:
         return self.name + " name [value]"
 
+    def changes_character(self) -> bool:
+        return True
+
     def get_help_string(self) -> List[str]:
         h: str = "Increase a skill by 1 point. Argument 'value' can be used to increase (or decrease if negative) " + \
                  "by more points."
@@ -11,6 +11,9 @@ class PlanCommand(BaseCommand):
     def get_usage_string(self) -> str:
         return self.name + " att1 att2 [att3]"
 
+    def changes_character(self) -> bool:
+        return True
+
     def get_help_string(self) -> List[str]:
         h: str = "Set a plan for current level. You can choose 2 or 3 attributes to plan a level (you should only " + \
                  "choose 2 attributes if you plan to level-up Luck). If you have already set a plan, it will be" + \
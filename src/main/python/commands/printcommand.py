@@ -1,17 +1,22 @@
-from typing import List, NoReturn, Union
+from typing import Callable, List, NoReturn, Union
 
-from tabulate import tabulate
-
-from character import Character, get_major_skills_increase, get_minor_skills_increase, get_skills_increase, Skill
+from character import Character, SECTION_ATTRIBUTES, SECTION_PLAN, SECTION_SKILLS, SECTION_SUMMARY, Skill
 from commands.basecommand import BaseCommand
-from tools.common import simple_string_check, tabulated_with_centered_header
+from tools.common import simple_string_check
+from tools.fixedtable import Cell, FixedTable, LEFT, NUMERIC, RIGHT, styled
 from tools.formatting import format_base, BColors
 
+# The tables have a fixed schema, so they are rendered by FixedTable (same output as tabulate, but much faster)
+_SUMMARY_TABLE: FixedTable = FixedTable((LEFT, NUMERIC))
+_ATTRIBUTES_TABLE: FixedTable = FixedTable((LEFT, NUMERIC, NUMERIC, NUMERIC), ("Attribute", "pts", "inc", "skill pts"))
+_SKILLS_TABLE: FixedTable = FixedTable((LEFT, LEFT, NUMERIC, NUMERIC, NUMERIC))
+_PLAN_TABLE: FixedTable = FixedTable((LEFT, RIGHT, LEFT, NUMERIC, NUMERIC, NUMERIC, NUMERIC))
+
 
-def _fmt_skill_name(skill: Skill) -> str:
+def _fmt_skill_name(skill: Skill) -> Cell:
     name: str = skill.get_name()
     if skill.is_major:
-        name = format_base(name, BColors.BOLD)
+        return styled(name, BColors.BOLD)
 
     return name
 
@@ -34,12 +39,14 @@ def _fmt_skill_rem(n: int) -> str:
     return s
 
 
+def _fmt_skill_rem_cell(n: int) -> Cell:
+    return _fmt_skill_rem(n), len(str(n))
+
+
 class PrintCommand(BaseCommand):
     def __init__(self):
         super().__init__("print")
 
-        self.add_alternative_name("show")
-
     def get_usage_string(self) -> str:
         return self.name + " [all|character|attributes|skills|plan]"
 
@@ -56,13 +63,8 @@ class PrintCommand(BaseCommand):
             args = ["all"]
 
         if simple_string_check("all", args[0]):
-            print_summary(character)
-            print(" ")
-            print_attributes(character)
-            print(" ")
-            print_skills(character)
-            print(" ")
-            print_plan(character)
+            print("\n \n".join([render_summary(character), render_attributes(character), render_skills(character),
+                                 render_plan(character)]))
         elif simple_string_check("character", args[0]):
             print_summary(character)
         elif simple_string_check("attributes", args[0]):
@@ -75,32 +77,64 @@ class PrintCommand(BaseCommand):
             raise ValueError("Unknown '" + args[0] + "' Can't print")
 
 
+def _render_cached(character: Character, section: str, render: Callable[[Character], str]) -> str:
+    # Sections are only rendered again after a mutation of the character that affects them
+    text: str = character.render_cache.get(section)
+    if text is None:
+        text = render(character)
+        character.render_cache.set(section, text)
+
+    return text
+
+
 def print_summary(character: Character) -> NoReturn:
+    print(render_summary(character))
+
+
+def render_summary(character: Character) -> str:
     assert isinstance(character, Character)
 
+    return _render_cached(character, SECTION_SUMMARY, _render_summary)
+
+
+def _render_summary(character: Character) -> str:
     table = [["Level", character.level],
-             ["Major skill increases", get_major_skills_increase(character.skills)],
-             ["Minor skill increases", get_minor_skills_increase(character.skills)],
-             ["Total skill increases", get_skills_increase(character.skills)]]
-    print(tabulated_with_centered_header(tabulate(table), "CHARACTER " + character.name))
+             ["Major skill increases", character.get_major_skills_increase()],
+             ["Minor skill increases", character.get_minor_skills_increase()],
+             ["Total skill increases", character.get_skills_increase()]]
+    return _SUMMARY_TABLE.render(table, title="CHARACTER " + character.name)
 
 
 def print_attributes(character: Character) -> NoReturn:
+    print(render_attributes(character))
+
+
+def render_attributes(character: Character) -> str:
     assert isinstance(character, Character)
 
-    attribute_headers = ("Attribute", "pts", "inc", "skill pts")
+    return _render_cached(character, SECTION_ATTRIBUTES, _render_attributes)
 
+
+def _render_attributes(character: Character) -> str:
     table = []
     for attribute in character.attributes:
         ln = [attribute.name, attribute.value, "+" + str(attribute.get_attribute_gain()),
-              get_skills_increase(attribute.skills)]
+              attribute.get_skills_increase()]
         table.append(ln)
-    print(tabulated_with_centered_header(tabulate(table, headers=attribute_headers), "ATTRIBUTES"))
+    return _ATTRIBUTES_TABLE.render(table, title="ATTRIBUTES")
 
 
 def print_skills(character: Character) -> NoReturn:
+    print(render_skills(character))
+
+
+def render_skills(character: Character) -> str:
     assert isinstance(character, Character)
 
+    return _render_cached(character, SECTION_SKILLS, _render_skills)
+
+
+def _render_skills(character: Character) -> str:
     skill_headers = ("Attribute", "Skill", "pts@" + str(character.level), "inc", "pts")
 
     table = []
@@ -112,17 +146,24 @@ def print_skills(character: Character) -> NoReturn:
             ln = [None, _fmt_skill_name(skill), skill.value, _fmt_skill_increase(skill.level_ups),
                   skill.value + skill.level_ups]
             attribute_table.append(ln)
-        attribute_table[0][0] = format_base(attribute.get_name(), BColors.ITALIC)
+        attribute_table[0][0] = styled(attribute.get_name(), BColors.ITALIC)
         table.extend(attribute_table)
-    print(tabulated_with_centered_header(tabulate(table, headers=skill_headers), "SKILLS"))
+    return _SKILLS_TABLE.render(table, skill_headers, "SKILLS")
 
 
 def print_plan(character: Character) -> NoReturn:
+    print(render_plan(character))
+
+
+def render_plan(character: Character) -> str:
     assert isinstance(character, Character)
 
+    return _render_cached(character, SECTION_PLAN, _render_plan)
+
+
+def _render_plan(character: Character) -> str:
     if len(character.planned_attributes) == 0:
-        print("No plan has been set")
-        return
+        return "No plan has been set"
 
     plan_headers = ("Attribute", "pts", "Skill", "pts@" + str(character.level), "inc", "pts", "rem inc")
 
@@ -138,13 +179,12 @@ def print_plan(character: Character) -> NoReturn:
                 skill.value,
                 _fmt_skill_increase(skill.level_ups),
                 skill.value + skill.level_ups,
-                _fmt_skill_rem(character.get_remaining_skill_increase(skill))
+                _fmt_skill_rem_cell(character.get_remaining_skill_increase(skill))
             ])
-        attribute_table[0][0] = format_base(attribute.get_name(), BColors.ITALIC)
-        attribute_table[0][1] = format_base(str(get_skills_increase(attribute.skills)), BColors.ITALIC)
+        attribute_table[0][0] = styled(attribute.get_name(), BColors.ITALIC)
+        attribute_table[0][1] = styled(str(attribute.get_skills_increase()), BColors.ITALIC)
         table.extend(attribute_table)
 
-    tbl: str = tabulated_with_centered_header(tabulate(table, headers=plan_headers, colalign=("left", "right",)),
-                                              "PLAN")
-    nt: str = "Major skill increase remaining: " + _fmt_skill_rem(10 - get_major_skills_increase(character.skills))
-    print(tbl + "\n" + nt)
+    tbl: str = _PLAN_TABLE.render(table, plan_headers, "PLAN")
+    nt: str = "Major skill increase remaining: " + _fmt_skill_rem(10 - character.get_major_skills_increase())
+    return tbl + "\n" + nt
@@ -8,10 +8,8 @@ class QuitCommand(BaseCommand):
     def __init__(self):
         super().__init__("quit")
 
-        self.add_alternative_name("exit")
-
     def get_help_string(self) -> List[str]:
-        h: str = "Quits this program. No changes are saved."
+        h: str = "Quits this program. No changes are saved, but saves in progress are completed."
 
         return [h]
 
@@ -0,0 +1,29 @@
+from typing import List, NoReturn
+
+from character import Character
+from commands.basecommand import BaseCommand
+from commands.undocommand import parse_change_count
+
+
+class RedoCommand(BaseCommand):
+    def __init__(self):
+        super().__init__("redo")
+
+    def get_usage_string(self) -> str:
+        return self.name + " [n]"
+
+    def changes_character(self) -> bool:
+        return True
+
+    def is_replayable(self) -> bool:
+        # The effect depends on the history of the session
+        return False
+
+    def get_help_string(self) -> List[str]:
+        h: str = "Redo the last undone change of the character, or the last n undone changes."
+
+        return [h]
+
+    def _run(self, character: Character, args: List[str]) -> NoReturn:
+        for _ in range(parse_change_count(args)):
+            print("Redid: " + character.redo())
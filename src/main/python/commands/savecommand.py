@@ -1,19 +1,43 @@
-import pickle
+from pathlib import Path
 from typing import List, NoReturn
 
+from catalog import Catalog
 from character import Character
 from commands.basecommand import BaseCommand
+from levelarchive import save_level
+from savewriter import SaveWriter
+from sessioncache import SessionCache
 
 
 class SaveCommand(BaseCommand):
-    def __init__(self):
+    def __init__(self, path: Path = Path("."), cache: SessionCache = None, writer: SaveWriter = None):
+        assert isinstance(path, Path)
+        assert isinstance(cache, SessionCache) or cache is None
+        assert isinstance(writer, SaveWriter) or writer is None
+
         super().__init__("save")
 
+        self.path: Path = path
+        self.catalog: Catalog = Catalog(path)
+        # The character is saved through the session cache of the CLI, so that it is not written back again
+        self.cache: SessionCache = cache
+        # Saves in the background (the save is only a snapshot of the character on this thread)
+        self.writer: SaveWriter = writer
+
     def _run(self, character: Character, args: List[str]) -> NoReturn:
-        pickle.dump(character, open(character.get_name() + ".pickle", "wb"))
+        if self.cache is not None and self.cache.characters.get(character.name) is character:
+            file: Path = self.cache.write_back(character.name)
+        elif self.writer is not None:
+            file = self.writer.submit(character)
+        else:
+            file, offset = save_level(self.path, character)
+            self.catalog.add(character.name, character.level, file, offset)
+
+        # Background saves are reported by the CLI if they fail
+        print("Saved level " + str(character.level) + " to " + file.name)
 
     def get_help_string(self) -> List[str]:
-        h: str = "Saves the character to a (pickle) file. A different file is created for each character level. If " + \
-                 "a file exists for a given level, it is overwriten."
+        h: str = "Saves the character to its level archive, a (binary) file with a save of each character level. " + \
+                 "If the level has been saved before, the save is replaced."
 
         return [h]
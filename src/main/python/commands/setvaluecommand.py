@@ -9,14 +9,12 @@ class SetValueCommand(BaseCommand):
     def __init__(self):
         super().__init__("set-value")
 
-        self.add_alternative_name("setvalue")
-        self.add_alternative_name("set-val")
-        self.add_alternative_name("setval")
-        self.add_alternative_name("set")
-
     def get_usage_string(self) -> str:
         return self.name + " {level|attribute|skill} [name] value"
 
+    def changes_character(self) -> bool:
+        return True
+
     def get_help_string(self) -> List[str]:
         h: str = "Utility to set-up your character after creation. Sub-commands 'attribute' and 'skill' require a " + \
                  "'name' argument (i.e. name of the attribute or skill whose value is being set)."
@@ -0,0 +1,61 @@
+from typing import List, NoReturn
+
+from tabulate import tabulate
+
+from careersimulator import simulate_careers, SimulationResult, TrainingStrategy
+from character import Character
+from commands.basecommand import BaseCommand
+from tools.common import tabulated_with_centered_header
+
+DEFAULT_LEVELS: int = 10
+
+
+class SimulateCommand(BaseCommand):
+    def __init__(self):
+        super().__init__("simulate")
+
+    def get_usage_string(self) -> str:
+        return self.name + " careers [levels] [minors-first] [skill=weight ...]"
+
+    def get_help_string(self) -> List[str]:
+        h1: str = "Simulate random careers from the current state of the character and show the distribution of " + \
+                  "the final attributes and levels. Each career levels up to 'levels' times (default: 10), as soon " + \
+                  "as it can. Skill increases are random, with probability proportional to the weight of each " + \
+                  "skill (default: 1, or 'default=weight'), and the attributes of each level-up are chosen with " + \
+                  "probability proportional to their gains."
+        h2: str = "With 'minors-first', the attributes of each level are chosen first, and the minor skills of " + \
+                  "these attributes are trained before the major skills."
+
+        return [h1, h2]
+
+    def _run(self, character: Character, args: List[str]) -> NoReturn:
+        if len(args) == 0:
+            raise ValueError("The number of careers is required")
+
+        n_careers: int = int(args[0])
+        if n_careers < 1:
+            raise ValueError("The number of careers should be positive")
+        args = args[1:]
+
+        n_levels: int = DEFAULT_LEVELS
+        if len(args) > 0 and args[0].isdigit():
+            n_levels = int(args[0])
+            args = args[1:]
+
+        result: SimulationResult = simulate_careers(character, TrainingStrategy.parse(args), n_careers, n_levels)
+
+        simulation_headers = ("Attribute", "now", "mean", "p5", "p50", "p95")
+
+        means = result.get_mean_attributes()
+        p5s = result.get_attribute_quantiles(0.05)
+        p50s = result.get_attribute_quantiles(0.5)
+        p95s = result.get_attribute_quantiles(0.95)
+        table = []
+        for i, attribute in enumerate(character.attributes):
+            table.append([attribute.get_name(), attribute.value, round(float(means[i]), 1), p5s[i], p50s[i], p95s[i]])
+
+        print(tabulated_with_centered_header(tabulate(table, headers=simulation_headers), "SIMULATION"))
+        print("Level: mean " + str(round(result.get_mean_level(), 1)) + ", p5 " +
+              str(result.get_level_quantile(0.05)) + ", p50 " + str(result.get_level_quantile(0.5)) + ", p95 " +
+              str(result.get_level_quantile(0.95)))
+        print("Simulated " + str(result.get_n_careers()) + " careers in " + str(round(result.elapsed, 2)) + " s")
@@ -0,0 +1,71 @@
+from typing import List, NoReturn
+
+from tabulate import tabulate
+
+from character import Character
+from commands.basecommand import BaseCommand
+from levelplanner import LevelPlan, LevelPlanner
+from tools.common import tabulated_with_centered_header
+from tools.formatting import format_base, BColors
+
+
+class SolveCommand(BaseCommand):
+    def __init__(self):
+        super().__init__("solve")
+
+    def get_usage_string(self) -> str:
+        return self.name + " [n]"
+
+    def get_help_string(self) -> List[str]:
+        h: str = "Find the attribute triples that give the best multiplier total for the current level, and the " + \
+                 "skill increases (on top of the ones already made) needed to achieve them. Argument 'n' limits " + \
+                 "the number of plans shown."
+
+        return [h]
+
+    def _run(self, character: Character, args: List[str]) -> NoReturn:
+        if len(args) > 1:
+            raise ValueError("Too many input arguments")
+
+        n: int = int(args[0]) if len(args) == 1 else 3
+        if n < 1:
+            raise ValueError("The number of plans should be positive")
+
+        plans: List[LevelPlan] = LevelPlanner(character).solve()
+        if len(plans) == 0:
+            raise ValueError("Not enough major skill increases left to level up")
+
+        print("Found " + str(len(plans)) + " plan(s) with multiplier total +" + str(plans[0].get_total_gain()))
+        for i, plan in enumerate(plans[:n]):
+            print(" ")
+            print_level_plan(plan, "SOLUTION " + str(i + 1))
+
+
+def print_level_plan(plan: LevelPlan, header: str) -> NoReturn:
+    assert isinstance(plan, LevelPlan)
+    assert isinstance(header, str)
+
+    solve_headers = ("Attribute", "inc", "Skill", "skill inc")
+
+    table = []
+    for attribute, gain in zip(plan.attributes, plan.gains):
+        attribute_table = []
+        for skill, n in plan.skill_increases:
+            if skill.attribute is not attribute:
+                continue
+            name: str = format_base(skill.get_name(), BColors.BOLD) if skill.is_major else skill.get_name()
+            attribute_table.append([None, None, name, n])
+        if len(attribute_table) == 0:
+            attribute_table.append([None, None, None, None])
+        attribute_table[0][0] = format_base(attribute.get_name(), BColors.ITALIC)
+        attribute_table[0][1] = "+" + str(gain)
+        table.extend(attribute_table)
+
+    # Major skill increases that must be made outside the chosen attributes
+    for skill, n in plan.skill_increases:
+        if skill.attribute not in plan.attributes:
+            table.append([skill.attribute.get_name(), None, format_base(skill.get_name(), BColors.BOLD), n])
+
+    tbl: str = tabulated_with_centered_header(tabulate(table, headers=solve_headers), header)
+    nt: str = "Total skill increases needed: " + str(plan.get_total_skill_increase())
+    print(tbl + "\n" + nt)
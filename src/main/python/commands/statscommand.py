@@ -0,0 +1,99 @@
+from pathlib import Path
+from typing import Dict, List, NoReturn
+
+from tabulate import tabulate
+
+from character import Character
+from commandprofiler import CommandProfiler, CommandStats, LATENCY_BUCKETS
+from commands.basecommand import BaseCommand
+from tools.common import simple_string_check, tabulated_with_centered_header
+
+HISTOGRAM_WIDTH: int = 40
+
+
+class StatsCommand(BaseCommand):
+    def __init__(self, profiler: CommandProfiler = None):
+        assert isinstance(profiler, CommandProfiler) or profiler is None
+
+        super().__init__("stats")
+
+        self.profiler: CommandProfiler = profiler
+
+    def get_usage_string(self) -> str:
+        return self.name + " [histogram [command]|export file|reset]"
+
+    def get_help_string(self) -> List[str]:
+        h: str = "Show the number of calls, errors and latency of each command (requires the --profile option). " + \
+                 "'histogram' shows the latency histograms, 'export' writes the statistics to a file (Prometheus " + \
+                 "text format for .prom files, JSON otherwise) and 'reset' clears them."
+
+        return [h]
+
+    def _run(self, character: Character, args: List[str]) -> NoReturn:
+        if self.profiler is None:
+            raise ValueError("Statistics are not recorded. Start the program with --profile")
+
+        if len(args) == 0:
+            print_stats(self.profiler)
+        elif simple_string_check("histogram", args[0]):
+            if len(args) > 2:
+                raise ValueError("'stats histogram' takes at most one extra argument: command")
+            print_histograms(self.profiler, args[1] if len(args) == 2 else None)
+        elif simple_string_check("export", args[0]):
+            if len(args) != 2:
+                raise ValueError("'stats export' takes exactly one extra argument: file")
+            file: Path = Path(args[1])
+            self.profiler.write(file)
+            print("Exported statistics to " + str(file))
+            for profile_file in self.profiler.dump_profiles():
+                print("Dumped profile " + str(profile_file))
+        elif simple_string_check("reset", args[0]):
+            self.profiler.reset()
+            print("Statistics cleared")
+        else:
+            raise ValueError("Unknown '" + args[0] + "' Can't show statistics")
+
+
+def print_stats(profiler: CommandProfiler) -> NoReturn:
+    assert isinstance(profiler, CommandProfiler)
+
+    if len(profiler.stats) == 0:
+        print("No commands have been recorded")
+        return
+
+    stats_headers = ("Command", "Alias", "calls", "errors", "total ms", "mean ms", "p50 ms", "p95 ms", "max ms")
+
+    table = []
+    for (command_name, alias), stats in sorted(profiler.stats.items(), key=lambda item: -item[1].latency.sum):
+        latency = stats.latency
+        table.append([command_name, alias, stats.calls, stats.exceptions, _ms(latency.sum), _ms(latency.get_mean()),
+                      _ms(latency.get_quantile(0.5)), _ms(latency.get_quantile(0.95)), _ms(latency.max)])
+    print(tabulated_with_centered_header(tabulate(table, headers=stats_headers), "COMMAND STATISTICS"))
+
+
+def print_histograms(profiler: CommandProfiler, command_name: str = None) -> NoReturn:
+    assert isinstance(profiler, CommandProfiler)
+    assert isinstance(command_name, str) or command_name is None
+
+    command_stats: Dict[str, CommandStats] = profiler.get_command_stats()
+    if command_name is not None:
+        if command_name not in command_stats:
+            raise ValueError("No statistics for command: " + command_name)
+        command_stats = {command_name: command_stats[command_name]}
+
+    for i, (name, stats) in enumerate(command_stats.items()):
+        if i > 0:
+            print(" ")
+        histogram_headers = ("<= ms", "calls", "")
+        counts: List[int] = stats.latency.counts
+        first: int = next(k for k, count in enumerate(counts) if count > 0)
+        last: int = max(k for k, count in enumerate(counts) if count > 0)
+        table = []
+        for j in range(first, last + 1):
+            bound: str = _ms(LATENCY_BUCKETS[j]) if j < len(LATENCY_BUCKETS) else "inf"
+            table.append([bound, counts[j], "#" * round(HISTOGRAM_WIDTH * counts[j] / max(counts))])
+        print(tabulated_with_centered_header(tabulate(table, headers=histogram_headers), "LATENCY " + name))
+
+
+def _ms(seconds: float) -> str:
+    return str(round(seconds * 1000, 3))
@@ -0,0 +1,69 @@
+from typing import Callable, List, NoReturn, Optional
+
+from tabulate import tabulate
+
+from character import Attribute, Character
+from commands.basecommand import BaseCommand
+from leveladvisor import LevelUpAdvisor
+from tools.common import tabulated_with_centered_header
+
+
+class SuggestCommand(BaseCommand):
+    def __init__(self, get_advisor: Callable[[Character], LevelUpAdvisor] = None):
+        """
+        :param get_advisor: Returns the advisor of a character, e.g. the one the CLI keeps up-to-date after every
+            command. Without it, the command ranks the triples itself
+        """
+        assert callable(get_advisor) or get_advisor is None
+
+        super().__init__("suggest")
+
+        self.get_advisor: Callable[[Character], LevelUpAdvisor] = get_advisor
+
+    def get_usage_string(self) -> str:
+        return self.name + " [n]"
+
+    def get_help_string(self) -> List[str]:
+        h: str = "Show the attribute triples with the best multiplier total for a level-up with the current skill " + \
+                 "increases, and the skill increases that would raise the multiplier of each attribute. Argument " + \
+                 "'n' limits the number of triples shown (default: 5, 'all' for all of them)."
+
+        return [h]
+
+    def _run(self, character: Character, args: List[str]) -> NoReturn:
+        if len(args) > 1:
+            raise ValueError("Too many input arguments")
+
+        n: int = 5
+        if len(args) == 1:
+            n = None if args[0] == "all" else int(args[0])
+            if n is not None and n < 1:
+                raise ValueError("The number of triples should be positive")
+
+        if self.get_advisor is None:
+            advisor: LevelUpAdvisor = LevelUpAdvisor(character)
+        else:
+            advisor = self.get_advisor(character)
+        advisor.refresh(character)
+
+        suggest_headers = ("Attributes", "Total", "Next multipliers (governing skill increases)")
+
+        table = []
+        for attributes, total in advisor.get_ranking(n):
+            names: str = ", ".join([attribute.get_name() + " x" + str(attribute.get_attribute_gain())
+                                    for attribute in attributes])
+            next_increases: List[str] = [_fmt_next_increase(attribute, advisor.get_next_increase(attribute))
+                                         for attribute in attributes]
+            table.append([names, total, ", ".join([s for s in next_increases if s is not None])])
+
+        print(tabulated_with_centered_header(tabulate(table, headers=suggest_headers), "SUGGESTIONS"))
+
+
+def _fmt_next_increase(attribute: Attribute, next_increase) -> Optional[str]:
+    # e.g. '+2 Endurance -> x5': two more increases of Endurance skills raise its multiplier to x5
+    if next_increase is None:
+        return None
+
+    n, gain, _ = next_increase
+
+    return "+" + str(n) + " " + attribute.get_name() + " -> x" + str(gain)
@@ -0,0 +1,34 @@
+from typing import Callable, List, NoReturn
+
+from character import Character
+from commands.basecommand import BaseCommand
+
+
+class SwitchCommand(BaseCommand):
+    def __init__(self, switch: Callable[[str], Character]):
+        """
+        :param switch: Makes the character with the given name the current character (see the session cache of the
+            CLI), and returns it
+        """
+        assert callable(switch)
+
+        super().__init__("switch")
+
+        self.switch: Callable[[str], Character] = switch
+
+    def get_usage_string(self) -> str:
+        return self.name + " name"
+
+    def get_help_string(self) -> List[str]:
+        h: str = "Switch to another character of the directory. Characters stay in memory, so switching back " + \
+                 "keeps their unsaved changes. When too many characters are in memory, the least recently used " + \
+                 "one is saved (if changed) and dropped."
+
+        return [h]
+
+    def _run(self, character: Character, args: List[str]) -> NoReturn:
+        if len(args) != 1:
+            raise ValueError("Expected the name of a character")
+
+        character = self.switch(args[0])
+        print("Switched to " + character.name + " (level " + str(character.level) + ")")
@@ -0,0 +1,39 @@
+from typing import List, NoReturn
+
+from character import Character
+from commands.basecommand import BaseCommand
+
+
+class UndoCommand(BaseCommand):
+    def __init__(self):
+        super().__init__("undo")
+
+    def get_usage_string(self) -> str:
+        return self.name + " [n]"
+
+    def changes_character(self) -> bool:
+        return True
+
+    def is_replayable(self) -> bool:
+        # The effect depends on the history of the session
+        return False
+
+    def get_help_string(self) -> List[str]:
+        h: str = "Undo the last change of the character (e.g. a skill increase or a level-up), or the last n " + \
+                 "changes. Undone changes can be redone with 'redo', until a new change is made."
+
+        return [h]
+
+    def _run(self, character: Character, args: List[str]) -> NoReturn:
+        for _ in range(parse_change_count(args)):
+            print("Undid: " + character.undo())
+
+
+def parse_change_count(args: List[str]) -> int:
+    # Number of changes argument of 'undo' and 'redo'
+    if len(args) == 0:
+        return 1
+    if len(args) > 1 or not args[0].isdigit() or int(args[0]) == 0:
+        raise ValueError("Expected a positive number of changes")
+
+    return int(args[0])
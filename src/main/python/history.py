@@ -0,0 +1,86 @@
+from collections import deque
+from typing import Deque, List, NoReturn, Tuple
+
+# Maximum number of changes that can be undone. Older changes are dropped.
+DEFAULT_HISTORY_SIZE: int = 10000
+
+# A field update: (object, field name, old value, new value)
+Edit = Tuple[object, str, object, object]
+
+
+class Change:
+    """
+    The field updates of a single mutation (e.g. a skill increase, or a level-up). Only the updated fields are stored,
+    so the memory of a change is proportional to what it changed, not to the size of the character.
+    """
+    __slots__ = ("description", "edits")
+
+    def __init__(self, description: str, edits: Tuple[Edit, ...]):
+        assert isinstance(description, str)
+        assert isinstance(edits, tuple)
+
+        self.description: str = description
+        self.edits: Tuple[Edit, ...] = edits
+
+
+class History:
+    """
+    Undo and redo stacks of changes. Recording a new change clears the redo stack. Both undo and redo take constant time
+    (a stack pop, plus applying the few field updates of the change).
+
+    The stacks are created on the first change: every character (and every copy of one) has a history, and an empty
+    deque takes a whole block of memory.
+    """
+    __slots__ = ("max_size", "undo_stack", "redo_stack")
+
+    def __init__(self, max_size: int = DEFAULT_HISTORY_SIZE):
+        assert isinstance(max_size, int) and max_size > 0
+
+        self.max_size: int = max_size
+        self.undo_stack: Deque[Change] = None
+        self.redo_stack: List[Change] = None
+
+    def record(self, change: Change) -> NoReturn:
+        assert isinstance(change, Change)
+
+        if self.undo_stack is None:
+            self.undo_stack = deque(maxlen=self.max_size)
+            self.redo_stack = []
+        self.undo_stack.append(change)
+        self.redo_stack.clear()
+
+    def can_undo(self) -> bool:
+        return self.undo_stack is not None and len(self.undo_stack) > 0
+
+    def can_redo(self) -> bool:
+        return self.redo_stack is not None and len(self.redo_stack) > 0
+
+    def pop_undo(self) -> Change:
+        """
+        :return: The last change, which is moved to the redo stack (the caller applies its old values)
+        :raises ValueError: If there is nothing to undo
+        """
+        if not self.can_undo():
+            raise ValueError("Nothing to undo")
+
+        change: Change = self.undo_stack.pop()
+        self.redo_stack.append(change)
+
+        return change
+
+    def pop_redo(self) -> Change:
+        """
+        :return: The last undone change, which is moved back to the undo stack (the caller applies its new values)
+        :raises ValueError: If there is nothing to redo
+        """
+        if not self.can_redo():
+            raise ValueError("Nothing to redo")
+
+        change: Change = self.redo_stack.pop()
+        self.undo_stack.append(change)
+
+        return change
+
+    def clear(self) -> NoReturn:
+        self.undo_stack = None
+        self.redo_stack = None
@@ -0,0 +1,262 @@
+# Write-ahead journals of the commands that change a character, for crash recovery. A journal is a header followed by
+# entries:
+#
+#   header:     magic (4s), version (H), character record size (H)
+#   entry:      type (B), payload size (H), CRC32 of the payload (I), payload
+#
+# A checkpoint entry holds the full state of the character (a save record, see 'savefile'), and a command entry a
+# command (UTF-8). Recovery starts from the last checkpoint and replays the commands after it. A journal starts with a
+# checkpoint; periodic checkpoints replace the journal with a new one (to a temporary file, which then replaces it), so
+# that it stays short. An entry that was not completely written (a crash during a write) ends the journal.
+#
+# A session locks the journals it uses (a lock on a '.lock' file next to the journal, which the system releases if the
+# session crashes), so that another session does not replace or recover a journal that is in use.
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO, List, NoReturn, Optional, Tuple
+
+from character import Character
+from savefile import encode_record, RECORD_SIZE
+
+JOURNAL_FILE_SUFFIX: str = ".olmj"
+
+JOURNAL_MAGIC: bytes = b"OLMJ"
+JOURNAL_VERSION: int = 1
+
+CHECKPOINT_ENTRY: int = 1
+COMMAND_ENTRY: int = 2
+
+# Entries per commit (write and fsync): a crash loses at most the entries that were not committed
+DEFAULT_GROUP_SIZE: int = 256
+# Entries between checkpoints
+DEFAULT_CHECKPOINT_INTERVAL: int = 10000
+
+_HEADER: struct.Struct = struct.Struct("<4sHH")
+_ENTRY: struct.Struct = struct.Struct("<BHI")
+
+
+def get_journal_file_name(name: str) -> str:
+    return name + JOURNAL_FILE_SUFFIX
+
+
+class CommandJournal:
+    """
+    The journal of a character. Entries are buffered and committed in groups (group commit), so that a long script is
+    not bound by fsync calls; a group is committed when it is full, on 'commit', and on 'close'.
+    """
+
+    def __init__(self, file: Path, group_size: int = DEFAULT_GROUP_SIZE,
+                 checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        :param file: The journal file
+        :param group_size: The number of entries per commit (1 commits every entry)
+        :param checkpoint_interval: The number of entries after which a checkpoint is due
+        """
+        assert isinstance(file, Path)
+        assert isinstance(group_size, int) and group_size > 0
+        assert isinstance(checkpoint_interval, int) and checkpoint_interval > 0
+
+        self.file: Path = file
+        self.lock_file: Path = file.with_name(file.name + ".lock")
+        self.group_size: int = group_size
+        self.checkpoint_interval: int = checkpoint_interval
+        self._f: BinaryIO = None
+        self._lock_fd: int = None
+        self._buffer: bytearray = bytearray()
+        self._n_buffered: int = 0
+        self._n_since_checkpoint: int = 0
+
+        self.n_entries: int = 0
+        self.n_commits: int = 0
+        self.n_checkpoints: int = 0
+
+    def exists(self) -> bool:
+        return self.file.exists()
+
+    def lock(self) -> bool:
+        """
+        Lock the journal until 'close'.
+
+        :return: Whether the journal is locked (False if another session holds the lock)
+        """
+        if self._lock_fd is not None:
+            return True
+
+        while True:
+            fd: int = os.open(self.lock_file, os.O_RDWR | os.O_CREAT)
+            if not _try_lock(fd):
+                os.close(fd)
+                return False
+            # The lock file may have been removed (by the session that held the lock) before it was locked here
+            try:
+                if os.path.samestat(os.fstat(fd), os.stat(self.lock_file)):
+                    self._lock_fd = fd
+                    return True
+            except FileNotFoundError:
+                pass
+            os.close(fd)
+
+    def recover(self) -> Tuple[Optional[bytes], List[str]]:
+        """
+        Read the journal left by a session that did not end normally.
+
+        :return: The record of the last checkpoint (None if there is none), and the commands after it
+        """
+        with open(self.file, "rb") as f:
+            data: bytes = f.read()
+
+        if len(data) < _HEADER.size:
+            return None, []
+        magic, version, record_size = _HEADER.unpack_from(data, 0)
+        if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION or record_size != RECORD_SIZE:
+            raise ValueError("Not a supported journal: " + self.file.name)
+
+        checkpoint: Optional[bytes] = None
+        commands: List[str] = []
+        offset: int = _HEADER.size
+        while offset + _ENTRY.size <= len(data):
+            entry_type, size, checksum = _ENTRY.unpack_from(data, offset)
+            payload: bytes = data[offset + _ENTRY.size:offset + _ENTRY.size + size]
+            if len(payload) != size or zlib.crc32(payload) != checksum:
+                # Not completely written
+                break
+            offset += _ENTRY.size + size
+
+            if entry_type == CHECKPOINT_ENTRY:
+                checkpoint = payload
+                commands = []
+            elif entry_type == COMMAND_ENTRY:
+                commands.append(payload.decode("utf-8"))
+            else:
+                break
+
+        return checkpoint, commands
+
+    def start(self, character: Character) -> NoReturn:
+        """
+        Start a new journal (replacing the file) from the state of a character.
+        """
+        self.checkpoint(character)
+
+    def append(self, command_str: str) -> NoReturn:
+        """
+        Journal a command that was run (committed with its group).
+        """
+        assert isinstance(command_str, str)
+
+        self._add_entry(COMMAND_ENTRY, command_str.encode("utf-8"))
+
+    def append_state(self, character: Character) -> NoReturn:
+        """
+        Journal the state of a character, e.g. after a command that cannot be replayed (such as 'undo', whose effect
+        depends on the history of the session).
+        """
+        self._add_entry(CHECKPOINT_ENTRY, encode_record(character))
+
+    def is_checkpoint_due(self) -> bool:
+        return self._n_since_checkpoint >= self.checkpoint_interval
+
+    def checkpoint(self, character: Character) -> NoReturn:
+        """
+        Replace the journal with a checkpoint of the state of a character (which includes the effect of all entries).
+        """
+        assert isinstance(character, Character)
+
+        if self._f is not None:
+            self._f.close()
+
+        record: bytes = encode_record(character)
+        tmp_file: Path = self.file.with_name(self.file.name + ".tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, RECORD_SIZE) +
+                    _ENTRY.pack(CHECKPOINT_ENTRY, len(record), zlib.crc32(record)) + record)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.file)
+
+        self._f = open(self.file, "ab")
+        self._buffer = bytearray()
+        self._n_buffered = 0
+        self._n_since_checkpoint = 0
+        self.n_checkpoints += 1
+
+    def commit(self) -> NoReturn:
+        """
+        Write and fsync the buffered entries.
+        """
+        if self._n_buffered == 0:
+            return
+
+        self._f.write(self._buffer)
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._buffer = bytearray()
+        self._n_buffered = 0
+        self.n_commits += 1
+
+    def close(self, delete: bool = False) -> NoReturn:
+        """
+        Close the journal and release its lock.
+
+        :param delete: Whether to delete the journal (when the session ends normally), otherwise it is committed
+        """
+        try:
+            if self._f is not None:
+                try:
+                    if not delete:
+                        self.commit()
+                finally:
+                    self._f.close()
+                    self._f = None
+            if delete and self.file.exists():
+                os.remove(self.file)
+        finally:
+            self._unlock()
+
+    def _unlock(self) -> NoReturn:
+        if self._lock_fd is None:
+            return
+
+        # Removed while it is locked, see 'lock' (Windows does not remove open files: it is removed once closed)
+        if os.name != "nt":
+            _remove(self.lock_file)
+        os.close(self._lock_fd)
+        self._lock_fd = None
+        if os.name == "nt":
+            _remove(self.lock_file)
+
+    def _add_entry(self, entry_type: int, payload: bytes) -> NoReturn:
+        if self._f is None:
+            raise RuntimeError("The journal has not been started")
+
+        self._buffer += _ENTRY.pack(entry_type, len(payload), zlib.crc32(payload))
+        self._buffer += payload
+        self._n_buffered += 1
+        self._n_since_checkpoint += 1
+        self.n_entries += 1
+        if self._n_buffered >= self.group_size:
+            self.commit()
+
+
+def _try_lock(fd: int) -> bool:
+    # Imported here: each is only available on its system
+    try:
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+
+    return True
+
+
+def _remove(file: Path) -> NoReturn:
+    try:
+        os.remove(file)
+    except OSError:
+        pass
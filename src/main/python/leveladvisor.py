@@ -0,0 +1,112 @@
+from itertools import combinations
+from typing import Dict, List, NoReturn, Optional, Tuple
+
+from character import Attribute, Character, get_attribute_gain_for_increase, Skill
+from levelplanner import LEVEL_UP_ATTRIBUTES, MAX_ATTRIBUTE_SKILLS_INCREASE, MAX_SKILL_VALUE
+
+# The highest total gain of a triple
+_MAX_TOTAL_GAIN: int = LEVEL_UP_ATTRIBUTES * get_attribute_gain_for_increase(MAX_ATTRIBUTE_SKILLS_INCREASE)
+
+
+class LevelUpAdvisor:
+    """
+    Ranking of all attribute triples of a level-up by total gain. Triples are kept in buckets by total gain, and when
+    the gain of an attribute changes, only the triples that contain it move to another bucket. Reading the ranking does
+    not compute anything.
+    """
+
+    def __init__(self, character: Character = None):
+        assert isinstance(character, Character) or character is None
+
+        self.character: Character = None
+        self.triples: List[Tuple[int, ...]] = []
+        # Total gain -> triples (as an ordered set of triple indices)
+        self.buckets: List[Dict[int, None]] = []
+        self.triple_gains: List[int] = []
+        self.gains: List[int] = []
+        self.skills_increases: List[int] = []
+        self._attribute_triples: List[List[int]] = []
+
+        if character is not None:
+            self.refresh(character)
+
+    def refresh(self, character: Character) -> NoReturn:
+        """
+        Bring the ranking up-to-date with the character: only the attributes whose skill increases changed since the
+        last refresh are updated. A different character is ranked anew.
+
+        :param character: The character
+        """
+        if character is not self.character or len(character.attributes) != len(self.gains):
+            self._build(character)
+            return
+
+        skills_increases: List[int] = [attribute.skills_increase for attribute in character.attributes]
+        if skills_increases == self.skills_increases:
+            return
+
+        for a, attribute in enumerate(character.attributes):
+            if skills_increases[a] != self.skills_increases[a]:
+                gain: int = attribute.get_attribute_gain()
+                if gain != self.gains[a]:
+                    self._set_gain(a, gain)
+        self.skills_increases = skills_increases
+
+    def get_ranking(self, n: int = None) -> List[Tuple[Tuple[Attribute, ...], int]]:
+        """
+        :param n: The number of triples (default: all)
+        :return: The best triples and their total gains, best first (ties in attribute order)
+        """
+        ranking: List[Tuple[Tuple[Attribute, ...], int]] = []
+        for total in range(len(self.buckets) - 1, -1, -1):
+            for t in sorted(self.buckets[total]):
+                if n is not None and len(ranking) >= n:
+                    return ranking
+                ranking.append((tuple([self.character.attributes[a] for a in self.triples[t]]), total))
+
+        return ranking
+
+    def get_next_increase(self, attribute: Attribute) -> Optional[Tuple[int, int, List[Skill]]]:
+        """
+        :param attribute: An attribute of the character
+        :return: The number of governing skill increases that raise the gain of the attribute, the raised gain, and the
+            skills that can still be increased; or None if the gain cannot be raised
+        """
+        assert isinstance(attribute, Attribute)
+
+        skills: List[Skill] = [skill for skill in attribute.skills if skill.value + skill.level_ups < MAX_SKILL_VALUE]
+        if len(skills) == 0:
+            return None
+
+        gain: int = get_attribute_gain_for_increase(attribute.skills_increase)
+        for n in range(1, MAX_ATTRIBUTE_SKILLS_INCREASE + 1):
+            next_gain: int = get_attribute_gain_for_increase(attribute.skills_increase + n)
+            if next_gain > gain:
+                return n, next_gain, skills
+
+        return None
+
+    def _build(self, character: Character) -> NoReturn:
+        n_attributes: int = len(character.attributes)
+
+        self.character = character
+        self.triples = list(combinations(range(n_attributes), LEVEL_UP_ATTRIBUTES))
+        self.buckets = [{} for _ in range(_MAX_TOTAL_GAIN + 1)]
+        self.skills_increases = [attribute.skills_increase for attribute in character.attributes]
+        self.gains = [attribute.get_attribute_gain() for attribute in character.attributes]
+        self.triple_gains = [sum([self.gains[a] for a in triple]) for triple in self.triples]
+        self._attribute_triples = [[] for _ in range(n_attributes)]
+
+        for t, triple in enumerate(self.triples):
+            self.buckets[self.triple_gains[t]][t] = None
+            for a in triple:
+                self._attribute_triples[a].append(t)
+
+    def _set_gain(self, a: int, gain: int) -> NoReturn:
+        difference: int = gain - self.gains[a]
+        self.gains[a] = gain
+
+        for t in self._attribute_triples[a]:
+            del self.buckets[self.triple_gains[t]][t]
+            self.triple_gains[t] += difference
+            self.buckets[self.triple_gains[t]][t] = None
@@ -0,0 +1,253 @@
+# Level-history archives: every saved level of a character in a single file, read through mmap. An archive is a header,
+# an offset table with one slot per level, and the level records (in the order they were saved):
+#
+#   header:     magic (4s), version (H), flags (H), record size (I), number of level slots (I)
+#   table:      slots x [record offset (I), 0 if the level is not saved], slot i is level i + 1
+#   record:     level (h), reserved (H), CRC32 of the character record (I), character record (see 'savefile')
+#
+# Saving a level appends its record and then points the slot of the level to it, so a save is committed by a single
+# aligned 4-byte write; an interrupted save leaves the archive as it was. Saving a level again appends a new record (the
+# old one is left unused). An archive whose table is too small for a level is rewritten with a larger table (to a
+# temporary file, which then replaces the archive). All values are little-endian.
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from character import Character
+from savefile import decode_record, encode_record, load_character, RECORD_SIZE
+
+ARCHIVE_FILE_SUFFIX: str = ".olma"
+
+ARCHIVE_MAGIC: bytes = b"OLMA"
+ARCHIVE_VERSION: int = 1
+
+# Number of level slots of a new archive
+DEFAULT_TABLE_SIZE: int = 64
+
+_HEADER: struct.Struct = struct.Struct("<4sHHII")
+_SLOT: struct.Struct = struct.Struct("<I")
+_RECORD_HEADER: struct.Struct = struct.Struct("<hHI")
+
+
+def get_archive_file_name(name: str) -> str:
+    return name + ARCHIVE_FILE_SUFFIX
+
+
+def parse_archive_file_name(file_name: str) -> Optional[str]:
+    """
+    :param file_name: A file name, e.g. 'Adventurer.olma'
+    :return: The character name, or None if this is not an archive file name
+    """
+    assert isinstance(file_name, str)
+
+    if not file_name.endswith(ARCHIVE_FILE_SUFFIX) or len(file_name) == len(ARCHIVE_FILE_SUFFIX):
+        return None
+
+    return file_name[:-len(ARCHIVE_FILE_SUFFIX)]
+
+
+class LevelArchive:
+    """
+    The level-history archive of a character. Reads map the file and only touch the header, the table and the records
+    that are read; appends write a record and a slot. There should be a single writer of an archive at a time.
+    """
+
+    def __init__(self, file: Path):
+        assert isinstance(file, Path)
+
+        self.file: Path = file
+
+    def get_levels(self) -> Dict[int, int]:
+        """
+        :return: The record offset of each saved level, by level
+        """
+        with open(self.file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _read_table(mm)
+
+    def read_level(self, level: int) -> Character:
+        """
+        :param level: A saved level
+        :return: The character as saved for the level
+        :raises ValueError: If the level is not saved, or its record is corrupted
+        """
+        assert isinstance(level, int)
+
+        with open(self.file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            n_slots: int = _read_header(mm)
+            offset: int = _SLOT.unpack_from(mm, _HEADER.size + (level - 1) * _SLOT.size)[0] \
+                if 1 <= level <= n_slots else 0
+            if offset == 0:
+                raise ValueError("No save of level " + str(level) + " in " + self.file.name)
+
+            return _read_record(mm, offset, level)
+
+    def read_levels(self, levels: List[int] = None) -> Dict[int, Character]:
+        """
+        Read several levels with a single map of the archive (e.g. for history queries).
+
+        :param levels: Saved levels (default: all saved levels)
+        :return: The character as saved for each level, by level
+        :raises ValueError: If a level is not saved, or its record is corrupted
+        """
+        with open(self.file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offsets: Dict[int, int] = _read_table(mm)
+            if levels is None:
+                levels = list(offsets.keys())
+
+            characters: Dict[int, Character] = {}
+            for level in levels:
+                if level not in offsets:
+                    raise ValueError("No save of level " + str(level) + " in " + self.file.name)
+                characters[level] = _read_record(mm, offsets[level], level)
+
+        return characters
+
+    def append(self, character: Character) -> int:
+        """
+        Save the current level of a character.
+
+        :param character: The character
+        :return: The offset of the new record
+        """
+        assert isinstance(character, Character)
+
+        return self.append_record(character.level, encode_record(character))
+
+    def append_record(self, level: int, character_record: bytes) -> int:
+        """
+        Save a level that has already been encoded (e.g. a snapshot taken on another thread, see 'SaveWriter').
+
+        :param level: The level
+        :param character_record: The character record (see 'encode_record')
+        :return: The offset of the new record
+        """
+        assert isinstance(level, int)
+        assert isinstance(character_record, bytes) and len(character_record) == RECORD_SIZE
+
+        if level < 1:
+            raise ValueError("Only positive levels can be saved")
+        record: bytes = _RECORD_HEADER.pack(level, 0, zlib.crc32(character_record)) + character_record
+
+        if not self.file.exists():
+            return self._rewrite({level: record})[level]
+
+        with open(self.file, "r+b") as f:
+            n_slots: int = _read_header(f.read(_HEADER.size))
+            if level > n_slots:
+                records: Dict[int, bytes] = self._read_records()
+                records[level] = record
+                return self._rewrite(records)[level]
+
+            # The record first, then the slot that points to it
+            offset: int = f.seek(0, os.SEEK_END)
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+
+            f.seek(_HEADER.size + (level - 1) * _SLOT.size)
+            f.write(_SLOT.pack(offset))
+            f.flush()
+            os.fsync(f.fileno())
+
+        return offset
+
+    def _read_records(self) -> Dict[int, bytes]:
+        with open(self.file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return {level: mm[offset:offset + _RECORD_HEADER.size + RECORD_SIZE]
+                    for level, offset in self.get_levels().items()}
+
+    def _rewrite(self, records: Dict[int, bytes]) -> Dict[int, int]:
+        # Write a compacted archive with a table large enough for all levels, and atomically replace the archive
+        n_slots: int = DEFAULT_TABLE_SIZE
+        while n_slots < max(records.keys()):
+            n_slots *= 2
+
+        table: bytearray = bytearray(n_slots * _SLOT.size)
+        offsets: Dict[int, int] = {}
+        offset: int = _HEADER.size + len(table)
+        for level in sorted(records.keys()):
+            _SLOT.pack_into(table, (level - 1) * _SLOT.size, offset)
+            offsets[level] = offset
+            offset += len(records[level])
+
+        tmp_file: Path = self.file.with_name(self.file.name + ".tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0, RECORD_SIZE, n_slots))
+            f.write(table)
+            for level in sorted(records.keys()):
+                f.write(records[level])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.file)
+
+        return offsets
+
+
+def load_level(file: Path, level: int) -> Character:
+    """
+    Load a saved level from an archive, or from a save file of the level (binary or legacy).
+
+    :param file: The archive or save file
+    :param level: The level
+    :return: The loaded character
+    """
+    assert isinstance(file, Path)
+
+    if file.suffix == ARCHIVE_FILE_SUFFIX:
+        return LevelArchive(file).read_level(level)
+
+    return load_character(file)
+
+
+def save_level(path: Path, character: Character) -> Tuple[Path, int]:
+    """
+    Save the current level of a character to its archive in a directory.
+
+    :return: The archive file and the offset of the record
+    """
+    assert isinstance(path, Path)
+
+    file: Path = path / get_archive_file_name(character.name)
+
+    return file, LevelArchive(file).append(character)
+
+
+def _read_header(buffer) -> int:
+    # The number of level slots
+    if len(buffer) < _HEADER.size:
+        raise ValueError("Archive is truncated")
+
+    magic, version, _, record_size, n_slots = _HEADER.unpack_from(buffer, 0)
+    if magic != ARCHIVE_MAGIC:
+        raise ValueError("Not a level archive")
+    if version != ARCHIVE_VERSION:
+        raise ValueError("Unsupported archive version: " + str(version))
+    if record_size != RECORD_SIZE:
+        raise ValueError("Unsupported archive record size: " + str(record_size))
+
+    return n_slots
+
+
+def _read_table(mm: mmap.mmap) -> Dict[int, int]:
+    # The record offset of each saved level
+    n_slots: int = _read_header(mm)
+
+    return {slot + 1: offset for slot, (offset,) in
+            enumerate(_SLOT.iter_unpack(mm[_HEADER.size:_HEADER.size + n_slots * _SLOT.size])) if offset != 0}
+
+
+def _read_record(mm: mmap.mmap, offset: int, level: int) -> Character:
+    end: int = offset + _RECORD_HEADER.size + RECORD_SIZE
+    if end > len(mm):
+        raise ValueError("Archive is truncated")
+
+    record_level, _, checksum = _RECORD_HEADER.unpack_from(mm, offset)
+    # A copy of the record, so that the map can be closed
+    record: bytes = mm[offset + _RECORD_HEADER.size:end]
+    if record_level != level or zlib.crc32(record) != checksum:
+        raise ValueError("Archive record of level " + str(level) + " is corrupted")
+
+    return decode_record(record)
@@ -0,0 +1,218 @@
+from itertools import combinations
+from typing import Dict, List, Tuple
+
+from character import Attribute, Character, Skill, get_attribute_gain_for_increase
+
+MAJOR_SKILLS_INCREASE_PER_LEVEL: int = 10
+MAX_ATTRIBUTE_SKILLS_INCREASE: int = 10
+MAX_SKILL_VALUE: int = 100
+MAX_ATTRIBUTE_VALUE: int = 100
+LEVEL_UP_ATTRIBUTES: int = 3
+
+# (attribute indices, attribute gains, additional increase for every skill)
+TriplePlan = Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]
+
+
+class LevelPlan:
+    def __init__(self, attributes: List[Attribute], gains: List[int], skill_increases: List[Tuple[Skill, int]]):
+        assert len(attributes) == len(gains)
+
+        self.attributes: List[Attribute] = attributes
+        self.gains: List[int] = gains
+        self.skill_increases: List[Tuple[Skill, int]] = skill_increases
+
+    def get_total_gain(self) -> int:
+        return sum(self.gains)
+
+    def get_total_skill_increase(self) -> int:
+        return sum([n for _, n in self.skill_increases])
+
+    def get_attribute_names(self) -> List[str]:
+        return [attribute.get_name() for attribute in self.attributes]
+
+
+class LevelPlanner:
+    def __init__(self, character: Character):
+        assert isinstance(character, Character)
+
+        self.character: Character = character
+
+    def solve(self) -> List[LevelPlan]:
+        """
+        Find the attribute triples that give the best multiplier total for the current level, together with the skill
+        increases (on top of the ones already made) that achieve it. Plans are sorted by the number of skill increases
+        they require.
+
+        :return: The best plans (empty if the character cannot reach a level-up)
+        """
+        character: Character = self.character
+
+        attribute_idx: Dict[int, int] = {id(attribute): i for i, attribute in enumerate(character.attributes)}
+        triple_plans: List[TriplePlan] = solve_level(
+            tuple([skill.value for skill in character.skills]),
+            tuple([skill.level_ups for skill in character.skills]),
+            tuple([skill.is_major for skill in character.skills]),
+            tuple([attribute_idx[id(skill.attribute)] for skill in character.skills]),
+            tuple([attribute.value for attribute in character.attributes]),
+            major_increase=character.get_major_skills_increase(),
+            best_only=True)
+
+        plans: List[LevelPlan] = []
+        for triple, gains, increases in triple_plans:
+            skill_increases = [(character.skills[i], n) for i, n in enumerate(increases) if n > 0]
+            plans.append(LevelPlan([character.attributes[a] for a in triple], list(gains), skill_increases))
+
+        return plans
+
+
+def solve_level(skill_values: Tuple[int, ...], skill_level_ups: Tuple[int, ...], skill_majors: Tuple[bool, ...],
+                skill_attributes: Tuple[int, ...], attribute_values: Tuple[int, ...], major_increase: int = None,
+                best_only: bool = False) -> List[TriplePlan]:
+    """
+    Search the skill increase allocations of a single level. For every attribute triple, the allocation with the best
+    (effective) multiplier total and the fewest skill increases is kept.
+
+    The search works on plain tuples so that it can be reused by planners that do not keep Character objects around.
+    Gains are counted only up to the attribute cap, and skills are never increased past the skill cap.
+
+    :param skill_values: The value of each skill at the start of the level
+    :param skill_level_ups: The increases of each skill during the current level
+    :param skill_majors: Whether each skill is a major skill
+    :param skill_attributes: The index of the governing attribute of each skill
+    :param attribute_values: The value of each attribute
+    :param major_increase: The major skill increases of the current level (computed from the skills if not given)
+    :param best_only: When set to true, only return the triples with the best multiplier total
+    :return: A list of (triple, gains, increases) sorted by decreasing gain and increasing number of skill increases
+    """
+    n_skills: int = len(skill_values)
+    n_attributes: int = len(attribute_values)
+
+    rooms: List[int] = [max(0, MAX_SKILL_VALUE - v - u) for v, u in zip(skill_values, skill_level_ups)]
+    current: List[int] = [0] * n_attributes
+    major_rooms: List[int] = [0] * n_attributes
+    minor_rooms: List[int] = [0] * n_attributes
+    for i in range(n_skills):
+        a: int = skill_attributes[i]
+        current[a] += skill_level_ups[i]
+        if skill_majors[i]:
+            major_rooms[a] += rooms[i]
+        else:
+            minor_rooms[a] += rooms[i]
+
+    if major_increase is None:
+        major_increase = _get_major_increase(skill_values, skill_level_ups, skill_majors)
+    remaining: int = max(0, MAJOR_SKILLS_INCREASE_PER_LEVEL - major_increase)
+    total_major_room: int = sum(major_rooms)
+    if total_major_room < remaining:
+        return []
+
+    # Best (gain, minor increases) of each attribute, for every number of major increases placed in it
+    options: List[List[Tuple[int, int]]] = [
+        _get_attribute_options(current[a], major_rooms[a], minor_rooms[a], attribute_values[a], remaining)
+        for a in range(n_attributes)]
+    upper_bounds: List[int] = [max([gain for gain, _ in options[a]]) for a in range(n_attributes)]
+
+    triples: List[Tuple[int, ...]] = sorted(combinations(range(n_attributes), LEVEL_UP_ATTRIBUTES),
+                                            key=lambda t: -sum([upper_bounds[a] for a in t]))
+
+    results: List[Tuple[int, int, TriplePlan]] = []
+    best_gain: int = -1
+    for triple in triples:
+        if best_only and sum([upper_bounds[a] for a in triple]) < best_gain:
+            # Triples are sorted by their bound, so no other triple can reach the best gain
+            break
+
+        outside_room: int = total_major_room - sum([major_rooms[a] for a in triple])
+        solution = _solve_triple(triple, options, major_rooms, remaining, outside_room)
+        if solution is None:
+            continue
+        gain, minors, majors = solution
+        best_gain = max(best_gain, gain)
+
+        increases: List[int] = _distribute(triple, majors, options, remaining, rooms, skill_majors, skill_attributes)
+        gains = tuple([options[a][m][0] for a, m in zip(triple, majors)])
+        results.append((gain, minors, (triple, gains, tuple(increases))))
+
+    if best_only:
+        results = [result for result in results if result[0] == best_gain]
+    results.sort(key=lambda result: (-result[0], result[1]))
+
+    return [plan for _, _, plan in results]
+
+
+def _get_major_increase(skill_values, skill_level_ups, skill_majors) -> int:
+    # Same rule as 'Character.get_major_skills_increase': maxed skills do not count towards a level-up
+    return sum([u for v, u, major in zip(skill_values, skill_level_ups, skill_majors) if major and v < MAX_SKILL_VALUE])
+
+
+def _get_attribute_options(current: int, major_room: int, minor_room: int, value: int,
+                           remaining: int) -> List[Tuple[int, int]]:
+    headroom: int = max(0, MAX_ATTRIBUTE_VALUE - value)
+
+    options: List[Tuple[int, int]] = []
+    for m in range(min(major_room, remaining) + 1):
+        best: Tuple[int, int] = (min(get_attribute_gain_for_increase(current + m), headroom), 0)
+        # More than 10 increases per attribute never improve the gain
+        for n in range(1, min(minor_room, max(0, MAX_ATTRIBUTE_SKILLS_INCREASE - current - m)) + 1):
+            gain: int = min(get_attribute_gain_for_increase(current + m + n), headroom)
+            if gain > best[0]:
+                best = (gain, n)
+        options.append(best)
+
+    return options
+
+
+def _solve_triple(triple: Tuple[int, ...], options: List[List[Tuple[int, int]]], major_rooms: List[int],
+                  remaining: int, outside_room: int):
+    memo: Dict[Tuple[int, int], Tuple[int, int, Tuple[int, ...]]] = {}
+
+    def best_from(i: int, r: int):
+        # Best (gain, minors, majors per attribute) for attributes triple[i:] when r major increases are left
+        if i == len(triple):
+            # Whatever is left must fit in the major skills of the other attributes
+            return (0, 0, ()) if r <= outside_room else None
+
+        key = (i, r)
+        if key in memo:
+            return memo[key]
+
+        a: int = triple[i]
+        best = None
+        for m in range(min(major_rooms[a], r), -1, -1):
+            rest = best_from(i + 1, r - m)
+            if rest is None:
+                continue
+            gain, minors = options[a][m]
+            candidate = (gain + rest[0], minors + rest[1], (m,) + rest[2])
+            if best is None or (candidate[0], -candidate[1]) > (best[0], -best[1]):
+                best = candidate
+
+        memo[key] = best
+        return best
+
+    return best_from(0, remaining)
+
+
+def _distribute(triple: Tuple[int, ...], majors: Tuple[int, ...], options: List[List[Tuple[int, int]]], remaining: int,
+                rooms: List[int], skill_majors: Tuple[bool, ...], skill_attributes: Tuple[int, ...]) -> List[int]:
+    increases: List[int] = [0] * len(rooms)
+
+    def fill(is_major: bool, attributes, n: int) -> int:
+        for i in range(len(rooms)):
+            if n == 0:
+                break
+            if skill_majors[i] == is_major and skill_attributes[i] in attributes:
+                k: int = min(rooms[i] - increases[i], n)
+                increases[i] += k
+                n -= k
+        return n
+
+    for a, m in zip(triple, majors):
+        fill(True, (a,), m)
+        fill(False, (a,), options[a][m][1])
+
+    outside = set(skill_attributes).difference(triple)
+    left: int = fill(True, outside, remaining - sum(majors))
+    assert left == 0
+
+    return increases
@@ -1,20 +1,17 @@
-import pickle
-from argparse import ArgumentParser, Namespace
+import sys
+from io import StringIO
 from pathlib import Path
-from typing import List, NoReturn
+from typing import Callable, Dict, Iterable, List, NoReturn, Optional, Set
 
 from character import Character
 from commands.basecommand import BaseCommand
-from commands.helpcommand import HelpCommand
-from commands.increaseskillcommand import IncreaseSkillCommand
-from commands.levelupcommand import LevelUpCommand
-from commands.plancommand import PlanCommand
-from commands.printcommand import PrintCommand
-from commands.quitcommand import QuitCommand
-from commands.savecommand import SaveCommand
-from commands.setvaluecommand import SetValueCommand
+from commands.commandregistry import CommandRegistry, LazyCommand
+from scriptrunner import ErrorPolicy, iter_script_commands, run_commands, ScriptReport
 from tools.common import print_exception
-from tools.formatting import format_error_message
+from tools.formatting import format_error_message, format_warning_message
+
+# Other modules (e.g. of saves, journals and profiling) are imported where they are used, to keep the start-up fast (see
+# 'benchmarks.startuptime')
 
 start_message: str = """
 The Elder Scrolls IV: Oblivion
@@ -27,22 +24,65 @@ unknown_error_message: str = "An unknown error has occurred. This is most probab
 
 
 class OblivionLevelManagerCLI:
-    def __init__(self, character: Character):
-        assert isinstance(character, Character)
+    def __init__(self, character: Character, path: Path = Path("."), profiler: "CommandProfiler" = None,
+                 cache: "SessionCache" = None, writer: "SaveWriter" = None, journal_group_size: int = None):
+        """
+        :param journal_group_size: Journal the commands that change a character, committing this many at a time (see
+            'CommandJournal'), or None to not journal them
+        """
+        from savewriter import SaveWriter
+        from sessioncache import SessionCache
 
-        self.character: Character = character
+        assert isinstance(character, Character)
+        assert isinstance(path, Path)
+        assert isinstance(cache, SessionCache) or cache is None
+        assert isinstance(writer, SaveWriter) or writer is None
+        assert isinstance(journal_group_size, int) or journal_group_size is None
+        if profiler is not None:
+            from commandprofiler import CommandProfiler
 
-        help_command: HelpCommand = HelpCommand()
-        self.commands: List[BaseCommand] = [PrintCommand(),
-                                            SetValueCommand(),
-                                            IncreaseSkillCommand(),
-                                            LevelUpCommand(),
-                                            PlanCommand(),
-                                            SaveCommand(),
-                                            QuitCommand(),
-                                            help_command]
+            assert isinstance(profiler, CommandProfiler)
 
-        help_command.generate_help(self.commands)
+        self.character: Character = character
+        self.path: Path = path
+        # The characters in memory (see 'switch'). The current character is cached as dirty, unless it already is cached
+        self.cache: SessionCache = cache if cache is not None else SessionCache(path, writer=writer)
+        # Saves in the background, if given (see 'close')
+        self.writer: SaveWriter = writer
+        if self.cache.characters.get(character.name) is not character:
+            self.cache.put(character)
+        # Records statistics of every command (--profile)
+        self.profiler: "CommandProfiler" = profiler
+        # Ranking of the level-up attribute triples, created by the first 'suggest' and then updated after every command
+        self.advisor: "LevelUpAdvisor" = None
+        # The journals of the characters changed in this session (see 'recover')
+        self.journal_group_size: int = journal_group_size
+        self.journals: Dict[str, "CommandJournal"] = {}
+        # The characters that are not journaled, because their journal failed or is in use by another session (commands
+        # are never blocked by the journal, see '_disable_journal')
+        self.unjournaled: Set[str] = set()
+
+        # Command modules are imported on first use, plugins when a command is not found, and help on first 'help'
+        self.registry: CommandRegistry = CommandRegistry()
+        self.registry.register(LazyCommand("commands.printcommand", "PrintCommand", "print"))
+        self.registry.register(LazyCommand("commands.setvaluecommand", "SetValueCommand", "set-value"))
+        self.registry.register(LazyCommand("commands.increaseskillcommand", "IncreaseSkillCommand", "increase-skill"))
+        self.registry.register(LazyCommand("commands.levelupcommand", "LevelUpCommand", "level-up"))
+        self.registry.register(LazyCommand("commands.plancommand", "PlanCommand", "plan"))
+        self.registry.register(LazyCommand("commands.undocommand", "UndoCommand", "undo"))
+        self.registry.register(LazyCommand("commands.redocommand", "RedoCommand", "redo"))
+        self.registry.register(LazyCommand("commands.solvecommand", "SolveCommand", "solve"))
+        self.registry.register(LazyCommand("commands.suggestcommand", "SuggestCommand", "suggest", self.get_advisor))
+        self.registry.register(LazyCommand("commands.careercommand", "CareerCommand", "career"))
+        self.registry.register(LazyCommand("commands.simulatecommand", "SimulateCommand", "simulate"))
+        self.registry.register(LazyCommand("commands.savecommand", "SaveCommand", "save", path, self.cache, writer))
+        self.registry.register(LazyCommand("commands.historycommand", "HistoryCommand", "history", path, writer))
+        self.registry.register(LazyCommand("commands.switchcommand", "SwitchCommand", "switch",
+                                           self.switch_character))
+        self.registry.register(LazyCommand("commands.quitcommand", "QuitCommand", "quit"))
+        self.registry.register(LazyCommand("commands.statscommand", "StatsCommand", "stats", profiler))
+        self.registry.register(LazyCommand("commands.helpcommand", "HelpCommand", "help", self.registry))
+        self.registry.defer_entry_points()
 
     def start_interactive(self):
         print(start_message)
@@ -73,14 +113,118 @@ class OblivionLevelManagerCLI:
     def run_script(self, script: str) -> NoReturn:
         assert isinstance(script, str)
 
-        command_strs: List[str] = script.split(";")
+        self.run_commands(iter_script_commands(StringIO(script)))
+
+    def run_commands(self, command_strs: Iterable[str], policy: ErrorPolicy = ErrorPolicy.STOP,
+                     report: ScriptReport = None) -> ScriptReport:
+        """
+        Run a (possibly lazy) sequence of commands, e.g. from 'iter_script_commands'.
+
+        :param command_strs: The commands
+        :param policy: What to do when a command fails
+        :param report: The report to update (default: a new report)
+        :return: The report of the run
+        """
+        return run_commands(command_strs, self._run_command_str, policy, report)
+
+    def switch_character(self, name: str) -> Character:
+        """
+        Make a character of the session cache (or the latest save of a character) the current character.
+
+        :param name: The name of the character
+        :return: The new current character
+        """
+        self.character = self.cache.get(name)
+        self.recover()
+
+        return self.character
+
+    def get_advisor(self, character: Character) -> "LevelUpAdvisor":
+        """
+        :return: The ranking of the level-up attribute triples of the current character (see 'suggest')
+        """
+        if self.advisor is None:
+            from leveladvisor import LevelUpAdvisor
 
-        for command_str in command_strs:
+            self.advisor = LevelUpAdvisor(character)
+
+        return self.advisor
+
+    def recover(self) -> int:
+        """
+        Recover the changes of the current character from the journal of a session that did not end normally (e.g. a
+        crash): the state of the last checkpoint, followed by the commands after it.
+
+        :return: The number of replayed commands (0 if there is nothing to recover)
+        """
+        from contextlib import redirect_stdout
+
+        from journal import CommandJournal, get_journal_file_name
+        from savefile import decode_record
+
+        name: str = self.character.name
+        if self.journal_group_size is None or name in self.journals or name in self.unjournaled:
+            return 0
+        journal: CommandJournal = CommandJournal(self.path / get_journal_file_name(name), self.journal_group_size)
+        # A journal that another session is using is not recovered
+        if not journal.exists() or not self._lock_journal(journal, name):
+            return 0
+
+        try:
+            checkpoint, command_strs = journal.recover()
+        except (OSError, ValueError) as e:
+            journal.close()
+            self._disable_journal(name, str(e))
+            return 0
+        if checkpoint is None and len(command_strs) == 0:
+            journal.close()
+            return 0
+
+        if checkpoint is not None:
+            self.character = decode_record(checkpoint)
+            self.cache.put(self.character)
+        # Replayed without journaling (and profiling) them, their output was already seen. The journal is replaced only
+        # then, by a checkpoint of the recovered state, so a failure before does not lose any command
+        try:
+            with redirect_stdout(StringIO()):
+                for command_str in command_strs:
+                    split_command_str: List[str] = command_str.split()
+                    self.registry.find(split_command_str[0]).run(self.character, split_command_str[1:])
+        except Exception as e:
+            journal.close()
+            self._disable_journal(name, "Cannot replay the journal, it is kept: " + str(e))
+            return 0
+        self._start_journal(journal, name)
+        print("Recovered " + name + " from the journal (level " + str(self.character.level) + ", " +
+              str(len(command_strs)) + " commands replayed)")
+
+        return len(command_strs)
+
+    def close(self) -> NoReturn:
+        """
+        Complete the saves in progress and commit the journals (e.g. on quit). The journals are kept (see
+        'end_session').
+        """
+        for name, journal in self.journals.items():
             try:
-                self._run_command_str(command_str)
-            except Exception as e:
-                print_exception(e)
-                break
+                journal.close()
+            except OSError as e:
+                print(format_warning_message("Cannot commit the journal of " + name + ": " + str(e)))
+        if self.writer is not None:
+            for message in self.writer.close():
+                print(format_error_message(message))
+
+    def end_session(self) -> NoReturn:
+        """
+        End the session normally: there is nothing to recover, so the journals are deleted.
+        """
+        for name, journal in self.journals.items():
+            try:
+                journal.close(delete=True)
+            except OSError as e:
+                print(format_warning_message("Cannot delete the journal of " + name + ": " + str(e)))
+        self.journals = {}
+        self.close()
 
     def _run_command_str(self, command_str: str) -> NoReturn:
         """
@@ -94,19 +238,139 @@ class OblivionLevelManagerCLI:
         command_name = split_command_str[0]
         command_args = split_command_str[1:]
 
-        for command in self.commands:
-            if command.is_command(command_name):
-                command.run(character, command_args)
-                return
+        command: BaseCommand = self.registry.find(command_name)
+        name: str = self.character.name
+        journal: Optional["CommandJournal"] = None
+        if self.journal_group_size is not None and command.changes_character():
+            journal = self._get_journal()
+        try:
+            if self.profiler is None:
+                command.run(self.character, command_args)
+            else:
+                self.profiler.run(command, command_name, self.character, command_args)
+        except Exception:
+            if journal is not None:
+                # A failed command may have changed the character in part
+                self._write_journal(name, journal.append_state, self.character)
+            raise
+        else:
+            if journal is not None:
+                if command.is_replayable():
+                    self._write_journal(name, journal.append, command_str)
+                else:
+                    self._write_journal(name, journal.append_state, self.character)
+        finally:
+            if journal is not None and name in self.journals and journal.is_checkpoint_due():
+                self._write_journal(name, journal.checkpoint, self.character)
+            if self.advisor is not None:
+                # Only the attributes whose skill increases changed are updated
+                self.advisor.refresh(self.character)
+            self.cache.write_back_due()
+            if self.writer is not None:
+                for message in self.writer.pop_errors():
+                    print(format_error_message(message))
+
+    def _get_journal(self) -> Optional["CommandJournal"]:
+        """
+        :return: The journal of the current character, started before its first journaled command (None if it is not
+            journaled)
+        """
+        from journal import CommandJournal, get_journal_file_name
+
+        name: str = self.character.name
+        journal: CommandJournal = self.journals.get(name)
+        if journal is None and name not in self.unjournaled:
+            journal = CommandJournal(self.path / get_journal_file_name(name), self.journal_group_size)
+            if self._lock_journal(journal, name):
+                self._start_journal(journal, name)
+            journal = self.journals.get(name)
+
+        return journal
 
-        raise ValueError("Command not found: " + command_name)
+    def _lock_journal(self, journal: "CommandJournal", name: str) -> bool:
+        try:
+            if journal.lock():
+                return True
+            self._disable_journal(name, "The journal is in use by another session")
+        except OSError as e:
+            self._disable_journal(name, str(e))
+
+        return False
+
+    def _start_journal(self, journal: "CommandJournal", name: str) -> NoReturn:
+        # The journal is locked. Its file is replaced only once the checkpoint is written
+        try:
+            journal.start(self.character)
+        except Exception as e:
+            journal.close()
+            self._disable_journal(name, str(e))
+        else:
+            self.journals[name] = journal
+
+    def _write_journal(self, name: str, write: Callable, *args) -> NoReturn:
+        try:
+            write(*args)
+        except Exception as e:
+            self._disable_journal(name, str(e))
+
+    def _disable_journal(self, name: str, reason: str) -> NoReturn:
+        """
+        Stop journaling a character, e.g. when its journal cannot be written: the journal never blocks a command. A
+        journal in use is deleted, since it would recover a past state.
+        """
+        self.unjournaled.add(name)
+        journal: "CommandJournal" = self.journals.pop(name, None)
+        if journal is not None:
+            try:
+                journal.close(delete=True)
+            except OSError:
+                pass
+        print(format_warning_message("The changes of " + name + " are not journaled (they cannot be recovered after " +
+                                     "a crash): " + reason))
 
 
 if __name__ == "__main__":
+    import atexit
+    from argparse import ArgumentParser, Namespace, SUPPRESS
+
+    from catalog import Catalog
+    from journal import DEFAULT_GROUP_SIZE
+    from savefile import check_character_name
+    from savewriter import SaveWriter
+    from sessioncache import DEFAULT_CACHE_SIZE, SessionCache
+    from tools.checks import set_validation_mode, ValidationMode
+
     parser: ArgumentParser = ArgumentParser()
     parser.add_argument('--path', default=".", type=str, help="Path to load/save the character files")
     parser.add_argument('--run', default="", type=str,
                         help="Run a command or list of commands (separated by ;) and exit")
+    parser.add_argument('--script', default=None, type=str,
+                        help="Run the commands of a file (one per line, or separated by ;) and exit. Use - for stdin")
+    parser.add_argument('--on-error', default=ErrorPolicy.STOP.value, choices=[p.value for p in ErrorPolicy],
+                        help="What to do when a command of --script fails: stop, skip it (and print the error), or " +
+                             "collect the errors and print them at the end")
+    parser.add_argument('--validation', default=ValidationMode.BOUNDARY.value,
+                        choices=[m.value for m in ValidationMode],
+                        help="Which list checks are done: all of them (full, slow), only of input to the program, " +
+                             "i.e. commands and save files (boundary, default), or none (off)")
+    parser.add_argument('--cache-size', default=DEFAULT_CACHE_SIZE, type=int,
+                        help="The maximum number of characters in memory, see command 'switch' (default: " +
+                             str(DEFAULT_CACHE_SIZE) + "). The least recently used characters are saved (if changed) " +
+                             "and dropped")
+    parser.add_argument('--write-back-interval', default=None, type=float,
+                        help="Save the changed characters in memory every this many seconds, checked after each " +
+                             "command (default: only when they are dropped)")
+    parser.add_argument('--no-journal', action='store_true',
+                        help="Do not journal the commands that change the character. The journal recovers the " +
+                             "changes of a session that did not end normally (e.g. a crash) on the next start")
+    parser.add_argument('--profile', action='store_true',
+                        help="Record the number of calls, errors and latency of every command (see command 'stats')")
+    parser.add_argument('--profile-dir', default=None, type=str,
+                        help="Also profile every command with cProfile and dump the profiles to this directory on " +
+                             "exit (implies --profile)")
+    parser.add_argument('--profile-output', default=None, type=str,
+                        help="Export the command statistics to this file on exit: Prometheus text format for .prom " +
+                             "files, JSON otherwise (implies --profile)")
 
     sp = parser.add_subparsers(dest='action')
 
@@ -118,36 +382,126 @@ if __name__ == "__main__":
     parser_load.add_argument('--level', default=0, type=int,
                              help="The level of the character to load (default: max available)")
 
+    parser_list = sp.add_parser('list', help="List the saved characters and their levels")
+    parser_list.add_argument('name', nargs='?', default=None, type=str,
+                             help="The name of the character whose levels are listed (default: all characters)")
+
+    parser_batch = sp.add_parser('batch', help="Run the script (--script) on the latest save of every character of " +
+                                               "the directory (--path), in parallel")
+    # Also accepted after 'batch' (not set here unless given, so that the values of the main parser are kept)
+    parser_batch.add_argument('--path', default=SUPPRESS, type=str, help="Path of the character files")
+    parser_batch.add_argument('--script', default=SUPPRESS, type=str, help="The script to run. Use - for stdin")
+    parser_batch.add_argument('--on-error', default=SUPPRESS, choices=[p.value for p in ErrorPolicy],
+                              help="What to do when a command fails, for each character")
+    parser_batch.add_argument('--jobs', default=None, type=int,
+                              help="The number of worker processes (default: number of CPUs)")
+    parser_batch.add_argument('--report', default=None, type=str, help="Write a JSON report to this file")
+    parser_batch.add_argument('--write-back', action='store_true',
+                              help="Save the characters changed by the script (including characters switched to), " +
+                                   "even if the script does not save them")
+
+    parser_serve = sp.add_parser('serve', help="Serve the characters of the directory (--path) over JSON-RPC, until " +
+                                               "interrupted")
+    parser_serve.add_argument('--path', default=SUPPRESS, type=str, help="Path of the character files")
+    parser_serve.add_argument('--socket', default=None, type=str,
+                              help="Listen on this Unix socket (default: a TCP port on localhost)")
+    parser_serve.add_argument('--host', default="127.0.0.1", type=str,
+                              help="The host to listen on (default: 127.0.0.1)")
+    parser_serve.add_argument('--port', default=8765, type=int, help="The TCP port to listen on (default: 8765)")
+    parser_serve.add_argument('--cache-size', default=DEFAULT_CACHE_SIZE, type=int,
+                              help="The maximum number of characters in memory (default: " + str(DEFAULT_CACHE_SIZE) +
+                                   "). The least recently used characters are saved (if changed) and dropped")
+    parser_serve.add_argument('--write-back-interval', default=None, type=float,
+                              help="Save the changed characters every this many seconds (default: only when they " +
+                                   "are dropped, and on exit)")
+
+    parser_convert = sp.add_parser('convert', help="Convert legacy (pickle) save files to the binary format")
+    parser_convert.add_argument('name', nargs='?', default=None, type=str,
+                                help="The name of the character to convert (default: all characters)")
+
     args: Namespace = parser.parse_args()
+    set_validation_mode(ValidationMode(args.validation))
 
     file_path: Path = Path(args.path)
+    catalog: Catalog = Catalog(file_path)
+
+    if args.action in ['new', 'load']:
+        # Only characters that can be saved are supported
+        try:
+            check_character_name(args.name)
+        except ValueError as e:
+            print(str(e) + ". Abort")
+            exit(0)
 
     if args.action == 'new':
-        file_list = [x for x in file_path.glob(args.name + "_*.pickle")]
-        if len(file_list) != 0:
+        if len(catalog.get_levels(args.name)) != 0:
             print("A character with name '" + args.name + "' already exists. Abort")
             exit(0)
         character: Character = Character(args.name)
 
     elif args.action == 'load':
-        file_list = [x for x in file_path.glob(args.name + "_*.pickle")]
-        if len(file_list) == 0:
+        files = catalog.get_levels(args.name)
+        if len(files) == 0:
             print("No character with name '" + args.name + "' was found. Abort")
             exit(0)
         if args.level < 0:
             print("No non-positive levels are supported. Abort")
             exit(0)
         if args.level == 0:
-            level: int = 1
-            for file in file_list:
-                level = max(level, int(file.name[len(args.name) + 4:-7]))
+            level: int = max(files.keys())
         else:
             level = args.level
-        file: Path = Path(args.name + "_lvl" + str(level).zfill(2) + ".pickle")
-        if not file.exists():
-            print("Cannot file file '" + file.name + "'. Abort")
+        if level not in files:
+            print("Cannot find a save file for level " + str(level) + ". Abort")
+            exit(0)
+        from levelarchive import load_level
+
+        # Only the record of the level is read (from the level archive of the character)
+        character: Character = load_level(files[level], level)
+
+    elif args.action == 'list':
+        names: List[str] = catalog.get_characters() if args.name is None else [args.name]
+        for name in names:
+            levels: List[int] = list(catalog.get_levels(name).keys())
+            if len(levels) == 0:
+                print("No character with name '" + name + "' was found")
+            else:
+                print(name + ": " + ", ".join([str(level) for level in levels]))
+        exit(0)
+
+    elif args.action == 'convert':
+        from savefile import convert_pickle, LEGACY_SAVE_FILE_SUFFIX
+
+        pattern: str = ("*" if args.name is None else args.name + "_lvl*") + LEGACY_SAVE_FILE_SUFFIX
+        for file in sorted(file_path.glob(pattern)):
+            print("Converted " + file.name + " to " + convert_pickle(file).name)
+        exit(0)
+
+    elif args.action == 'batch':
+        from batch import BatchReport, run_batch
+
+        if args.script is None:
+            print("Action 'batch' requires a script (--script). Abort")
             exit(0)
-        character: Character = pickle.load(open(file, 'rb'))
+        stream = sys.stdin if args.script == "-" else open(args.script, "r")
+        with stream:
+            command_strs: List[str] = list(iter_script_commands(stream))
+        batch_report: BatchReport = run_batch(file_path, command_strs, ErrorPolicy(args.on_error), args.jobs,
+                                             args.write_back)
+        for result in batch_report.results:
+            print("==== " + result.name + " (level " + str(result.level) + ") ====")
+            print(result.output, end="")
+        print(batch_report.get_summary(), file=sys.stderr)
+        if args.report is not None:
+            batch_report.write_json(Path(args.report))
+        exit(0 if len(batch_report.get_failed()) == 0 else 1)
+
+    elif args.action == 'serve':
+        from server import run_server
+
+        run_server(file_path, None if args.socket is None else Path(args.socket), args.host, args.port, args.cache_size,
+                   args.write_back_interval)
+        exit(0)
 
     elif args.action is None:
         parser.print_usage()
@@ -161,8 +515,43 @@ if __name__ == "__main__":
     except NameError:
         print(format_error_message("Failed to create a character. Aborting...\n  This is probably a bug"))
 
-    cli: OblivionLevelManagerCLI = OblivionLevelManagerCLI(character)
-    if args.run == "":
-        cli.start_interactive()
-    else:
-        cli.run_script(args.run)
+    profiler: "CommandProfiler" = None
+    if args.profile or args.profile_dir is not None or args.profile_output is not None:
+        from commandprofiler import CommandProfiler
+
+        profiler = CommandProfiler(None if args.profile_dir is None else Path(args.profile_dir))
+        # Also on 'quit'
+        if args.profile_output is not None:
+            atexit.register(profiler.write, Path(args.profile_output))
+        atexit.register(profiler.dump_profiles)
+
+    # Saves do not wait for the disk (outstanding saves are completed on exit, including 'quit')
+    writer: SaveWriter = SaveWriter(file_path)
+    cache: SessionCache = SessionCache(file_path, args.cache_size, args.write_back_interval, writer=writer)
+    # A new character is dirty: it is saved when it is written back
+    cache.put(character, saved=args.action == 'load')
+
+    # Every interactive command is committed to the journal, scripts commit in groups
+    journal_group_size: int = None
+    if not args.no_journal:
+        journal_group_size = 1 if args.script is None and args.run == "" else DEFAULT_GROUP_SIZE
+    cli: OblivionLevelManagerCLI = OblivionLevelManagerCLI(character, file_path, profiler, cache, writer,
+                                                           journal_group_size)
+    # On a crash (or an interrupt) the journals are kept
+    atexit.register(cli.close)
+    cli.recover()
+    try:
+        if args.script is not None:
+            stream = sys.stdin if args.script == "-" else open(args.script, "r")
+            with stream:
+                report: ScriptReport = cli.run_commands(iter_script_commands(stream), ErrorPolicy(args.on_error))
+            print(report.get_summary(with_errors=args.on_error == ErrorPolicy.COLLECT.value), file=sys.stderr)
+        elif args.run == "":
+            cli.start_interactive()
+        else:
+            cli.run_script(args.run)
+    except SystemExit:
+        # e.g. 'quit'
+        cli.end_session()
+        raise
+    cli.end_session()
@@ -0,0 +1,238 @@
+# Versioned, fixed-layout binary save files. A save file is a header followed by a single character record:
+#
+#   header:     magic (4s), version (H), flags (H), record size (I), CRC32 of the record (I)
+#   character:  name (64s, UTF-8, zero padded), level (h), number of planned attributes (B), planned attributes (3B)
+#   skills:     21 x [value (h), level-ups (h), is major (B)]
+#   attributes: 8 x [value (h)]
+#
+# Skills and attributes are stored in the order of the default Character schema. All values are little-endian.
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import List, NoReturn, Optional, Tuple
+
+from character import Character, DEFAULT_ATTRIBUTES
+
+SAVE_FILE_SUFFIX: str = ".olm"
+LEGACY_SAVE_FILE_SUFFIX: str = ".pickle"
+
+MAGIC: bytes = b"OLMS"
+VERSION: int = 1
+
+# Size of the (UTF-8) name field of a record
+MAX_NAME_SIZE: int = 64
+
+_HEADER: struct.Struct = struct.Struct("<4sHHII")
+_CHARACTER: struct.Struct = struct.Struct("<" + str(MAX_NAME_SIZE) + "shB3B")
+_SKILL: struct.Struct = struct.Struct("<hhB")
+_ATTRIBUTE: struct.Struct = struct.Struct("<h")
+
+_NO_ATTRIBUTE: int = 0xFF
+_MAX_PLANNED_ATTRIBUTES: int = 3
+
+
+SCHEMA_ATTRIBUTES: Tuple[str, ...] = tuple([name for name, _ in DEFAULT_ATTRIBUTES])
+# In attribute order, as the skills of a character
+SCHEMA_SKILLS: Tuple[str, ...] = tuple([skill_name for _, skill_names in DEFAULT_ATTRIBUTES
+                                        for skill_name in skill_names])
+
+HEADER_SIZE: int = _HEADER.size
+RECORD_SIZE: int = _CHARACTER.size + len(SCHEMA_SKILLS) * _SKILL.size + len(SCHEMA_ATTRIBUTES) * _ATTRIBUTE.size
+
+
+def check_character_name(name: str) -> NoReturn:
+    """
+    Check that a character with this name can be saved.
+
+    :raises ValueError: If the name is empty, is not a plain file name (the save files are named after the character),
+        or does not fit in a save record
+    """
+    assert isinstance(name, str)
+
+    if len(name) == 0:
+        raise ValueError("Character name is empty")
+    if "/" in name or "\\" in name or ".." in name:
+        raise ValueError("Character name cannot contain '/', '\\' or '..': " + name)
+    if len(name.encode("utf-8")) > MAX_NAME_SIZE:
+        raise ValueError("Character name is too long to be saved (at most " + str(MAX_NAME_SIZE) + " bytes): " + name)
+
+
+def encode_record(character: Character) -> bytes:
+    """
+    Encode a character as a fixed-size record (without header).
+
+    :param character: A character with the default schema (skills and attributes)
+    :return: A record of RECORD_SIZE bytes
+    """
+    assert isinstance(character, Character)
+
+    if tuple([attribute.name for attribute in character.attributes]) != SCHEMA_ATTRIBUTES or \
+            tuple([skill.name for skill in character.skills]) != SCHEMA_SKILLS:
+        raise ValueError("Only characters with the default skills and attributes can be saved")
+
+    check_character_name(character.name)
+    name: bytes = character.name.encode("utf-8")
+
+    planned: List[int] = [character.attributes.index(attribute) for attribute in character.planned_attributes]
+    planned += [_NO_ATTRIBUTE] * (_MAX_PLANNED_ATTRIBUTES - len(planned))
+
+    record: bytearray = bytearray(RECORD_SIZE)
+    try:
+        _CHARACTER.pack_into(record, 0, name, character.level, len(character.planned_attributes), *planned)
+        offset: int = _CHARACTER.size
+        for skill in character.skills:
+            _SKILL.pack_into(record, offset, skill.value, skill.level_ups, skill.is_major)
+            offset += _SKILL.size
+        for attribute in character.attributes:
+            _ATTRIBUTE.pack_into(record, offset, attribute.value)
+            offset += _ATTRIBUTE.size
+    except struct.error as e:
+        raise ValueError("Could not encode character " + character.name + ": " + str(e)) from e
+
+    return bytes(record)
+
+
+def decode_record(buffer) -> Character:
+    """
+    Decode a character from a fixed-size record. The buffer is read through a memoryview, so slices of larger
+    buffers (e.g. memory-mapped files) are not copied.
+
+    :param buffer: A bytes-like object of (at least) RECORD_SIZE bytes
+    :return: The decoded character
+    """
+    view: memoryview = memoryview(buffer)
+    if len(view) < RECORD_SIZE:
+        raise ValueError("Save record is truncated")
+
+    name, level, n_planned, *planned = _CHARACTER.unpack_from(view, 0)
+
+    character: Character = Character(name.rstrip(b"\0").decode("utf-8"), level)
+
+    skills_end: int = _CHARACTER.size + len(SCHEMA_SKILLS) * _SKILL.size
+    for skill, (value, level_ups, is_major) in zip(character.skills,
+                                                   _SKILL.iter_unpack(view[_CHARACTER.size:skills_end])):
+        # Value and mode are set before the level-ups, so that the running totals stay consistent
+        skill.value = value
+        skill.is_major = bool(is_major)
+        if level_ups != 0:
+            skill.increase(level_ups)
+
+    for attribute, (value,) in zip(character.attributes, _ATTRIBUTE.iter_unpack(view[skills_end:RECORD_SIZE])):
+        attribute.value = value
+
+    character.planned_attributes = [character.attributes[i] for i in planned[:n_planned]]
+
+    return character
+
+
+def encode_character(character: Character) -> bytes:
+    record: bytes = encode_record(character)
+
+    return _HEADER.pack(MAGIC, VERSION, 0, len(record), zlib.crc32(record)) + record
+
+
+def decode_character(buffer) -> Character:
+    """
+    Decode a save file that has been read in memory.
+
+    :param buffer: A bytes-like object
+    :return: The decoded character
+    """
+    view: memoryview = memoryview(buffer)
+    if len(view) < HEADER_SIZE:
+        raise ValueError("Save file is truncated")
+
+    magic, version, _, size, checksum = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a save file")
+    if version != VERSION:
+        raise ValueError("Unsupported save file version: " + str(version))
+
+    record: memoryview = view[HEADER_SIZE:HEADER_SIZE + size]
+    if size != RECORD_SIZE or len(record) != size:
+        raise ValueError("Save file is truncated")
+    if zlib.crc32(record) != checksum:
+        raise ValueError("Save file is corrupted (checksum mismatch)")
+
+    return decode_record(record)
+
+
+def get_save_file_name(character: Character) -> str:
+    return character.get_name() + SAVE_FILE_SUFFIX
+
+
+def parse_save_file_name(file_name: str) -> Optional[Tuple[str, int]]:
+    """
+    Parse the name of a save file (binary or legacy).
+
+    :param file_name: A file name, e.g. 'Adventurer_lvl07.olm'
+    :return: The character name and level, or None if this is not a save file name
+    """
+    assert isinstance(file_name, str)
+
+    for suffix in [SAVE_FILE_SUFFIX, LEGACY_SAVE_FILE_SUFFIX]:
+        if file_name.endswith(suffix):
+            stem: str = file_name[:-len(suffix)]
+            idx: int = stem.rfind("_lvl")
+            if idx <= 0 or not stem[idx + 4:].isdigit():
+                return None
+            return stem[:idx], int(stem[idx + 4:])
+
+    return None
+
+
+def save_character(character: Character, file: Path) -> NoReturn:
+    """
+    Save a character to a file. The file is written to a temporary file, which then replaces it, so an interrupted save
+    leaves the previous file intact.
+    """
+    assert isinstance(file, Path)
+
+    data: bytes = encode_character(character)
+    tmp_file: Path = file.with_name(file.name + ".tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, file)
+
+
+def load_character(file: Path) -> Character:
+    """
+    Load a character from a save file. Legacy pickle files are also supported.
+
+    :param file: The path of a '.olm' (or legacy '.pickle') file
+    :return: The loaded character
+    """
+    assert isinstance(file, Path)
+
+    if file.suffix == LEGACY_SAVE_FILE_SUFFIX:
+        import pickle
+
+        with open(file, "rb") as f:
+            return pickle.load(f)
+
+    with open(file, "rb") as f:
+        buffer: bytearray = bytearray(HEADER_SIZE + RECORD_SIZE)
+        n: int = f.readinto(buffer)
+
+    return decode_character(memoryview(buffer)[:n])
+
+
+def convert_pickle(file: Path) -> Path:
+    """
+    Convert a legacy pickle save file to the binary format. The pickle file is kept.
+
+    :param file: The path of the '.pickle' file
+    :return: The path of the new '.olm' file
+    """
+    assert isinstance(file, Path)
+
+    if file.suffix != LEGACY_SAVE_FILE_SUFFIX:
+        raise ValueError("Not a legacy save file: " + file.name)
+
+    new_file: Path = file.with_suffix(SAVE_FILE_SUFFIX)
+    save_character(load_character(file), new_file)
+
+    return new_file
@@ -0,0 +1,135 @@
+from pathlib import Path
+from threading import Condition, Thread
+from typing import Dict, List, NoReturn, Tuple
+
+from catalog import Catalog
+from character import Character
+from levelarchive import get_archive_file_name, LevelArchive
+from savefile import encode_record
+
+
+class SaveWriter:
+    """
+    Saves characters on a background thread, so that a save does not wait for the disk. A save takes a snapshot of the
+    character (its save record) on the calling thread; the writer thread then appends it to the level archive (see
+    'LevelArchive', whose appends are atomic), and records it in the catalog.
+
+    Saves of the same level that are pending (not yet being written) are coalesced: only the last one is written. The
+    writer thread should be the only writer of the archives of the directory, i.e. other code should not save to the
+    directory while a writer is in use.
+    """
+
+    def __init__(self, path: Path):
+        assert isinstance(path, Path)
+
+        self.path: Path = path
+        # Only used by the writer thread
+        self._catalog: Catalog = Catalog(path)
+        # (name, level) -> save record, in submission order
+        self._pending: Dict[Tuple[str, int], bytes] = {}
+        self._writing: bool = False
+        self._closed: bool = False
+        self._errors: List[str] = []
+        self._condition: Condition = Condition()
+        self._thread: Thread = None
+
+        self.n_submitted: int = 0
+        self.n_coalesced: int = 0
+        self.n_written: int = 0
+
+    def submit(self, character: Character) -> Path:
+        """
+        Save the current level of a character in the background.
+
+        :param character: The character (it can be changed as soon as this returns)
+        :return: The archive file the level is saved to
+        """
+        assert isinstance(character, Character)
+
+        record: bytes = encode_record(character)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The save writer is closed")
+
+            key: Tuple[str, int] = (character.name, character.level)
+            if key in self._pending:
+                self.n_coalesced += 1
+                del self._pending[key]
+            self._pending[key] = record
+            self.n_submitted += 1
+
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="save-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+        return self.path / get_archive_file_name(character.name)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until all submitted saves have been written.
+
+        :param timeout: The maximum seconds to wait (default: no limit)
+        :return: Whether all saves have been written
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: len(self._pending) == 0 and not self._writing, timeout)
+
+    def pop_errors(self) -> List[str]:
+        """
+        :return: The messages of the saves that failed since the last call
+        """
+        with self._condition:
+            errors: List[str] = self._errors
+            self._errors = []
+
+        return errors
+
+    def close(self) -> List[str]:
+        """
+        Write the pending saves and stop the writer thread.
+
+        :return: The messages of the saves that failed (and were not popped yet)
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+        return self.pop_errors()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"submitted": self.n_submitted, "coalesced": self.n_coalesced, "written": self.n_written}
+
+    def _run(self) -> NoReturn:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: len(self._pending) > 0 or self._closed)
+                if len(self._pending) == 0:
+                    # Closed, and all saves have been written
+                    return
+                pending: Dict[Tuple[str, int], bytes] = self._pending
+                self._pending = {}
+                self._writing = True
+
+            for (name, level), record in pending.items():
+                self._write(name, level, record)
+
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def _write(self, name: str, level: int, record: bytes) -> NoReturn:
+        file: Path = self.path / get_archive_file_name(name)
+        try:
+            offset: int = LevelArchive(file).append_record(level, record)
+            if self._catalog.get_levels(name).get(level) != file:
+                self._catalog.add(name, level, file, offset)
+        except Exception as e:
+            with self._condition:
+                self._errors.append("Could not save level " + str(level) + " of " + name + ": " + str(e))
+            return
+
+        with self._condition:
+            self.n_written += 1
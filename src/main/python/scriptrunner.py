@@ -0,0 +1,115 @@
+from enum import Enum
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, List, NoReturn, TextIO, Tuple
+
+from tools.common import get_exception_message, print_exception
+from tools.formatting import format_error_message
+
+READ_CHUNK_SIZE: int = 1 << 16
+
+
+class ErrorPolicy(Enum):
+    STOP = "stop"  # Stop at the first failed command
+    SKIP = "skip"  # Report each failed command and go on
+    COLLECT = "collect"  # Go on, and report the failed commands in the summary
+
+
+class ScriptReport:
+    def __init__(self, max_errors: int = 1000):
+        assert isinstance(max_errors, int)
+
+        self.n_commands: int = 0
+        self.n_errors: int = 0
+        self.stopped: bool = False
+        self.elapsed: float = 0.0
+        # (command number, command, error message) of the first 'max_errors' errors
+        self.errors: List[Tuple[int, str, str]] = []
+        self.max_errors: int = max_errors
+
+    def add_error(self, command_str: str, message: str) -> NoReturn:
+        self.n_errors += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((self.n_commands, command_str, message))
+
+    def get_commands_per_second(self) -> float:
+        return self.n_commands / self.elapsed if self.elapsed > 0 else 0.0
+
+    def get_summary(self, with_errors: bool = False) -> str:
+        summary: str = "Ran " + str(self.n_commands) + " command(s) in " + str(round(self.elapsed, 3)) + " s (" + \
+                       str(round(self.get_commands_per_second(), 1)) + " commands/s), " + str(self.n_errors) + \
+                       " error(s)"
+        if self.stopped:
+            summary += ", stopped at the first error"
+
+        if with_errors:
+            for number, command_str, message in self.errors:
+                summary += "\n" + format_error_message("#" + str(number) + " '" + command_str + "': " + message)
+            if self.n_errors > len(self.errors):
+                summary += "\n... and " + str(self.n_errors - len(self.errors)) + " more error(s)"
+
+        return summary
+
+
+def iter_script_commands(stream: TextIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Lazily read commands from a text stream. Commands are separated by new lines or ';' (empty commands are skipped).
+    The stream is read in fixed-size chunks, so memory does not depend on the size of the script.
+
+    :param stream: The stream to read from (e.g. an open file or sys.stdin)
+    :param chunk_size: The number of characters read at once
+    :return: A generator of commands
+    """
+    pending: str = ""
+    while True:
+        chunk: str = stream.read(chunk_size)
+        if len(chunk) == 0:
+            break
+
+        command_strs: List[str] = (pending + chunk).replace(";", "\n").split("\n")
+        # The last command may continue in the next chunk
+        pending = command_strs.pop()
+        for command_str in command_strs:
+            command_str = command_str.strip()
+            if len(command_str) > 0:
+                yield command_str
+
+    command_str: str = pending.strip()
+    if len(command_str) > 0:
+        yield command_str
+
+
+def run_commands(command_strs: Iterable[str], run_command: Callable[[str], NoReturn],
+                 policy: ErrorPolicy = ErrorPolicy.STOP, report: ScriptReport = None) -> ScriptReport:
+    """
+    Run a (possibly lazy) sequence of commands.
+
+    :param command_strs: The commands to run
+    :param run_command: The function that runs a single command
+    :param policy: What to do when a command fails
+    :param report: The report to update (default: a new report). Passing a report keeps it available to the caller if
+    the run is ended by an exception (e.g. a 'quit' command)
+    :return: The report of the run
+    """
+    assert isinstance(policy, ErrorPolicy)
+    assert isinstance(report, ScriptReport) or report is None
+
+    if report is None:
+        report = ScriptReport()
+    start: float = perf_counter()
+    try:
+        for command_str in command_strs:
+            report.n_commands += 1
+            try:
+                run_command(command_str)
+            except Exception as e:
+                report.add_error(command_str, get_exception_message(e))
+                if policy is ErrorPolicy.COLLECT:
+                    continue
+                print_exception(e)
+                if policy is ErrorPolicy.STOP:
+                    report.stopped = True
+                    break
+    finally:
+        report.elapsed += perf_counter() - start
+
+    return report
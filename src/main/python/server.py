@@ -0,0 +1,457 @@
+import asyncio
+import json
+from contextlib import redirect_stdout
+from io import StringIO
+from inspect import Signature, signature
+from pathlib import Path
+from typing import Callable, Dict, List, NoReturn, Tuple, Union
+
+from character import Character
+from levelarchive import load_level, save_level
+from savefile import check_character_name
+from sessioncache import DEFAULT_CACHE_SIZE, SessionCache
+from tools.namedobject import find_unique_by_name
+
+# Newline-delimited JSON-RPC 2.0: one request (or batch of requests) per line, one response per line
+JSONRPC_VERSION: str = "2.0"
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8765
+
+PARSE_ERROR: int = -32700
+INVALID_REQUEST: int = -32600
+METHOD_NOT_FOUND: int = -32601
+INVALID_PARAMS: int = -32602
+INTERNAL_ERROR: int = -32603
+# Errors of the methods (e.g. unknown skill, cannot level up yet)
+APPLICATION_ERROR: int = -32000
+
+# Methods that do not need the character in memory
+_NO_LOAD_METHODS: Tuple[str, ...] = ("new", "unload")
+
+# Longest request line, in bytes
+_LINE_LIMIT: int = 1 << 20
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+
+        self.code: int = code
+        self.message: str = message
+
+
+class CharacterServer:
+    """
+    JSON-RPC server of the characters of a save directory. Characters are loaded on first use and kept in a session
+    cache (see 'SessionCache'): the least recently used characters are written back and dropped when it is full, and
+    changed characters are written back periodically. Requests are serialized per character (a request waits for the
+    previous requests of its character, e.g. a save in progress), while requests for different characters are served
+    concurrently.
+
+    Every method takes the character name as parameter 'name'. Parameters can be given by name or by position.
+    """
+
+    def __init__(self, path: Path, cache_size: int = DEFAULT_CACHE_SIZE, write_back_interval: float = None):
+        """
+        :param path: The save directory
+        :param cache_size: The maximum number of characters in memory
+        :param write_back_interval: The seconds between periodic write-backs of changed characters (default: never)
+        """
+        assert isinstance(path, Path)
+
+        self.path: Path = path
+        # The lock, the number of calls in progress or waiting, and the advisor (see 'suggest') of each character. They
+        # are dropped with the character (when it is dropped from the cache, or was not cached at the end of the calls)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._n_calls: Dict[str, int] = {}
+        self._advisors: Dict[str, "LevelUpAdvisor"] = {}
+        # Characters with a request in progress or waiting are not dropped
+        self.cache: SessionCache = SessionCache(path, cache_size, write_back_interval,
+                                                lambda name: name not in self._n_calls, on_evict=self._forget)
+        self._server: asyncio.AbstractServer = None
+        self._write_back_task: asyncio.Task = None
+
+        # Method name -> handler. Handlers run on the event loop, under the lock of the character
+        self.methods: Dict[str, Callable] = {
+            "new": self._new,
+            "get_character": self._get_character,
+            "increase_skill": self._increase_skill,
+            "level_up": self._level_up,
+            "set_plan": self._set_plan,
+            "set_level": self._set_level,
+            "set_attribute": self._set_attribute,
+            "set_skill": self._set_skill,
+            "set_major": self._set_major,
+            "undo": self._undo,
+            "redo": self._redo,
+            "can_level_up": self._can_level_up,
+            "suggest": self._suggest,
+        }
+        # Methods whose handlers are coroutines (they do I/O off the event loop)
+        self.async_methods: Dict[str, Callable] = {
+            "save": self._save,
+            "unload": self._unload,
+        }
+        self._signatures: Dict[str, Signature] = {method: signature(handler) for method, handler in
+                                                  list(self.methods.items()) + list(self.async_methods.items())}
+
+    async def start(self, socket_path: Path = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> NoReturn:
+        """
+        Start listening, on a Unix socket if given, otherwise on a TCP port.
+
+        :param socket_path: The path of the Unix socket
+        :param host: The host of the TCP socket (localhost by default: there is no authentication)
+        :param port: The port of the TCP socket (0 for any free port)
+        """
+        if socket_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=str(socket_path),
+                                                           limit=_LINE_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port, limit=_LINE_LIMIT)
+
+        if self.cache.write_back_interval is not None:
+            self._write_back_task = asyncio.create_task(self._write_back_periodically())
+
+    def get_port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> NoReturn:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> NoReturn:
+        """
+        Stop listening, and write back the changed characters.
+        """
+        self._server.close()
+        await self._server.wait_closed()
+        if self._write_back_task is not None:
+            self._write_back_task.cancel()
+        await self.write_back()
+
+    async def write_back(self) -> List[str]:
+        """
+        Save all changed characters, after the requests in progress for each of them.
+
+        :return: The names of the save files
+        """
+        return [await self.call("save", {"name": name}) for name in self.cache.get_dirty()]
+
+    async def handle_line(self, line: bytes) -> Union[dict, list, None]:
+        """
+        Handle a request line.
+
+        :param line: A JSON-RPC request, or batch of requests
+        :return: The response (None if there is no response, i.e. for notifications)
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return _error_response(None, PARSE_ERROR, "Parse error: " + str(e))
+
+        if isinstance(request, list):
+            if len(request) == 0:
+                return _error_response(None, INVALID_REQUEST, "Empty batch")
+            responses: List[dict] = [response for response in [await self.handle_request(r) for r in request]
+                                     if response is not None]
+            return responses if len(responses) > 0 else None
+
+        return await self.handle_request(request)
+
+    async def handle_request(self, request) -> Union[dict, None]:
+        if not isinstance(request, dict) or request.get("jsonrpc") != JSONRPC_VERSION or \
+                not isinstance(request.get("method"), str):
+            return _error_response(request.get("id") if isinstance(request, dict) else None, INVALID_REQUEST,
+                                   "Invalid request")
+
+        request_id = request.get("id")
+        try:
+            result = await self.call(request["method"], request.get("params", {}))
+        except RpcError as e:
+            response: dict = _error_response(request_id, e.code, e.message)
+        except (ValueError, RuntimeError, KeyError) as e:
+            response = _error_response(request_id, APPLICATION_ERROR, str(e))
+        except Exception as e:
+            response = _error_response(request_id, INTERNAL_ERROR, e.__class__.__name__ + ": " + str(e))
+        else:
+            response = {"jsonrpc": JSONRPC_VERSION, "id": request_id, "result": result}
+
+        # Notifications (requests without id) have no response
+        return response if "id" in request else None
+
+    async def call(self, method: str, params: Union[dict, list]):
+        """
+        Call a method, after the previous calls for the same character have completed.
+
+        :param method: The method name
+        :param params: The parameters, by name (dict) or by position (list)
+        :return: The result of the method
+        :raises RpcError: If the method or the parameters are invalid
+        """
+        handler: Callable = self.methods.get(method)
+        is_async: bool = handler is None
+        if is_async:
+            handler = self.async_methods.get(method)
+            if handler is None:
+                raise RpcError(METHOD_NOT_FOUND, "Method not found: " + method)
+
+        if isinstance(params, list):
+            args, kwargs = params, {}
+        elif isinstance(params, dict):
+            args, kwargs = [], params
+        else:
+            raise RpcError(INVALID_PARAMS, "Parameters should be an object or an array")
+
+        name = kwargs.get("name", args[0] if len(args) > 0 else None)
+        if not isinstance(name, str):
+            raise RpcError(INVALID_PARAMS, "Parameter 'name' (the character name) is required")
+        # Before anything is loaded or created: the name is part of the save file names
+        try:
+            check_character_name(name)
+        except ValueError as e:
+            raise RpcError(INVALID_PARAMS, str(e))
+
+        try:
+            self._signatures[method].bind(*args, **kwargs)
+        except TypeError as e:
+            raise RpcError(INVALID_PARAMS, "Invalid parameters of " + method + ": " + str(e))
+
+        lock: asyncio.Lock = self._locks.get(name)
+        if lock is None:
+            lock = self._locks[name] = asyncio.Lock()
+        self._n_calls[name] = self._n_calls.get(name, 0) + 1
+
+        try:
+            async with lock:
+                if method not in _NO_LOAD_METHODS:
+                    await self._load(name)
+                result = handler(*args, **kwargs)
+                if is_async:
+                    result = await result
+        finally:
+            self._n_calls[name] -= 1
+            if self._n_calls[name] == 0:
+                del self._n_calls[name]
+                # e.g. unloaded, or not found
+                if name not in self.cache.characters:
+                    self._forget(name)
+
+        return result
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> NoReturn:
+        # Requests of a connection are handled in order; connections are handled concurrently
+        try:
+            while True:
+                line: bytes = await reader.readline()
+                if len(line) == 0:
+                    break
+                if line.strip() == b"":
+                    continue
+
+                response = await self.handle_line(line)
+                if response is not None:
+                    writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _write_back_periodically(self) -> NoReturn:
+        while True:
+            await asyncio.sleep(self.cache.write_back_interval)
+            await self.write_back()
+
+    async def _load(self, name: str) -> Character:
+        character: Character = self.cache.lookup(name)
+        if character is not None:
+            return character
+
+        # File I/O off the event loop (the lock of the character is held). Dropping other characters (when the cache is
+        # full) writes them back on the event loop: save files are small
+        level, file = self.cache.get_latest_level(name)
+        character = await asyncio.get_running_loop().run_in_executor(None, load_level, file, level)
+        self.cache.put(character, saved=True)
+
+        return character
+
+    def _forget(self, name: str) -> NoReturn:
+        # Only once no call uses the lock: a new lock would let the next call run alongside the waiting ones
+        self._locks.pop(name, None)
+        self._advisors.pop(name, None)
+
+    def _get(self, name: str) -> Character:
+        # Characters are loaded by 'call' before the handler runs (and are not dropped while it runs)
+        return self.cache.characters[name]
+
+    def _new(self, name: str) -> dict:
+        if self.cache.exists(name):
+            raise ValueError("A character with name '" + name + "' already exists")
+
+        character: Character = Character(name)
+        self.cache.put(character)
+
+        return character_to_dict(character)
+
+    def _get_character(self, name: str) -> dict:
+        return character_to_dict(self._get(name))
+
+    def _increase_skill(self, name: str, skill: str, value: int = 1) -> dict:
+        character: Character = self._get(name)
+        skill_name, attribute_name = character.increase_skill(_str(skill, "skill"), _int(value, "value"))
+
+        return {"skill": skill_name, "attribute": attribute_name,
+                "major_skills_increase": character.get_major_skills_increase(),
+                "can_level_up": character.can_level_up()}
+
+    def _level_up(self, name: str, attributes: List[str]) -> dict:
+        character: Character = self._get(name)
+        # 'level_up' prints the gains
+        with redirect_stdout(StringIO()):
+            character.level_up(_attribute_names(character, attributes, "attributes", (3,)))
+
+        return character_to_dict(character)
+
+    def _set_plan(self, name: str, attributes: List[str]) -> List[str]:
+        character: Character = self._get(name)
+
+        return character.set_plan(_attribute_names(character, attributes, "attributes", (2, 3)))
+
+    def _set_level(self, name: str, value: int) -> int:
+        return self._get(name).set_level_value(_int(value, "value"))
+
+    def _set_attribute(self, name: str, attribute: str, value: int) -> list:
+        return list(self._get(name).set_attribute_value(_str(attribute, "attribute"), _int(value, "value")))
+
+    def _set_skill(self, name: str, skill: str, value: int) -> list:
+        return list(self._get(name).set_skill_value(_str(skill, "skill"), _int(value, "value")))
+
+    def _set_major(self, name: str, skill: str, is_major: bool = True) -> list:
+        if not isinstance(is_major, bool):
+            raise RpcError(INVALID_PARAMS, "Parameter 'is_major' should be a boolean")
+
+        return list(self._get(name).set_skill_mode(_str(skill, "skill"), is_major))
+
+    def _undo(self, name: str) -> str:
+        return self._get(name).undo()
+
+    def _redo(self, name: str) -> str:
+        return self._get(name).redo()
+
+    def _can_level_up(self, name: str) -> bool:
+        return self._get(name).can_level_up()
+
+    def _suggest(self, name: str, n: int = 5) -> List[dict]:
+        if _int(n, "n") < 1:
+            raise RpcError(INVALID_PARAMS, "Parameter 'n' should be positive")
+
+        character: Character = self._get(name)
+        advisor: "LevelUpAdvisor" = self._advisors.get(name)
+        if advisor is None:
+            # Imported here, like the commands, so that start-up does not import the planners
+            from leveladvisor import LevelUpAdvisor
+
+            advisor = self._advisors[name] = LevelUpAdvisor(character)
+        # Only the attributes that changed since the last suggestion are updated (a reloaded character is ranked anew)
+        advisor.refresh(character)
+
+        suggestions: List[dict] = []
+        for triple, total in advisor.get_ranking(n):
+            next_increases: List[dict] = []
+            for attribute in triple:
+                next_increase = advisor.get_next_increase(attribute)
+                if next_increase is not None:
+                    next_increases.append({"attribute": attribute.get_name(), "skills_increase": next_increase[0],
+                                           "gain": next_increase[1]})
+            suggestions.append({"attributes": [attribute.get_name() for attribute in triple], "total_gain": total,
+                                "next_increases": next_increases})
+
+        return suggestions
+
+    async def _save(self, name: str) -> str:
+        character: Character = self._get(name)
+        file, offset = await asyncio.get_running_loop().run_in_executor(None, save_level, self.path, character)
+        self.cache.mark_saved(name, file, offset)
+
+        return file.name
+
+    async def _unload(self, name: str) -> bool:
+        """
+        Drop a character from memory (unsaved changes are lost).
+        """
+        return self.cache.discard(name)
+
+
+def character_to_dict(character: Character) -> dict:
+    return {"name": character.name,
+            "level": character.level,
+            "major_skills_increase": character.get_major_skills_increase(),
+            "can_level_up": character.can_level_up(),
+            "plan": [attribute.name for attribute in character.planned_attributes],
+            "attributes": [{"name": attribute.name, "value": attribute.value,
+                            "skills_increase": attribute.get_skills_increase(), "gain": attribute.get_attribute_gain()}
+                           for attribute in character.attributes],
+            "skills": [{"name": skill.name, "attribute": skill.attribute.name, "value": skill.value,
+                        "level_ups": skill.level_ups, "is_major": skill.is_major}
+                       for skill in character.skills]}
+
+
+def run_server(path: Path, socket_path: Path = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+               cache_size: int = DEFAULT_CACHE_SIZE, write_back_interval: float = None) -> NoReturn:
+    """
+    Serve the characters of a directory until interrupted. Changed characters are then written back.
+    """
+    async def serve():
+        server: CharacterServer = CharacterServer(path, cache_size, write_back_interval)
+        await server.start(socket_path, host, port)
+        print("Serving " + str(path) + " on " + (str(socket_path) if socket_path is not None else
+                                                  host + ":" + str(server.get_port())), flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+            print("Session cache: " + ", ".join([key + " " + str(value) for key, value in
+                                                  server.cache.get_stats().items()]), flush=True)
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def _error_response(request_id, code: int, message: str) -> dict:
+    return {"jsonrpc": JSONRPC_VERSION, "id": request_id, "error": {"code": code, "message": message}}
+
+
+def _int(value, name: str) -> int:
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise RpcError(INVALID_PARAMS, "Parameter '" + name + "' should be an integer")
+
+    return value
+
+
+def _str(value, name: str) -> str:
+    if not isinstance(value, str):
+        raise RpcError(INVALID_PARAMS, "Parameter '" + name + "' should be a string")
+
+    return value
+
+
+def _str_list(value, name: str) -> List[str]:
+    if not isinstance(value, list) or not all([isinstance(v, str) for v in value]):
+        raise RpcError(INVALID_PARAMS, "Parameter '" + name + "' should be a list of strings")
+
+    return value
+
+
+def _attribute_names(character: Character, value, name: str, counts: Tuple[int, ...]) -> List[str]:
+    # The character only asserts these (the checks are gone with 'python -O'). Unknown attributes raise ValueError
+    attribute_names: List[str] = _str_list(value, name)
+    if len(attribute_names) not in counts:
+        raise RpcError(INVALID_PARAMS, "Parameter '" + name + "' should have " +
+                       " or ".join([str(count) for count in counts]) + " attributes")
+    if len({find_unique_by_name(character.attributes, n, "attribute") for n in attribute_names}) != \
+            len(attribute_names):
+        raise RpcError(INVALID_PARAMS, "Parameter '" + name + "' should have distinct attributes")
+
+    return attribute_names
@@ -0,0 +1,217 @@
+from collections import OrderedDict
+from pathlib import Path
+from time import monotonic
+from typing import Callable, Dict, List, NoReturn, Optional, Tuple
+
+from catalog import Catalog
+from character import Character
+from levelarchive import load_level, save_level
+from savefile import encode_record
+from savewriter import SaveWriter
+
+# Number of characters kept in memory by default
+DEFAULT_CACHE_SIZE: int = 64
+
+
+class SessionCache:
+    """
+    Bounded LRU cache of the live characters of a save directory. Characters are loaded on first use (the latest saved
+    level), and the least recently used character is dropped when the cache is full. Changed (dirty) characters are
+    written back to disk when they are dropped, and on 'write_back_due' once the write-back interval has passed.
+
+    A character is dirty when its save record differs from the record it was loaded from or last written, so changes
+    are detected however they were made (and a change that was undone is not written). Only characters with the default
+    schema can be cached (see 'encode_record').
+    """
+
+    def __init__(self, path: Path, size: int = DEFAULT_CACHE_SIZE, write_back_interval: float = None,
+                 can_evict: Callable[[str], bool] = None, writer: SaveWriter = None,
+                 on_evict: Callable[[str], NoReturn] = None):
+        """
+        :param path: The save directory
+        :param size: The maximum number of characters in memory
+        :param write_back_interval: The seconds between periodic write-backs (default: only on eviction)
+        :param can_evict: Whether a character (by name) can be dropped, e.g. not while it is in use (default: always)
+        :param writer: Writes the characters in the background (default: characters are written before returning)
+        :param on_evict: Called with the name of each character dropped because the cache is full
+        """
+        assert isinstance(path, Path)
+        assert isinstance(size, int) and size > 0
+        assert isinstance(write_back_interval, (int, float)) or write_back_interval is None
+        assert isinstance(writer, SaveWriter) or writer is None
+
+        self.path: Path = path
+        self.catalog: Catalog = Catalog(path)
+        self.size: int = size
+        self.write_back_interval: float = write_back_interval
+        self.can_evict: Callable[[str], bool] = can_evict
+        self.writer: SaveWriter = writer
+        self.on_evict: Callable[[str], NoReturn] = on_evict
+        self.characters: OrderedDict[str, Character] = OrderedDict()
+        # The save record of each character when it was loaded or last written (None if never saved)
+        self._records: Dict[str, Optional[bytes]] = {}
+        self._last_write_back: float = monotonic()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.write_backs: int = 0
+
+    def get(self, name: str) -> Character:
+        """
+        :param name: The name of the character
+        :return: The cached character, or its latest save (which is then cached)
+        :raises ValueError: If the character is neither cached nor saved
+        """
+        character: Character = self.lookup(name)
+        if character is None:
+            if self.writer is not None:
+                # The character may have been written back in the background (when it was dropped)
+                self.writer.flush()
+            level, file = self.get_latest_level(name)
+            character = load_level(file, level)
+            self.put(character, saved=True)
+
+        return character
+
+    def lookup(self, name: str) -> Optional[Character]:
+        """
+        :return: The cached character (which becomes the most recently used), or None if it is not cached
+        """
+        assert isinstance(name, str)
+
+        character: Character = self.characters.get(name)
+        if character is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.characters.move_to_end(name)
+
+        return character
+
+    def get_latest_level(self, name: str) -> Tuple[int, Path]:
+        """
+        :return: The latest saved level of a character, and its archive (or save file)
+        :raises ValueError: If the character has not been saved
+        """
+        levels: Dict[int, Path] = self.catalog.get_levels(name)
+        if len(levels) == 0:
+            raise ValueError("No character with name '" + name + "' was found")
+        level: int = max(levels.keys())
+
+        return level, levels[level]
+
+    def exists(self, name: str) -> bool:
+        return name in self.characters or len(self.catalog.get_levels(name)) > 0
+
+    def put(self, character: Character, saved: bool = False) -> NoReturn:
+        """
+        Cache a character (replacing a cached character of the same name), and drop the least recently used characters
+        if the cache is full.
+
+        :param character: The character
+        :param saved: Whether the character is as saved (e.g. it was just loaded), otherwise it is dirty
+        """
+        assert isinstance(character, Character)
+
+        self.characters[character.name] = character
+        self.characters.move_to_end(character.name)
+        self._records[character.name] = encode_record(character) if saved else None
+
+        self._evict()
+
+    def discard(self, name: str) -> bool:
+        """
+        Drop a character without writing it back (unsaved changes are lost).
+
+        :return: Whether the character was cached
+        """
+        self._records.pop(name, None)
+
+        return self.characters.pop(name, None) is not None
+
+    def clear(self) -> NoReturn:
+        """
+        Drop all characters without writing them back.
+        """
+        self.characters.clear()
+        self._records.clear()
+
+    def is_dirty(self, name: str) -> bool:
+        return name in self.characters and encode_record(self.characters[name]) != self._records[name]
+
+    def get_dirty(self) -> List[str]:
+        return [name for name in self.characters if self.is_dirty(name)]
+
+    def write_back(self, name: str) -> Path:
+        """
+        Save a cached character (to its level archive), in the background if the cache has a writer.
+
+        :return: The archive file
+        """
+        if self.writer is not None:
+            file: Path = self.writer.submit(self.characters[name])
+            self._records[name] = encode_record(self.characters[name])
+            self.write_backs += 1
+            return file
+
+        file, offset = save_level(self.path, self.characters[name])
+        self.mark_saved(name, file, offset)
+
+        return file
+
+    def mark_saved(self, name: str, file: Path, offset: int = 0) -> NoReturn:
+        """
+        Record that a cached character has been saved (e.g. by a 'save' command).
+
+        :param name: The name of the character
+        :param file: The archive (or save file)
+        :param offset: The offset of the saved record in the file
+        """
+        character: Character = self.characters[name]
+        self._records[name] = encode_record(character)
+        # A level that is saved again does not change the catalog (rewriting the catalog costs more than the save)
+        if self.catalog.get_levels(name).get(character.level) != file:
+            self.catalog.add(character.name, character.level, file, offset)
+        self.write_backs += 1
+
+    def flush(self) -> List[Path]:
+        """
+        Write back all dirty characters.
+
+        :return: The written save files
+        """
+        self._last_write_back = monotonic()
+
+        return [self.write_back(name) for name in self.get_dirty()]
+
+    def is_write_back_due(self) -> bool:
+        return self.write_back_interval is not None and monotonic() - self._last_write_back >= self.write_back_interval
+
+    def write_back_due(self) -> List[Path]:
+        """
+        Write back all dirty characters if the write-back interval has passed since the last write-back.
+
+        :return: The written save files
+        """
+        return self.flush() if self.is_write_back_due() else []
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"size": len(self.characters), "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "write_backs": self.write_backs}
+
+    def _evict(self) -> NoReturn:
+        # The most recently used character is never dropped
+        for name in list(self.characters.keys())[:-1]:
+            if len(self.characters) <= self.size:
+                break
+            if self.can_evict is not None and not self.can_evict(name):
+                continue
+
+            if self.is_dirty(name):
+                self.write_back(name)
+            del self.characters[name]
+            del self._records[name]
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(name)
@@ -1,3 +1,35 @@
+from enum import Enum
+from typing import NoReturn
+
+
+class ValidationMode(Enum):
+    # Every check is done, including the checks of internal calls (slow; meant for tests and debugging)
+    FULL = "full"
+    # Only input that enters the program (command arguments, loaded save files) is checked. Internal calls are trusted
+    BOUNDARY = "boundary"
+    # No list checks at all
+    OFF = "off"
+
+
+_validation_mode: ValidationMode = ValidationMode.FULL
+
+
+def set_validation_mode(mode: ValidationMode) -> NoReturn:
+    """
+    Set which list checks are done (see 'check_typed_list').
+
+    :param mode: The validation mode
+    """
+    assert isinstance(mode, ValidationMode)
+
+    global _validation_mode
+    _validation_mode = mode
+
+
+def get_validation_mode() -> ValidationMode:
+    return _validation_mode
+
+
 def is_typed_list(lst: object, obj_type: type, allow_none: bool = False, allow_empty: bool = True) -> bool:
     """
     Check if a variable is a list that contains objects of specific type.
@@ -27,3 +59,19 @@ def is_typed_list(lst: object, obj_type: type, allow_none: bool = False, allow_e
             return False
 
     return True
+
+
+def check_typed_list(lst: object, obj_type: type, allow_none: bool = False, allow_empty: bool = True,
+                     boundary: bool = False) -> bool:
+    """
+    Same as 'is_typed_list', but only if the validation mode requires the check. Meant to be asserted, e.g.
+    'assert check_typed_list(skills, Skill)'.
+
+    :param boundary: Whether lst is input that enters the program (checked unless validation is off), instead of an
+        argument of an internal call (checked only in full validation mode)
+    :return: Whether lst is a list that contains only objects of type obj_type, or true if the check is skipped
+    """
+    if _validation_mode is ValidationMode.FULL or (boundary and _validation_mode is ValidationMode.BOUNDARY):
+        return is_typed_list(lst, obj_type, allow_none, allow_empty)
+
+    return True
@@ -1,7 +1,6 @@
-from traceback import print_tb
 from typing import List
 
-from tools.checks import is_typed_list
+from tools.checks import check_typed_list
 from tools.formatting import format_error_message
 
 
@@ -12,7 +11,7 @@ def find(b: List[bool]) -> List[int]:
     :param b: A boolean array
     :return: The list of indices
     """
-    assert is_typed_list(b, bool)
+    assert check_typed_list(b, bool)
 
     idx = list()
     for i, bi in enumerate(b):
@@ -42,23 +41,44 @@ def simple_string_check(base: str, pattern: str) -> bool:
     return base.lower()[:n] == pattern.lower()
 
 
-def print_exception(e: Exception):
+def get_exception_message(e: Exception) -> str:
+    """
+    Build an error message from the arguments of an exception. Context added by callers (i.e. appended arguments) comes
+    first.
+
+    :param e: The exception
+    :return: The message
+    """
     assert isinstance(e, Exception)
 
     n: int = len(e.args)
     if n == 0:
-        msg: str = "Unknown error"
-    else:
-        msg: str = e.args[-1]
-        for i in range(n - 1):
-            msg += "\n  " + e.args[-2 - i]
+        return "Unknown error"
+
+    msg: str = str(e.args[-1])
+    for i in range(n - 1):
+        msg += "\n  " + str(e.args[-2 - i])
+
+    return msg
+
+
+def print_exception(e: Exception, message: str = None):
+    assert isinstance(e, Exception)
+    assert isinstance(message, str) or message is None
+
+    msg: str = get_exception_message(e)
+    if message is not None:
+        msg = message + "\n  " + msg
 
     print(format_error_message(msg))
     # Uncomment the following for debugging
-    # print_exception_for_debugging(e, message)
+    # print_exception_for_debugging(e)
 
 
 def print_exception_for_debugging(e: Exception):
+    # Only imported when debugging, it is slow to import
+    from traceback import print_tb
+
     print('---- EXCEPTION [DEBUG MODE] ----')
     print("type:", type(e))
     print("args:", e.args)
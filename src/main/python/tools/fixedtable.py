@@ -0,0 +1,115 @@
+from typing import List, Sequence, Tuple, Union
+
+from tools.common import centered_header
+from tools.formatting import format_base
+
+# Column alignments. A 'NUMERIC' column is right-aligned, unless all of its values are missing (same as tabulate, which
+# aligns columns by the type of their values).
+LEFT: str = "left"
+RIGHT: str = "right"
+NUMERIC: str = "numeric"
+
+# Minimum padding between a header and the column border (same as tabulate)
+_MIN_PADDING: int = 2
+_COLUMN_SEPARATOR: str = "  "
+
+# A cell is missing (None), an int, a plain string, or a styled string with its visible width (see 'styled')
+Cell = Union[None, int, str, Tuple[str, int]]
+
+
+def styled(s: str, fmt) -> Tuple[str, int]:
+    """
+    Format a string (see 'format_base') and keep its visible width, so that tables do not have to scan the escape codes.
+
+    :param s: The string
+    :param fmt: The format(s)
+    :return: A styled table cell
+    """
+    return format_base(s, fmt), len(s)
+
+
+class FixedTable:
+    """
+    Renderer of tables with a known shape, with the same output as tabulate's 'simple' format (and default options).
+
+    The alignment of each column is declared instead of inferred from the values, and the visible width of styled cells
+    is known, so rendering is a single pass to measure the columns and a single join of the output.
+    """
+
+    def __init__(self, aligns: Sequence[str], headers: Sequence[str] = None):
+        """
+        :param aligns: The alignment of each column: LEFT, RIGHT, or NUMERIC (i.e. for columns of numbers)
+        :param headers: The default headers (tables without headers have a dashed line above and below the rows)
+        """
+        assert all([align in [LEFT, RIGHT, NUMERIC] for align in aligns])
+        assert headers is None or len(headers) == len(aligns)
+
+        self.aligns: Tuple[str, ...] = tuple(aligns)
+        self.headers: Tuple[str, ...] = None if headers is None else tuple(headers)
+
+    def render(self, rows: List[List[Cell]], headers: Sequence[str] = None, title: str = None) -> str:
+        """
+        :param rows: The rows of the table
+        :param headers: The headers, if different from the default headers (e.g. when they depend on the data)
+        :param title: If given, a centered header line is added (see 'tabulated_with_centered_header')
+        :return: The table
+        """
+        if headers is None:
+            headers = self.headers
+        n: int = len(self.aligns)
+
+        if headers is None:
+            widths: List[int] = [0] * n
+        else:
+            widths = [len(header) + _MIN_PADDING for header in headers]
+        present: List[bool] = [False] * n
+
+        # Measure the columns
+        cells: List[List[Tuple[str, int]]] = []
+        for row in rows:
+            row_cells: List[Tuple[str, int]] = []
+            for i, value in enumerate(row):
+                if value is None:
+                    cell: Tuple[str, int] = ("", 0)
+                elif isinstance(value, tuple):
+                    cell = value
+                    present[i] = True
+                else:
+                    text: str = value if isinstance(value, str) else str(value)
+                    cell = (text, len(text))
+                    present[i] = True
+                if cell[1] > widths[i]:
+                    widths[i] = cell[1]
+                row_cells.append(cell)
+            cells.append(row_cells)
+
+        right: List[bool] = [align == RIGHT or (align == NUMERIC and present[i]) for i, align in enumerate(self.aligns)]
+
+        lines: List[str] = []
+        dashes: str = _COLUMN_SEPARATOR.join(["-" * width for width in widths]).rstrip()
+        if headers is None:
+            lines.append(dashes)
+        else:
+            lines.append(_COLUMN_SEPARATOR.join([_pad(header, len(header), width, r)
+                                                 for header, width, r in zip(headers, widths, right)]).rstrip())
+            lines.append(dashes)
+        for row_cells in cells:
+            # Trailing spaces are removed (as tabulate does)
+            lines.append(_COLUMN_SEPARATOR.join([_pad(text, width, column_width, r)
+                                                 for (text, width), column_width, r in zip(row_cells, widths,
+                                                                                          right)]).rstrip())
+        if headers is None:
+            lines.append(dashes)
+
+        if title is not None:
+            # Centered over the first line, as 'tabulated_with_centered_header' does
+            lines.insert(0, centered_header(title, len(lines[0])))
+
+        return "\n".join(lines)
+
+
+def _pad(text: str, width: int, column_width: int, right: bool) -> str:
+    if right:
+        return " " * (column_width - width) + text
+    else:
+        return text + " " * (column_width - width)
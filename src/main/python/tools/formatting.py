@@ -1,6 +1,6 @@
 from enum import Enum
 
-from tools.checks import is_typed_list
+from tools.checks import check_typed_list
 
 
 class BColors(Enum):
@@ -18,7 +18,7 @@ class BColors(Enum):
 
 def format_base(s: str, fmt) -> str:
     assert isinstance(s, str)
-    assert isinstance(fmt, BColors) or is_typed_list(fmt, BColors)
+    assert isinstance(fmt, BColors) or check_typed_list(fmt, BColors)
 
     if isinstance(fmt, BColors):
         fmt = [fmt]
@@ -33,3 +33,9 @@ def format_error_message(msg: str) -> str:
     assert isinstance(msg, str)
 
     return format_base(format_base("Error: ", BColors.BOLD), BColors.FAIL) + format_base(msg, BColors.FAIL)
+
+
+def format_warning_message(msg: str) -> str:
+    assert isinstance(msg, str)
+
+    return format_base(format_base("Warning: ", BColors.BOLD), BColors.WARNING) + format_base(msg, BColors.WARNING)
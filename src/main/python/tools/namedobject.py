@@ -1,12 +1,32 @@
-from typing import List, TypeVar
+import sys
+from typing import Dict, List, NoReturn, Tuple, TypeVar
 
-from tools.checks import is_typed_list
+from tools.checks import check_typed_list
 from tools.common import simple_string_check, find
 
 
 class NamedObject:
+    __slots__ = ("name",)
+
     def __init__(self, name: str):
-        self.name: str = name
+        # Names are interned so that all snapshots of the same schema share a single copy of each name
+        self.name: str = sys.intern(name)
+
+    def __getstate__(self) -> dict:
+        # Slotted objects are pickled as a dict of their attributes, i.e. the same layout as objects with a __dict__
+        state: dict = dict(getattr(self, "__dict__", {}))
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if slot != "__dict__" and hasattr(self, slot):
+                    state[slot] = getattr(self, slot)
+
+        return state
+
+    def __setstate__(self, state: dict) -> NoReturn:
+        # Also loads files that were pickled before slots were introduced (their state is the old __dict__)
+        for key, value in state.items():
+            setattr(self, key, value)
+        self.name = sys.intern(self.name)
 
     def __str__(self) -> str:
         return self.get_name()
@@ -30,7 +50,7 @@ class NamedObject:
 
 
 def find_by_name(lst: List[NamedObject], name: str) -> List[int]:
-    assert is_typed_list(lst, NamedObject)
+    assert check_typed_list(lst, NamedObject)
     assert isinstance(name, str)
 
     return find([obj.is_named(name) for obj in lst])
@@ -72,9 +92,105 @@ def get_unique_by_name(lst: List[NamedObjectChild], name: str, objects_name: str
 def get_unique_by_names(lst: List[NamedObjectChild], names: List[str],
                         objects_name: str = None) -> List[NamedObjectChild]:
     # Type checking for lst and objects_name is performed by 'get_unique_by_name'
-    assert is_typed_list(names, str)
+    assert check_typed_list(names, str)
 
     idxs: List[int] = [find_unique_by_name(lst, name, objects_name) for name in names]
     assert len(set(idxs)) == len(names)
 
     return [lst[idx] for idx in idxs]
+
+
+class _TrieNode:
+    __slots__ = ("children", "indices")
+
+    def __init__(self):
+        self.children: Dict[str, _TrieNode] = {}
+        self.indices: List[int] = []
+
+
+# Tries are immutable once built, so collections with the same names (e.g. the skills of every character) share one
+_tries: Dict[Tuple[str, ...], _TrieNode] = {}
+
+
+def _get_trie(names: Tuple[str, ...]) -> _TrieNode:
+    root: _TrieNode = _tries.get(names)
+    if root is not None:
+        return root
+
+    root = _TrieNode()
+    for i, name in enumerate(names):
+        if len(name) < 2:
+            raise ValueError("Base string '" + name + "' is too short")
+
+        node: _TrieNode = root
+        for c in name.casefold():
+            node = node.children.setdefault(c, _TrieNode())
+            node.indices.append(i)
+
+    _tries[names] = root
+
+    return root
+
+
+class NameIndex:
+    """
+    Case-folded prefix trie over the names of a list of named objects. It is built once, and then resolves a name
+    prefix in O(len(prefix)), with the same matching rules as 'simple_string_check'. The list must not be modified
+    after the index is built.
+    """
+    __slots__ = ("objects", "objects_name", "_root")
+
+    def __init__(self, lst: List[NamedObject], objects_name: str = None):
+        assert check_typed_list(lst, NamedObject)
+        assert isinstance(objects_name, str) or objects_name is None
+
+        self.objects: List[NamedObject] = lst
+        self.objects_name: str = objects_name
+        self._root: _TrieNode = _get_trie(tuple([obj.get_name() for obj in lst]))
+
+    def find(self, name: str) -> List[int]:
+        """
+        Find the indices of all objects whose name starts with 'name' (case is not taken into account).
+
+        :param name: The name prefix (at least 2 characters)
+        :return: The indices of the matching objects, in list order
+        """
+        assert isinstance(name, str)
+
+        if len(name) < 2:
+            raise ValueError("Pattern string '" + name + "' is too short")
+
+        node: _TrieNode = self._root
+        for c in name.casefold():
+            node = node.children.get(c)
+            if node is None:
+                return []
+
+        return list(node.indices)
+
+    def find_unique(self, name: str) -> int:
+        idx: List[int] = self.find(name)
+
+        if len(idx) == 1:
+            return idx[0]
+
+        objects_name: str = self.objects_name
+        if objects_name is None:
+            objects_name = str(self.objects[0].__class__)
+
+        if len(idx) == 0:
+            raise ValueError("Cannot find " + objects_name + " matching: " + name)
+
+        found: str = ", ".join([self.objects[i].name for i in idx])
+        raise ValueError("Multiple " + objects_name + " found matching: " + name + " (" + found + ")")
+
+    def get_unique(self, name: str) -> NamedObjectChild:
+        return self.objects[self.find_unique(name)]
+
+    def get_unique_by_names(self, names: List[str]) -> List[NamedObjectChild]:
+        assert check_typed_list(names, str)
+
+        idxs: List[int] = [self.find_unique(name) for name in names]
+        assert len(set(idxs)) == len(names)
+
+        return [self.objects[idx] for idx in idxs]
@@ -0,0 +1,33 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from batch import BatchReport, run_batch
+from catalog import Catalog
+from character import Character
+from savefile import get_save_file_name, save_character
+from scriptrunner import ErrorPolicy
+
+
+class BatchTest(TestCase):
+    def test_run_batch(self):
+        with TemporaryDirectory() as tmp:
+            path: Path = Path(tmp)
+            for name in ["a", "b", "c"]:
+                character: Character = Character(name)
+                save_character(character, path / get_save_file_name(character))
+            (path / "d_lvl01.olm").write_bytes(b"broken")
+
+            for n_workers in [1, 2]:
+                report: BatchReport = run_batch(path, ["inc blade 1", "bogus", "set level 2", "save"],
+                                                ErrorPolicy.SKIP, n_workers)
+
+                self.assertEqual(["a", "b", "c", "d"], [result.name for result in report.results])
+                self.assertIsNotNone(report.results[3].load_error)
+                for result in report.results[:3]:
+                    self.assertEqual((4, 1), (result.report.n_commands, result.report.n_errors))
+                    self.assertIn("Command not found: bogus", result.output)
+                self.assertEqual(4, report.to_dict()["n_failed"])
+
+            # The saves of all workers are in the catalog
+            self.assertEqual([1, 2], list(Catalog(path).get_levels("b").keys()))
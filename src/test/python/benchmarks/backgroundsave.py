@@ -0,0 +1,57 @@
+"""
+Background save benchmark: latency of a save as seen by the prompt, saving on the calling thread vs submitting it to the
+background writer (see 'SaveWriter'), and the time until the background saves are on disk. Saves alternate between a few
+levels, as in a session where the same level is saved again and again.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.backgroundsave [n_saves]
+"""
+import sys
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Dict, List
+
+from benchmarks.snapshotmemory import create_character
+from character import Character
+from levelarchive import save_level
+from savewriter import SaveWriter
+
+
+def run(n_saves: int = 1000, n_levels: int = 5) -> Dict[str, float]:
+    character: Character = create_character()
+    results: Dict[str, float] = {}
+    with TemporaryDirectory() as tmp:
+        for mode in ["sync", "background"]:
+            path: Path = Path(tmp) / mode
+            path.mkdir()
+            writer: SaveWriter = SaveWriter(path)
+
+            latencies: List[float] = []
+            start: float = perf_counter()
+            for i in range(n_saves):
+                character.level = 1 + i % n_levels
+                save_start: float = perf_counter()
+                if mode == "sync":
+                    save_level(path, character)
+                else:
+                    writer.submit(character)
+                latencies.append(perf_counter() - save_start)
+            writer.close()
+            elapsed: float = perf_counter() - start
+
+            latencies.sort()
+            results[mode + ".p50_us"] = median(latencies) * 1e6
+            results[mode + ".p99_us"] = latencies[int(0.99 * (len(latencies) - 1))] * 1e6
+            results[mode + ".total_s"] = elapsed
+            if mode == "background":
+                results["background.written"] = float(writer.n_written)
+
+    return results
+
+
+if __name__ == "__main__":
+    saves: int = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for key, value in run(saves).items():
+        print(key.ljust(20) + str(round(value, 1)))
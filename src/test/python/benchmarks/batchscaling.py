@@ -0,0 +1,53 @@
+"""
+Batch scaling benchmark: time to run a script on every character of a directory, for increasing numbers of workers.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.batchscaling [n_characters] [max_workers]
+"""
+import os
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, List
+
+from batch import BatchReport, run_batch
+from benchmarks.snapshotmemory import create_character
+from character import Character
+from savefile import get_save_file_name, save_character
+from scriptrunner import ErrorPolicy
+
+_SCRIPT: List[str] = ["increase blade 2", "increase athletics 3", "print all", "solve 3", "plan str end spe",
+                      "print plan"]
+
+
+def run(n_characters: int = 200, max_workers: int = None) -> Dict[int, float]:
+    """
+    :return: Seconds to run the batch, for 1, 2, 4, ... workers
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    results: Dict[int, float] = {}
+    with TemporaryDirectory() as tmp:
+        path: Path = Path(tmp)
+        for i in range(n_characters):
+            character: Character = create_character()
+            character.name = "character" + str(i)
+            save_character(character, path / get_save_file_name(character))
+
+        n_workers: int = 1
+        while n_workers <= max_workers:
+            report: BatchReport = run_batch(path, _SCRIPT, ErrorPolicy.SKIP, n_workers)
+            results[n_workers] = report.elapsed
+            n_workers *= 2
+
+    return results
+
+
+if __name__ == "__main__":
+    n: int = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers: int = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    results: Dict[int, float] = run(n, workers)
+    for n_workers, elapsed in results.items():
+        print(str(n_workers).rjust(3) + " worker(s): " + str(round(elapsed, 3)) + " s, speedup " +
+              str(round(results[1] / elapsed, 2)))
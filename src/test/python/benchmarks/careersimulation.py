@@ -0,0 +1,40 @@
+"""
+Career simulation benchmark: simulated careers per second, and the projected time of one million careers, for each
+training strategy.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.careersimulation [n_careers] [n_levels] [n_workers]
+"""
+import sys
+from typing import Dict
+
+from benchmarks.snapshotmemory import create_character
+from careersimulator import simulate_careers, SimulationResult, TrainingStrategy
+
+_STRATEGIES: Dict[str, TrainingStrategy] = {
+    "uniform": TrainingStrategy(),
+    "weighted": TrainingStrategy({"blade": 4, "athletics": 2, "sneak": 2}),
+    "minors-first": TrainingStrategy(minors_first=True),
+}
+
+
+def run(n_careers: int = 50000, n_levels: int = 20, n_workers: int = None) -> Dict[str, float]:
+    """
+    :return: Careers per second of each strategy
+    """
+    throughput: Dict[str, float] = {}
+    for name, strategy in _STRATEGIES.items():
+        result: SimulationResult = simulate_careers(create_character(), strategy, n_careers, n_levels, n_workers,
+                                                    seed=0)
+        throughput[name] = n_careers / result.elapsed
+
+    return throughput
+
+
+if __name__ == "__main__":
+    n: int = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    levels: int = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    workers: int = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    for strategy_name, careers_per_second in run(n, levels, workers).items():
+        print(strategy_name.ljust(14) + (str(round(careers_per_second)) + " careers/s").rjust(18) +
+              "  1M careers: " + str(round(1e6 / careers_per_second / 60, 1)) + " min")
@@ -0,0 +1,56 @@
+"""
+Command journal benchmark: commands per second of a script that changes the character, without a journal, committing
+every command (as in an interactive session), and committing in groups (as for scripts), and the time to recover the
+session from its journal.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.journal [n_commands]
+"""
+import os
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Dict, List
+
+from benchmarks.snapshotmemory import create_character
+from character import Character
+from journal import DEFAULT_GROUP_SIZE
+from oblivionlevelmanagercli import OblivionLevelManagerCLI
+from scriptrunner import ErrorPolicy, iter_script_commands
+
+_COMMANDS: List[str] = ["increase blade 1", "increase sneak 1", "increase athletics 1", "set attribute luck 50"]
+
+
+def run(n_commands: int = 25000) -> Dict[str, float]:
+    script: str = "\n".join([_COMMANDS[i % len(_COMMANDS)] for i in range(n_commands)])
+    results: Dict[str, float] = {}
+    with TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for mode, group_size in [("off", None), ("group1", 1), ("group" + str(DEFAULT_GROUP_SIZE), DEFAULT_GROUP_SIZE)]:
+            path: Path = Path(tmp) / mode
+            path.mkdir()
+            character: Character = create_character()
+            cli: OblivionLevelManagerCLI = OblivionLevelManagerCLI(character, path, journal_group_size=group_size)
+
+            start: float = perf_counter()
+            cli.run_commands(iter_script_commands(StringIO(script)), ErrorPolicy.COLLECT)
+            # A crash after the last command: the journal is kept
+            cli.close()
+            results[mode + ".commands_per_s"] = n_commands / (perf_counter() - start)
+
+            if group_size is not None:
+                cli = OblivionLevelManagerCLI(Character(character.name), path, journal_group_size=group_size)
+                start = perf_counter()
+                results[mode + ".replayed"] = float(cli.recover())
+                results[mode + ".recover_s"] = perf_counter() - start
+                cli.end_session()
+
+    return results
+
+
+if __name__ == "__main__":
+    n: int = int(sys.argv[1]) if len(sys.argv) > 1 else 25000
+    for key, value in run(n).items():
+        print(key.ljust(28) + str(round(value, 3)))
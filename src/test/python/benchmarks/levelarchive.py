@@ -0,0 +1,62 @@
+"""
+Level archive benchmark: a career of saved levels in one level archive vs a save file per level. Times loading one level
+(e.g. 'load --level N'), reading the whole history, and the number of files of the career.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.levelarchive [n_levels] [n_repeats]
+"""
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, Dict
+
+from benchmarks.snapshotmemory import create_character
+from character import Character
+from levelarchive import LevelArchive, save_level
+from savefile import get_save_file_name, load_character, save_character
+
+
+def _time_per_call(fn: Callable, n_repeats: int) -> float:
+    start: float = perf_counter()
+    for _ in range(n_repeats):
+        fn()
+
+    return (perf_counter() - start) / n_repeats
+
+
+def run(n_levels: int = 50, n_repeats: int = 200) -> Dict[str, float]:
+    """
+    :return: Seconds per call of each scenario, for each layout
+    """
+    character: Character = create_character()
+    results: Dict[str, float] = {}
+    with TemporaryDirectory() as tmp:
+        files_path: Path = Path(tmp) / "files"
+        archive_path: Path = Path(tmp) / "archive"
+        files_path.mkdir()
+        archive_path.mkdir()
+
+        for level in range(1, n_levels + 1):
+            character.level = level
+            save_character(character, files_path / get_save_file_name(character))
+            file, _ = save_level(archive_path, character)
+        archive: LevelArchive = LevelArchive(file)
+        level_file: Path = files_path / get_save_file_name(Character(character.name, n_levels // 2))
+
+        results["files.load_level"] = _time_per_call(lambda: load_character(level_file), n_repeats)
+        results["archive.load_level"] = _time_per_call(lambda: archive.read_level(n_levels // 2), n_repeats)
+        results["files.history"] = _time_per_call(lambda: [load_character(f) for f in sorted(files_path.iterdir())],
+                                                  max(1, n_repeats // 10))
+        results["archive.history"] = _time_per_call(archive.read_levels, max(1, n_repeats // 10))
+        results["files.n_files"] = float(len(list(files_path.iterdir())))
+        results["archive.n_files"] = float(len(list(archive_path.iterdir())))
+
+    return results
+
+
+if __name__ == "__main__":
+    levels: int = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    repeats: int = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    for key, value in run(levels, repeats).items():
+        print(key.ljust(20) + (str(int(value)) if key.endswith("n_files") else str(round(value * 1e6, 1)) + " us"))
@@ -0,0 +1,66 @@
+"""
+Save/load benchmark: binary save files vs pickle, for a single file and for a directory of many saves.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.saveload [n_files]
+"""
+import pickle
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from benchmarks.snapshotmemory import create_character
+from character import Character
+from savefile import load_character, save_character
+
+
+def _pickle_save(character: Character, file: Path):
+    with open(file, "wb") as f:
+        pickle.dump(character, f)
+
+
+def _pickle_load(file: Path) -> Character:
+    with open(file, "rb") as f:
+        return pickle.load(f)
+
+
+def _time_per_call(fn: Callable, args_list: List[tuple]) -> float:
+    start: float = perf_counter()
+    for args in args_list:
+        fn(*args)
+
+    return (perf_counter() - start) / len(args_list)
+
+
+def run(n_files: int = 10000, n_repeats: int = 1000) -> Dict[str, float]:
+    """
+    :return: Seconds per save/load call, for each format and scenario
+    """
+    character: Character = create_character()
+    formats = {"pickle": (_pickle_save, _pickle_load, ".pickle"), "binary": (save_character, load_character, ".olm")}
+
+    results: Dict[str, float] = {}
+    with TemporaryDirectory() as tmp:
+        directory: Path = Path(tmp)
+        for fmt, (save, load, suffix) in formats.items():
+            single: Path = directory / ("single" + suffix)
+            results[fmt + ".single.save"] = _time_per_call(save, [(character, single)] * n_repeats)
+            results[fmt + ".single.load"] = _time_per_call(load, [(single,)] * n_repeats)
+
+            files: List[Path] = [directory / (fmt + "_" + str(i) + suffix) for i in range(n_files)]
+            results[fmt + ".directory.save"] = _time_per_call(save, [(character, file) for file in files])
+            results[fmt + ".directory.load"] = _time_per_call(load, [(file,) for file in files])
+            results[fmt + ".file_size"] = float(single.stat().st_size)
+
+    return results
+
+
+if __name__ == "__main__":
+    n: int = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for key, value in run(n).items():
+        if key.endswith("file_size"):
+            print(key.ljust(24) + str(int(value)) + " bytes")
+        else:
+            print(key.ljust(24) + str(round(value * 1e6, 1)) + " us")
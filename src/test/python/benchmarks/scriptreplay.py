@@ -0,0 +1,36 @@
+"""
+Script replay benchmark: commands per second when streaming a long script through the CLI.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.scriptreplay [n_commands]
+"""
+import os
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Iterator, List
+
+from benchmarks.snapshotmemory import create_character
+from oblivionlevelmanagercli import OblivionLevelManagerCLI
+from scriptrunner import ErrorPolicy, iter_script_commands, ScriptReport
+
+_COMMANDS: List[str] = ["increase blade 1", "increase sneak 1", "increase athletics 1", "print skills",
+                        "set attribute luck 50", "print attributes"]
+
+
+def _generate_script(n_commands: int) -> Iterator[str]:
+    for i in range(n_commands):
+        yield _COMMANDS[i % len(_COMMANDS)] + ("\n" if i % 2 == 0 else ";")
+
+
+def run(n_commands: int = 100000) -> ScriptReport:
+    cli: OblivionLevelManagerCLI = OblivionLevelManagerCLI(create_character())
+    script: StringIO = StringIO("".join(_generate_script(n_commands)))
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        return cli.run_commands(iter_script_commands(script), ErrorPolicy.COLLECT)
+
+
+if __name__ == "__main__":
+    n: int = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(run(n).get_summary(with_errors=True))
@@ -0,0 +1,94 @@
+"""
+Server load test: requests per second and latency percentiles of the JSON-RPC server ('serve' action), with concurrent
+local clients on a Unix socket. The server runs in its own process; each client sends its requests one after the other,
+on its own connection, for one of the characters.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.serverload [n_clients] [n_requests_per_client] [n_characters]
+"""
+import asyncio
+import json
+import sys
+import time
+from multiprocessing import Process
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Dict, List
+
+from benchmarks.snapshotmemory import create_character
+from character import Character
+from savefile import get_save_file_name, save_character
+from server import run_server
+
+# Requests of a client, in a cycle ('name' is added)
+_REQUESTS: List[dict] = [{"method": "increase_skill", "params": {"skill": "blade", "value": 1}},
+                         {"method": "get_character", "params": {}},
+                         {"method": "increase_skill", "params": {"skill": "blade", "value": -1}},
+                         {"method": "can_level_up", "params": {}},
+                         {"method": "set_plan", "params": {"attributes": ["str", "end", "spe"]}},
+                         {"method": "suggest", "params": {"n": 3}}]
+
+
+async def _run_client(socket_path: Path, name: str, n_requests: int, latencies: List[float]) -> int:
+    reader, writer = await asyncio.open_unix_connection(str(socket_path), limit=1 << 20)
+    errors: int = 0
+    for i in range(n_requests):
+        request: dict = dict(_REQUESTS[i % len(_REQUESTS)])
+        request = {"jsonrpc": "2.0", "id": i, "method": request["method"], "params": dict(request["params"], name=name)}
+
+        start: float = perf_counter()
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+        response: dict = json.loads(await reader.readline())
+        latencies.append(perf_counter() - start)
+        errors += "error" in response
+    writer.close()
+
+    return errors
+
+
+async def _run_clients(socket_path: Path, n_clients: int, n_requests: int, n_characters: int) -> dict:
+    latencies: List[float] = []
+    start: float = perf_counter()
+    errors: List[int] = await asyncio.gather(*[_run_client(socket_path, "character" + str(i % n_characters),
+                                                           n_requests, latencies)
+                                               for i in range(n_clients)])
+    elapsed: float = perf_counter() - start
+
+    latencies.sort()
+    return {"requests": len(latencies), "errors": sum(errors), "seconds": elapsed,
+            "requests_per_second": len(latencies) / elapsed, "p50_ms": median(latencies) * 1000,
+            "p99_ms": latencies[int(0.99 * (len(latencies) - 1))] * 1000, "max_ms": latencies[-1] * 1000}
+
+
+def run(n_clients: int = 16, n_requests: int = 2000, n_characters: int = 8) -> Dict[str, float]:
+    with TemporaryDirectory() as tmp:
+        path: Path = Path(tmp)
+        for i in range(n_characters):
+            character: Character = create_character()
+            character.name = "character" + str(i)
+            save_character(character, path / get_save_file_name(character))
+
+        socket_path: Path = path / "server.sock"
+        server: Process = Process(target=run_server, args=(path, socket_path), daemon=True)
+        server.start()
+        try:
+            while not socket_path.exists():
+                time.sleep(0.01)
+            return asyncio.run(_run_clients(socket_path, n_clients, n_requests, n_characters))
+        finally:
+            server.terminate()
+            server.join()
+
+
+if __name__ == "__main__":
+    clients: int = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    requests: int = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    characters: int = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    results: Dict[str, float] = run(clients, requests, characters)
+    print(str(results["requests"]) + " requests (" + str(results["errors"]) + " errors) in " +
+          str(round(results["seconds"], 2)) + " s: " + str(round(results["requests_per_second"])) + " requests/s, " +
+          "p50 " + str(round(results["p50_ms"], 3)) + " ms, p99 " + str(round(results["p99_ms"], 3)) + " ms, max " +
+          str(round(results["max_ms"], 3)) + " ms")
@@ -0,0 +1,62 @@
+"""
+Session cache benchmark: accesses per second of characters of a save directory, loading (and saving) the character on
+every access versus through the session cache (see 'SessionCache'), for a skewed access pattern (a few characters are
+accessed most of the time) and a cache smaller than the directory. Every access increases a skill, so that evicted
+characters are written back.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.sessioncache [n_accesses] [n_characters] [cache_size]
+"""
+import random
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Dict, List
+
+from catalog import Catalog
+from character import Character
+from savefile import get_save_file_name, load_character, save_character
+from sessioncache import SessionCache
+
+
+def run(n_accesses: int = 20000, n_characters: int = 200, cache_size: int = 32, seed: int = 0) -> Dict[str, float]:
+    with TemporaryDirectory() as tmp:
+        path: Path = Path(tmp)
+        for i in range(n_characters):
+            character: Character = Character("character" + str(i))
+            save_character(character, path / get_save_file_name(character))
+
+        # Zipf-like: character i is accessed with probability proportional to 1 / (i + 1)
+        names: List[str] = random.Random(seed).choices(["character" + str(i) for i in range(n_characters)],
+                                                       [1 / (i + 1) for i in range(n_characters)], k=n_accesses)
+
+        catalog: Catalog = Catalog(path)
+        start: float = perf_counter()
+        for name in names:
+            levels: Dict[int, Path] = catalog.get_levels(name)
+            character = load_character(levels[max(levels.keys())])
+            character.increase_skill("blade")
+            save_character(character, levels[character.level])
+        uncached: float = perf_counter() - start
+
+        cache: SessionCache = SessionCache(path, cache_size)
+        start = perf_counter()
+        for name in names:
+            cache.get(name).increase_skill("blade")
+        cache.flush()
+        cached: float = perf_counter() - start
+
+    return {"uncached_per_second": n_accesses / uncached, "cached_per_second": n_accesses / cached,
+            "hit_rate": cache.hits / n_accesses, "evictions": cache.evictions, "write_backs": cache.write_backs}
+
+
+if __name__ == "__main__":
+    accesses: int = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    characters: int = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    size: int = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+    results: Dict[str, float] = run(accesses, characters, size)
+    print("load and save on every access: " + str(round(results["uncached_per_second"])) + " accesses/s")
+    print("session cache:                 " + str(round(results["cached_per_second"])) + " accesses/s (hit rate " +
+          str(round(100 * results["hit_rate"], 1)) + "%, " + str(results["evictions"]) + " evictions, " +
+          str(results["write_backs"]) + " write-backs)")
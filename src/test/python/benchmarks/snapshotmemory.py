@@ -0,0 +1,48 @@
+"""
+Memory benchmark: bytes per in-memory Character snapshot.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.snapshotmemory [n_snapshots]
+"""
+import copy
+import sys
+import tracemalloc
+from typing import List
+
+from character import Character
+
+
+def create_character() -> Character:
+    character: Character = Character("benchmark")
+    for name in ["blade", "blunt", "armorer", "block", "athletics", "security", "alchemy"]:
+        character.set_skill_mode(name, True)
+    for i, skill in enumerate(character.skills):
+        character.increase_skill(skill.name, i % 4)
+    character.set_plan(["str", "end", "spe"])
+
+    return character
+
+
+def measure_snapshot_bytes(n: int = 1000) -> float:
+    """
+    Measure the memory taken by n deep copies of a character.
+
+    :param n: The number of snapshots
+    :return: The average number of bytes per snapshot
+    """
+    character: Character = create_character()
+
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    snapshots: List[Character] = [copy.deepcopy(character) for _ in range(n)]
+    after: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(snapshots) == n
+
+    return (after - before) / n
+
+
+if __name__ == "__main__":
+    n_snapshots: int = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print("bytes per snapshot: " + str(round(measure_snapshot_bytes(n_snapshots))))
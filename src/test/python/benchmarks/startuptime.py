@@ -0,0 +1,75 @@
+"""
+Start-up benchmark: import time of the CLI (from 'python -X importtime') and wall time of one-shot CLI runs.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.startuptime [n_runs]
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+MAIN_PATH: Path = Path(__file__).resolve().parents[3] / "main" / "python"
+CLI_MODULE: str = "oblivionlevelmanagercli"
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """
+    :param stderr: The standard error of 'python -X importtime'
+    :return: The self and cumulative import time (in us) of each module
+    """
+    times: Dict[str, Tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+
+    return times
+
+
+def measure_import(n_runs: int = 10) -> Tuple[float, List[Tuple[str, int]]]:
+    """
+    :return: The median cumulative import time of the CLI module (in seconds), and the slowest imports of the last run
+    """
+    env: Dict[str, str] = dict(os.environ, PYTHONPATH=str(MAIN_PATH))
+
+    cumulative: List[int] = []
+    times: Dict[str, Tuple[int, int]] = {}
+    for _ in range(n_runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + CLI_MODULE], env=env,
+                                capture_output=True, text=True, check=True)
+        times = parse_importtime(result.stderr)
+        cumulative.append(times[CLI_MODULE][1])
+
+    slowest: List[Tuple[str, int]] = sorted([(name, t[0]) for name, t in times.items()], key=lambda x: -x[1])[:10]
+
+    return median(cumulative) / 1e6, slowest
+
+
+def measure_one_shot(n_runs: int = 10) -> float:
+    """
+    :return: The median wall time (in seconds) of a one-shot run: create a character, run a command and exit
+    """
+    wall: List[float] = []
+    with TemporaryDirectory() as tmp:
+        for _ in range(n_runs):
+            start: float = perf_counter()
+            subprocess.run([sys.executable, str(MAIN_PATH / (CLI_MODULE + ".py")), "--path", tmp, "--run",
+                            "inc blade 1", "new", "benchmark"], capture_output=True, check=True)
+            wall.append(perf_counter() - start)
+
+    return median(wall)
+
+
+if __name__ == "__main__":
+    n: int = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    import_seconds, slowest_imports = measure_import(n)
+    print("import " + CLI_MODULE + ": " + str(round(import_seconds * 1000, 1)) + " ms")
+    for module, self_us in slowest_imports:
+        print("  " + module.strip().ljust(40) + str(round(self_us / 1000, 2)) + " ms")
+    print("one-shot run: " + str(round(measure_one_shot(n) * 1000, 1)) + " ms")
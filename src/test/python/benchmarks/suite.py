@@ -0,0 +1,248 @@
+"""
+Benchmark suite: name resolution, skill increases, level-ups, rendering, help generation, save/load and a scripted
+session, on synthetic characters. Results are written as JSON and can be compared against a stored baseline (a previous
+JSON output) with a regression threshold.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.suite [--output FILE] [--baseline FILE] [--threshold 0.2] [--filter NAME]
+
+The exit code is 1 if any benchmark is slower than its baseline by more than the threshold.
+"""
+import copy
+import json
+import os
+import pickle
+import platform
+import sys
+from argparse import ArgumentParser, Namespace
+from contextlib import redirect_stdout
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.snapshotmemory import create_character
+from character import Character
+from commands.printcommand import print_attributes, print_plan, print_skills, print_summary
+from oblivionlevelmanagercli import OblivionLevelManagerCLI
+from savefile import load_character, save_character
+from scriptrunner import ErrorPolicy
+from tools.namedobject import find_unique_by_name
+
+RESULTS_VERSION: int = 1
+DEFAULT_THRESHOLD: float = 0.2
+
+# A benchmark takes the number of calls and returns the time they took (setup is not timed)
+Benchmark = Callable[[int], float]
+
+_SESSION: List[str] = ["print all", "increase blade 2", "inc athletics 1", "set skill sneak 30", "plan str end spe",
+                       "print plan", "solve 3", "show skills"]
+
+
+def _create_level_up_character() -> Character:
+    character: Character = create_character()
+    character.increase_skill("blade", 4)
+    character.increase_skill("armorer", 4)
+
+    return character
+
+
+def _time_calls(fn: Callable, number: int) -> float:
+    start: float = perf_counter()
+    for _ in range(number):
+        fn()
+
+    return perf_counter() - start
+
+
+def _bench_find_unique_by_name(number: int) -> float:
+    skills = list(create_character().skills)
+
+    return _time_calls(lambda: find_unique_by_name(skills, "athl", "skill"), number)
+
+
+def _bench_increase_skill(number: int) -> float:
+    character: Character = create_character()
+
+    def increase():
+        character.increase_skill("blade", 1)
+        character.increase_skill("blade", -1)
+
+    # Two calls per iteration
+    return _time_calls(increase, number) / 2
+
+
+def _bench_level_up(number: int) -> float:
+    prototype: Character = _create_level_up_character()
+    characters: List[Character] = [copy.deepcopy(prototype) for _ in range(number)]
+
+    start: float = perf_counter()
+    for character in characters:
+        character.level_up(["str", "end", "spe"])
+
+    return perf_counter() - start
+
+
+def _bench_print(print_fn: Callable[[Character], None]) -> Benchmark:
+    def bench(number: int) -> float:
+        character: Character = create_character()
+
+        return _time_calls(lambda: print_fn(character), number)
+
+    return bench
+
+
+def _bench_generate_help(number: int) -> float:
+    cli: OblivionLevelManagerCLI = OblivionLevelManagerCLI(create_character())
+    help_command = cli.registry.find("help")
+
+    return _time_calls(lambda: help_command.generate_help(cli.registry.commands), number)
+
+
+def _bench_pickle(number: int, load: bool) -> float:
+    character: Character = create_character()
+    with TemporaryDirectory() as tmp:
+        file: Path = Path(tmp) / "benchmark.pickle"
+
+        def save():
+            with open(file, "wb") as f:
+                pickle.dump(character, f)
+
+        def load_():
+            with open(file, "rb") as f:
+                return pickle.load(f)
+
+        save()
+
+        return _time_calls(load_ if load else save, number)
+
+
+def _bench_binary(number: int, load: bool) -> float:
+    character: Character = create_character()
+    with TemporaryDirectory() as tmp:
+        file: Path = Path(tmp) / "benchmark.olm"
+        save_character(character, file)
+
+        return _time_calls((lambda: load_character(file)) if load else (lambda: save_character(character, file)),
+                           number)
+
+
+def _bench_session(number: int) -> float:
+    cli: OblivionLevelManagerCLI = OblivionLevelManagerCLI(create_character())
+    commands: List[str] = [_SESSION[i % len(_SESSION)] for i in range(number)]
+
+    return cli.run_commands(iter(commands), ErrorPolicy.STOP).elapsed
+
+
+# Name -> (benchmark, number of calls per repeat)
+BENCHMARKS: Dict[str, Tuple[Benchmark, int]] = {
+    "namedobject.find_unique_by_name": (_bench_find_unique_by_name, 20000),
+    "character.increase_skill": (_bench_increase_skill, 20000),
+    "character.level_up": (_bench_level_up, 500),
+    "printcommand.print_summary": (_bench_print(print_summary), 500),
+    "printcommand.print_attributes": (_bench_print(print_attributes), 500),
+    "printcommand.print_skills": (_bench_print(print_skills), 200),
+    "printcommand.print_plan": (_bench_print(print_plan), 200),
+    "helpcommand.generate_help": (_bench_generate_help, 100),
+    "save.pickle.save": (lambda number: _bench_pickle(number, False), 1000),
+    "save.pickle.load": (lambda number: _bench_pickle(number, True), 1000),
+    "save.binary.save": (lambda number: _bench_binary(number, False), 1000),
+    "save.binary.load": (lambda number: _bench_binary(number, True), 1000),
+    "session.commands": (_bench_session, 400),
+}
+
+
+def run(names: List[str] = None, repeat: int = 5, scale: float = 1.0) -> dict:
+    """
+    Run the benchmarks. Output of the benchmarked code is discarded.
+
+    :param names: The benchmarks to run (default: all)
+    :param repeat: The number of repeats of each benchmark. The fastest repeat is the reported time
+    :param scale: Multiplier of the number of calls per repeat
+    :return: The results (JSON-serializable)
+    """
+    if names is None:
+        names = list(BENCHMARKS.keys())
+
+    results: Dict[str, dict] = {}
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for name in names:
+            bench, number = BENCHMARKS[name]
+            number = max(1, int(number * scale))
+            times: List[float] = [bench(number) / number for _ in range(repeat)]
+            results[name] = {"seconds_per_call": min(times), "median_seconds_per_call": median(times),
+                             "calls": number, "repeat": repeat}
+
+    return {"version": RESULTS_VERSION, "python": platform.python_version(), "platform": platform.platform(),
+            "benchmarks": results}
+
+
+def compare(results: dict, baseline: dict) -> Dict[str, float]:
+    """
+    Compare results against a baseline.
+
+    :param results: The output of 'run'
+    :param baseline: A previous output of 'run'
+    :return: The ratio current / baseline time of each benchmark in both results
+    """
+    if baseline.get("version") != RESULTS_VERSION:
+        raise ValueError("Unsupported baseline version: " + str(baseline.get("version")))
+
+    ratios: Dict[str, float] = {}
+    for name, result in results["benchmarks"].items():
+        if name in baseline["benchmarks"]:
+            ratios[name] = result["seconds_per_call"] / baseline["benchmarks"][name]["seconds_per_call"]
+
+    return ratios
+
+
+def get_regressions(ratios: Dict[str, float], threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    :param ratios: The output of 'compare'
+    :param threshold: The relative slowdown above which a benchmark is a regression (e.g. 0.2 for 20%)
+    :return: The names of the regressed benchmarks
+    """
+    return [name for name, ratio in ratios.items() if ratio > 1 + threshold]
+
+
+def main(argv: List[str] = None) -> int:
+    parser: ArgumentParser = ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument('--output', default=None, type=str, help="Write the results to this JSON file")
+    parser.add_argument('--baseline', default=None, type=str, help="Compare against this JSON file")
+    parser.add_argument('--threshold', default=DEFAULT_THRESHOLD, type=float,
+                        help="Relative slowdown that counts as a regression (default: 0.2)")
+    parser.add_argument('--repeat', default=5, type=int, help="Repeats of each benchmark (default: 5)")
+    parser.add_argument('--scale', default=1.0, type=float, help="Multiplier of the number of calls (default: 1)")
+    parser.add_argument('--filter', default=None, type=str, help="Only run benchmarks whose name contains this")
+    args: Namespace = parser.parse_args(argv)
+
+    names: List[str] = [name for name in BENCHMARKS if args.filter is None or args.filter in name]
+    results: dict = run(names, args.repeat, args.scale)
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    ratios: Dict[str, float] = {}
+    if args.baseline is not None:
+        with open(args.baseline, "r") as f:
+            ratios = compare(results, json.load(f))
+    regressions: List[str] = get_regressions(ratios, args.threshold)
+
+    for name, result in results["benchmarks"].items():
+        line: str = name.ljust(34) + (str(round(result["seconds_per_call"] * 1e6, 2)) + " us").rjust(14)
+        if name in ratios:
+            line += "  x" + str(round(ratios[name], 2))
+            if name in regressions:
+                line += "  REGRESSION"
+        print(line)
+
+    if args.baseline is not None:
+        print(str(len(regressions)) + " regression(s) (threshold " + str(round(args.threshold * 100)) + "%)")
+
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
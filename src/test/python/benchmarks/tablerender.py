@@ -0,0 +1,83 @@
+"""
+Table rendering benchmark: the fixed-schema renderer of the print tables vs tabulate, on the same rows (the render
+cache is not involved). Both outputs are checked to be identical.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.tablerender [n_repeats]
+"""
+import sys
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+from tabulate import tabulate
+
+from benchmarks.snapshotmemory import create_character
+from character import Character
+from commands import printcommand
+from tools.common import tabulated_with_centered_header
+from tools.fixedtable import FixedTable
+
+_SECTIONS: Dict[str, Tuple[FixedTable, Callable[[Character], str]]] = {
+    "summary": (printcommand._SUMMARY_TABLE, printcommand._render_summary),
+    "attributes": (printcommand._ATTRIBUTES_TABLE, printcommand._render_attributes),
+    "skills": (printcommand._SKILLS_TABLE, printcommand._render_skills),
+    "plan": (printcommand._PLAN_TABLE, printcommand._render_plan),
+}
+
+
+def _capture_render_args(table: FixedTable, render_section: Callable[[Character], str], character: Character) -> tuple:
+    # Record the arguments the section passes to its table
+    captured: list = []
+
+    def render(rows, headers=None, title=None):
+        captured.append((rows, headers, title))
+        return FixedTable.render(table, rows, headers, title)
+
+    table.render = render
+    try:
+        render_section(character)
+    finally:
+        del table.render
+
+    return captured[0]
+
+
+def _time(fn: Callable, n: int) -> float:
+    start: float = perf_counter()
+    for _ in range(n):
+        fn()
+
+    return (perf_counter() - start) / n
+
+
+def run(n_repeats: int = 2000) -> Dict[str, Tuple[float, float]]:
+    """
+    :return: Seconds per render with tabulate and with the fixed-schema renderer, for each section
+    """
+    character: Character = create_character()
+
+    results: Dict[str, Tuple[float, float]] = {}
+    for section, (table, render_section) in _SECTIONS.items():
+        rows, headers, title = _capture_render_args(table, render_section, character)
+        plain_rows: List[list] = [[cell[0] if isinstance(cell, tuple) else cell for cell in row] for row in rows]
+        colalign = ("left", "right") if table is printcommand._PLAN_TABLE else None
+        headers = table.headers if headers is None else headers
+
+        def render_tabulate() -> str:
+            return tabulated_with_centered_header(tabulate(plain_rows, headers=() if headers is None else headers,
+                                                           colalign=colalign), title)
+
+        def render_fixed() -> str:
+            return table.render(rows, headers, title)
+
+        assert render_tabulate() == render_fixed()
+        results[section] = (_time(render_tabulate, n_repeats), _time(render_fixed, n_repeats))
+
+    return results
+
+
+if __name__ == "__main__":
+    n: int = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for section, (t_tabulate, t_fixed) in run(n).items():
+        print(section.ljust(12) + "tabulate " + str(round(t_tabulate * 1e6, 1)).rjust(8) + " us   fixed " +
+              str(round(t_fixed * 1e6, 1)).rjust(7) + " us   x" + str(round(t_tabulate / t_fixed, 1)))
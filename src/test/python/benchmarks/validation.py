@@ -0,0 +1,40 @@
+"""
+Validation mode benchmark: commands per second of a scripted replay (see 'scriptreplay') in each validation mode.
+
+Run from src/test/python with src/main/python on the python path:
+    python -m benchmarks.validation [n_commands]
+"""
+import sys
+from typing import Dict
+
+from benchmarks import scriptreplay
+from scriptrunner import ScriptReport
+from tools.checks import get_validation_mode, set_validation_mode, ValidationMode
+
+
+def run(n_commands: int = 20000) -> Dict[ValidationMode, float]:
+    """
+    :param n_commands: The number of commands of the replayed script
+    :return: The commands per second of each validation mode
+    """
+    mode: ValidationMode = get_validation_mode()
+    throughput: Dict[ValidationMode, float] = {}
+    try:
+        for validation_mode in ValidationMode:
+            set_validation_mode(validation_mode)
+            report: ScriptReport = scriptreplay.run(n_commands)
+            assert report.n_errors == 0
+            throughput[validation_mode] = report.get_commands_per_second()
+    finally:
+        set_validation_mode(mode)
+
+    return throughput
+
+
+if __name__ == "__main__":
+    n: int = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    results: Dict[ValidationMode, float] = run(n)
+    full: float = results[ValidationMode.FULL]
+    for mode, commands_per_second in results.items():
+        print(mode.value.ljust(10) + (str(round(commands_per_second)) + " commands/s").rjust(20) +
+              "  x" + str(round(commands_per_second / full, 2)))
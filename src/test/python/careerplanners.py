@@ -0,0 +1,40 @@
+from unittest import TestCase
+
+from careerplanner import CareerPlanner
+from character import Character
+
+
+class CareerPlannerTest(TestCase):
+    def test_fresh_character(self):
+        character: Character = Character("tester")
+        for name in ["blade", "blunt", "armorer", "block", "athletics", "security", "alchemy"]:
+            character.set_skill_mode(name, True)
+
+        planner: CareerPlanner = CareerPlanner(character)
+        plans = planner.solve()
+
+        # Luck can only gain +1 per level
+        self.assertEqual(len(plans), 50)
+        self.assertTrue(planner.is_optimal())
+        for plan in plans:
+            self.assertIn("Luck", plan.get_attribute_names())
+
+        for plan in plans:
+            for skill, n in plan.skill_increases:
+                character.increase_skill(skill.name, n)
+            character.level_up(plan.get_attribute_names())
+        for attribute in character.attributes:
+            self.assertGreaterEqual(attribute.value, 100)
+
+    def test_no_major_skills(self):
+        planner: CareerPlanner = CareerPlanner(Character("tester"))
+        self.assertEqual(planner.solve(), [])
+        self.assertFalse(planner.is_exhausted())
+
+    def test_exhausted(self):
+        character: Character = Character("tester")
+        character.set_skill_mode("blade", True)
+
+        planner: CareerPlanner = CareerPlanner(character, max_nodes=5)
+        self.assertEqual(planner.solve(), [])
+        self.assertTrue(planner.is_exhausted())
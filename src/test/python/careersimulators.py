@@ -0,0 +1,47 @@
+from unittest import TestCase
+
+import numpy as np
+
+from careersimulator import simulate_careers, SimulationResult, TrainingStrategy
+from character import Character
+
+
+class CareerSimulatorTest(TestCase):
+    def setUp(self):
+        self.character: Character = Character("tester")
+        for name in ["blade", "blunt", "armorer", "block", "athletics", "security", "alchemy"]:
+            self.character.set_skill_mode(name, True)
+
+    def test_minors_first(self):
+        self.character.set_skill_mode("blunt", False)
+        strategy: TrainingStrategy = TrainingStrategy.parse(["default=0", "blade=1", "blunt=1", "minors-first"])
+
+        result: SimulationResult = simulate_careers(self.character, strategy, 200, 2, n_workers=1, seed=0)
+
+        # Strength is always planned (the only attribute with weighted minors) and gains +5 per level
+        self.assertEqual(result.get_attribute_quantiles(0)[0], 60)
+        self.assertEqual(result.get_attribute_quantiles(1)[0], 60)
+        self.assertEqual(result.get_level_quantile(0), 3)
+        self.assertEqual(result.get_level_quantile(1), 3)
+        self.assertEqual(self.character.level, 1)
+
+    def test_no_major_skills(self):
+        result: SimulationResult = simulate_careers(Character("tester"), TrainingStrategy(), 100, 5, n_workers=1)
+
+        self.assertEqual(result.get_mean_level(), 1)
+        self.assertTrue(np.all(result.get_mean_attributes() == 50))
+
+    def test_workers(self):
+        strategy: TrainingStrategy = TrainingStrategy({"blade": 5})
+
+        inline: SimulationResult = simulate_careers(self.character, strategy, 1000, 5, n_workers=1, seed=1,
+                                                    batch_size=300)
+        parallel: SimulationResult = simulate_careers(self.character, strategy, 1000, 5, n_workers=2, seed=1,
+                                                      batch_size=300)
+
+        self.assertEqual(inline.get_n_careers(), 1000)
+        self.assertTrue(np.array_equal(inline.attribute_counts, parallel.attribute_counts))
+        self.assertTrue(np.array_equal(inline.level_counts, parallel.level_counts))
+        # Every level-up adds at least +1 to three attributes
+        self.assertEqual(inline.get_level_quantile(0), 6)
+        self.assertGreaterEqual(inline.get_mean_attributes().sum(), 8 * 50 + 5 * 3)
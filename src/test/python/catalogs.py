@@ -0,0 +1,63 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from catalog import Catalog
+from character import Character
+from savefile import save_character
+
+
+class CatalogTest(TestCase):
+    def test_catalog(self):
+        with TemporaryDirectory() as tmp:
+            path: Path = Path(tmp)
+            for name, level in [("a", 1), ("a", 2), ("b", 5)]:
+                save_character(Character(name, level), path / (name + "_lvl" + str(level).zfill(2) + ".olm"))
+            (path / "a_lvl03.pickle").touch()
+            (path / "notes.txt").touch()
+
+            catalog: Catalog = Catalog(path)
+            self.assertEqual(catalog.get_characters(), ["a", "b"])
+            self.assertEqual(list(catalog.get_levels("a").keys()), [1, 2, 3])
+            self.assertEqual(catalog.get_levels("c"), {})
+
+            # Saves through the catalog keep it fresh
+            file: Path = path / "c_lvl01.olm"
+            save_character(Character("c"), file)
+            catalog.add("c", 1, file)
+            self.assertEqual(Catalog(path).get_characters(), ["a", "b", "c"])
+
+            # Changes made behind the catalog's back are picked up
+            os.remove(path / "b_lvl05.olm")
+            os.utime(path, ns=(os.stat(catalog.file).st_mtime_ns + 1,) * 2)
+            self.assertEqual(Catalog(path).get_characters(), ["a", "c"])
+
+    def test_saves(self):
+        with TemporaryDirectory() as tmp:
+            path: Path = Path(tmp)
+            catalog: Catalog = Catalog(path)
+            self.assertEqual(catalog.get_characters(), [])
+            # Only saves write the catalog
+            self.assertFalse(catalog.file.exists())
+
+            # New files of the saves do not make the catalog stale
+            rebuild = catalog.rebuild
+            catalog.rebuild = lambda *args: self.fail("The catalog was rebuilt")
+            for level in range(1, 4):
+                file: Path = path / ("a_lvl" + str(level).zfill(2) + ".olm")
+                save_character(Character("a", level), file)
+                catalog.add("a", level, file)
+            catalog.rebuild = rebuild
+            self.assertEqual(list(Catalog(path).get_levels("a").keys()), [1, 2, 3])
+
+            # Other changes of the directory are not hidden by the next save
+            save_character(Character("b"), path / "b_lvl01.olm")
+            self.assertEqual(list(Catalog(path).get_levels("b").keys()), [1])
+            file = path / "a_lvl04.olm"
+            save_character(Character("a", 4), file)
+            catalog.add("a", 4, file)
+            self.assertEqual(catalog.get_characters(), ["a", "b"])
+            self.assertEqual(Catalog(path).get_characters(), ["a", "b"])
+
+        self.assertEqual(Catalog(path / "missing").get_characters(), [])
@@ -0,0 +1,97 @@
+import pickle
+from random import Random
+from unittest import TestCase
+
+from character import Character, set_counter_checks
+from savefile import encode_record
+
+
+class CharacterCountersTest(TestCase):
+    def setUp(self):
+        set_counter_checks(True)
+
+    def tearDown(self):
+        set_counter_checks(False)
+
+    def test_random_session(self):
+        rng: Random = Random(0)
+        character: Character = Character("tester")
+        names = [skill.name for skill in character.skills]
+
+        for _ in range(2000):
+            r: float = rng.random()
+            if r < 0.7:
+                character.increase_skill(rng.choice(names), rng.randint(-1, 3))
+            elif r < 0.8:
+                character.set_skill_value(rng.choice(names), rng.randint(90, 100))
+            elif r < 0.9:
+                character.set_skill_mode(rng.choice(names), rng.random() < 0.5)
+            elif character.can_level_up():
+                character.level_up(rng.sample(["str", "end", "spe", "agi", "per", "int", "wil", "luc"], 3))
+
+            character.check_counters()
+            for skill in character.skills:
+                character.get_remaining_skill_increase(skill)
+            for attribute in character.attributes:
+                attribute.get_attribute_gain()
+
+    def test_pickle(self):
+        character: Character = Character("tester")
+        character.set_skill_mode("blade", True)
+        character.increase_skill("blade", 4)
+
+        loaded: Character = pickle.loads(pickle.dumps(character))
+        loaded.increase_skill("blade")
+
+        self.assertEqual(loaded.get_major_skills_increase(), 5)
+        loaded.check_counters()
+
+
+class CharacterHistoryTest(TestCase):
+    def setUp(self):
+        set_counter_checks(True)
+
+    def tearDown(self):
+        set_counter_checks(False)
+
+    def test_undo_redo(self):
+        rng: Random = Random(1)
+        character: Character = Character("tester")
+        names = [skill.name for skill in character.skills]
+        for name in names[:7]:
+            character.set_skill_mode(name, True)
+        character.history.clear()
+
+        # Encoded state after every change
+        states = [encode_record(character)]
+        for _ in range(500):
+            r: float = rng.random()
+            if character.can_level_up() and r < 0.2:
+                character.level_up(rng.sample(["str", "end", "spe", "agi", "per", "int", "wil", "luc"], 3))
+            elif r < 0.7:
+                character.increase_skill(rng.choice(names), rng.randint(-1, 3))
+            elif r < 0.8:
+                character.set_skill_value(rng.choice(names), rng.randint(90, 100))
+            elif r < 0.9:
+                character.set_plan(rng.sample(["str", "end", "spe", "agi", "per", "int", "wil"], 3))
+            else:
+                character.set_attribute_value(rng.choice(["str", "end", "luc"]), rng.randint(30, 100))
+            states.append(encode_record(character))
+
+        for state in reversed(states[:-1]):
+            character.undo()
+            self.assertEqual(encode_record(character), state)
+            character.check_counters()
+        with self.assertRaisesRegex(ValueError, "Nothing to undo"):
+            character.undo()
+
+        for state in states[1:]:
+            character.redo()
+            self.assertEqual(encode_record(character), state)
+        with self.assertRaisesRegex(ValueError, "Nothing to redo"):
+            character.redo()
+
+        # A new change clears the redo stack
+        character.undo()
+        character.increase_skill("blade")
+        self.assertFalse(character.history.can_redo())
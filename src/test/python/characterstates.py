@@ -0,0 +1,59 @@
+from unittest import TestCase
+
+import numpy as np
+
+from character import Character, get_major_skills_increase, get_minor_skills_increase, get_skills_increase
+from characterstate import CharacterState
+
+
+def _new_character() -> Character:
+    character: Character = Character("tester", 3)
+    for name in ["blade", "blunt", "armorer", "block", "athletics", "security", "alchemy"]:
+        character.set_skill_mode(name, True)
+    character.set_skill_value("blunt", 100)
+    character.set_attribute_value("luck", 60)
+    character.increase_skill("blade", 4)
+    character.increase_skill("blunt", 2)
+    character.increase_skill("sneak", 7)
+    character.set_plan(["strength", "agility"])
+
+    return character
+
+
+class CharacterStateTest(TestCase):
+    def test_round_trip(self):
+        character: Character = _new_character()
+        copy: Character = CharacterState.from_character(character).to_character()
+
+        self.assertEqual(copy.get_name(), character.get_name())
+        self.assertEqual([a.name for a in copy.planned_attributes], [a.name for a in character.planned_attributes])
+        for a, b in zip(character.attributes, copy.attributes):
+            self.assertEqual((a.name, a.value), (b.name, b.value))
+            self.assertEqual([s.name for s in a.skills], [s.name for s in b.skills])
+        for a, b in zip(character.skills, copy.skills):
+            self.assertEqual((a.name, a.value, a.level_ups, a.is_major), (b.name, b.value, b.level_ups, b.is_major))
+            self.assertEqual(a.attribute.name, b.attribute.name)
+
+    def test_aggregates(self):
+        character: Character = _new_character()
+        state: CharacterState = CharacterState.from_character(character)
+
+        self.assertEqual(state.get_skills_increase(), get_skills_increase(character.skills))
+        self.assertEqual(state.get_major_skills_increase(), get_major_skills_increase(character.skills))
+        self.assertEqual(state.get_minor_skills_increase(), get_minor_skills_increase(character.skills))
+        self.assertEqual(list(state.get_attribute_gains()), [a.get_attribute_gain() for a in character.attributes])
+        self.assertEqual(list(state.get_remaining_skill_increases()),
+                         [character.get_remaining_skill_increase(skill) for skill in character.skills])
+
+    def test_batch(self):
+        state: CharacterState = CharacterState.from_character(_new_character())
+
+        level_ups: np.ndarray = np.random.default_rng(0).integers(0, 4, size=(1000, len(state.skill_names)))
+        gains: np.ndarray = state.get_attribute_gains(level_ups)
+        remaining: np.ndarray = state.get_remaining_skill_increases(level_ups)
+
+        self.assertEqual(gains.shape, (1000, len(state.attribute_names)))
+        self.assertEqual(remaining.shape, level_ups.shape)
+        for i in [0, 500, 999]:
+            self.assertEqual(list(gains[i]), list(state.get_attribute_gains(level_ups[i])))
+            self.assertEqual(list(remaining[i]), list(state.get_remaining_skill_increases(level_ups[i])))
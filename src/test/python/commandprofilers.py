@@ -0,0 +1,46 @@
+from typing import List
+from unittest import TestCase
+
+from character import Character
+from commandprofiler import CommandProfiler, LatencyHistogram
+from commands.basecommand import BaseCommand
+
+
+class _FailingCommand(BaseCommand):
+    def __init__(self):
+        super().__init__("fail")
+
+        self.add_alternative_name("f")
+
+    def _run(self, character: Character, args: List[str]):
+        if len(args) > 0:
+            raise ValueError("Failed")
+
+
+class CommandProfilerTest(TestCase):
+    def test_profiler(self):
+        profiler: CommandProfiler = CommandProfiler()
+        command: _FailingCommand = _FailingCommand()
+        character: Character = Character("tester")
+
+        profiler.run(command, "fail", character, [])
+        profiler.run(command, "f", character, [])
+        with self.assertRaises(ValueError):
+            profiler.run(command, "f", character, ["x"])
+
+        self.assertEqual((1, 0), (profiler.stats[("fail", "fail")].calls, profiler.stats[("fail", "fail")].exceptions))
+        self.assertEqual((2, 1), (profiler.stats[("fail", "f")].calls, profiler.stats[("fail", "f")].exceptions))
+        self.assertEqual(3, profiler.get_command_stats()["fail"].latency.count)
+
+        prometheus: str = profiler.to_prometheus()
+        self.assertIn('olm_command_calls_total{command="fail",alias="f"} 2', prometheus)
+        self.assertIn('olm_command_seconds_bucket{command="fail",alias="f",le="+Inf"} 2', prometheus)
+
+    def test_histogram(self):
+        histogram: LatencyHistogram = LatencyHistogram((1.0, 2.0))
+        for value in [0.5, 0.5, 1.5, 3.0]:
+            histogram.add(value)
+
+        self.assertEqual([2, 1, 1], histogram.counts)
+        self.assertEqual(1.0, histogram.get_quantile(0.5))
+        self.assertEqual(3.0, histogram.get_quantile(1.0))
@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+from character import Character
+from commands.basecommand import BaseCommand
+from commands.commandregistry import CommandRegistry, LazyCommand
+from commands.helpcommand import HelpCommand
+from commands.levelupcommand import LevelUpCommand
+from commands.quitcommand import QuitCommand
+from commands.savecommand import SaveCommand
+from oblivionlevelmanagercli import OblivionLevelManagerCLI
+
+
+class CommandRegistryTest(TestCase):
+    def test_find(self):
+        registry: CommandRegistry = CommandRegistry([LevelUpCommand(), QuitCommand()])
+
+        self.assertIsInstance(registry.find("up"), LevelUpCommand)
+        self.assertIsInstance(registry.find("exit"), QuitCommand)
+        with self.assertRaisesRegex(ValueError, "Command not found"):
+            registry.find("qu")
+
+    def test_collision(self):
+        registry: CommandRegistry = CommandRegistry([SaveCommand()])
+        command: QuitCommand = QuitCommand()
+        command.add_alternative_name("save")
+
+        with self.assertRaisesRegex(ValueError, "already used by command 'save'"):
+            registry.register(command)
+        self.assertEqual(len(registry.commands), 1)
+
+    def test_lazy(self):
+        registry: CommandRegistry = CommandRegistry([LazyCommand("commands.levelupcommand", "LevelUpCommand",
+                                                                 "level-up"),
+                                                     LazyCommand("commands.quitcommand", "QuitCommand", "exit")])
+
+        command: BaseCommand = registry.find("up")
+        self.assertIsInstance(command, LevelUpCommand)
+        self.assertIs(command, registry.find("level"))
+        # The registered name is not the name of the command
+        with self.assertRaisesRegex(ValueError, "was registered with names exit"):
+            registry.find("exit")
+
+    def test_cli_commands(self):
+        # Loads every command of the CLI, which checks their declared names
+        cli: OblivionLevelManagerCLI = OblivionLevelManagerCLI(Character("tester"))
+
+        self.assertEqual(len(cli.registry.commands), len(set([command.name for command in cli.registry.commands])))
+        self.assertIsInstance(cli.registry.find("help"), HelpCommand)
@@ -0,0 +1,58 @@
+import pickle
+from contextlib import redirect_stdout
+from io import StringIO
+from random import Random
+from unittest import TestCase
+
+from character import Character
+from commands.printcommand import _render_attributes, _render_plan, _render_skills, _render_summary, \
+    render_attributes, render_plan, render_skills, render_summary
+
+
+class RenderCacheTest(TestCase):
+    def assertFresh(self, character: Character):
+        # Cached sections are the same as sections rendered from scratch
+        self.assertEqual(render_summary(character), _render_summary(character))
+        self.assertEqual(render_attributes(character), _render_attributes(character))
+        self.assertEqual(render_skills(character), _render_skills(character))
+        self.assertEqual(render_plan(character), _render_plan(character))
+
+    def test_random_session(self):
+        rng: Random = Random(0)
+        character: Character = Character("tester")
+        skill_names = [skill.name for skill in character.skills]
+        attribute_names = ["str", "end", "spe", "agi", "per", "int", "wil", "luc"]
+
+        for _ in range(300):
+            r: float = rng.random()
+            if r < 0.5:
+                character.increase_skill(rng.choice(skill_names), rng.randint(-1, 3))
+            elif r < 0.6:
+                character.set_skill_value(rng.choice(skill_names), rng.randint(90, 100))
+            elif r < 0.7:
+                character.set_skill_mode(rng.choice(skill_names), rng.random() < 0.5)
+            elif r < 0.8:
+                character.set_attribute_value(rng.choice(attribute_names), rng.randint(30, 100))
+            elif r < 0.85:
+                character.set_level_value(rng.randint(1, 20))
+            elif r < 0.95:
+                character.set_plan(rng.sample(attribute_names[:-1], 3))
+            elif character.can_level_up():
+                with redirect_stdout(StringIO()):
+                    character.level_up(rng.sample(attribute_names, 3))
+
+            self.assertFresh(character)
+
+    def test_hit(self):
+        character: Character = Character("tester")
+        skills: str = render_skills(character)
+
+        self.assertIs(skills, render_skills(character))
+        character.set_attribute_value("luck", 60)
+        self.assertIs(skills, render_skills(character))
+        character.increase_skill("blade")
+        self.assertIsNot(skills, render_skills(character))
+
+        # The cache is not saved
+        self.assertNotIn(b"CHARACTER", pickle.dumps(character))
+        self.assertFresh(pickle.loads(pickle.dumps(character)))
@@ -0,0 +1,132 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from character import Character
+from journal import CommandJournal
+from oblivionlevelmanagercli import OblivionLevelManagerCLI
+from savefile import decode_record
+
+
+class CommandJournalTest(TestCase):
+    def test_recover(self):
+        with TemporaryDirectory() as tmp:
+            file: Path = Path(tmp) / "tester.olmj"
+            journal: CommandJournal = CommandJournal(file, group_size=4)
+            character: Character = Character("tester")
+            journal.start(character)
+            for i in range(10):
+                journal.append("inc blade " + str(i))
+            # Two full groups are committed, the rest is lost on a crash
+            self.assertEqual(2, journal.n_commits)
+            self.assertEqual(8, len(CommandJournal(file).recover()[1]))
+
+            character.set_attribute_value("str", 60)
+            journal.append_state(character)
+            journal.append("inc sneak 1")
+            journal.close()
+            checkpoint, command_strs = CommandJournal(file).recover()
+            self.assertEqual(60, decode_record(checkpoint).attributes[0].value)
+            self.assertEqual(["inc sneak 1"], command_strs)
+
+            # An entry that was not completely written ends the journal
+            with open(file, "r+b") as f:
+                f.truncate(file.stat().st_size - 1)
+            self.assertEqual([], CommandJournal(file).recover()[1])
+
+    def test_checkpoint(self):
+        with TemporaryDirectory() as tmp:
+            file: Path = Path(tmp) / "tester.olmj"
+            journal: CommandJournal = CommandJournal(file, checkpoint_interval=5)
+            character: Character = Character("tester")
+            journal.start(character)
+            for i in range(5):
+                journal.append("inc blade 1")
+            self.assertTrue(journal.is_checkpoint_due())
+            character.set_level_value(3)
+            journal.checkpoint(character)
+            journal.close()
+
+            checkpoint, command_strs = journal.recover()
+            self.assertEqual(3, decode_record(checkpoint).level)
+            self.assertEqual([], command_strs)
+            journal.close(delete=True)
+            self.assertFalse(file.exists())
+
+    def test_lock(self):
+        with TemporaryDirectory() as tmp:
+            file: Path = Path(tmp) / "tester.olmj"
+            journal: CommandJournal = CommandJournal(file)
+            self.assertTrue(journal.lock())
+            self.assertFalse(CommandJournal(file).lock())
+            journal.close(delete=True)
+            self.assertFalse(journal.lock_file.exists())
+            self.assertTrue(CommandJournal(file).lock())
+
+
+class CLIRecoveryTest(TestCase):
+    def test_recover(self):
+        with TemporaryDirectory() as tmp, redirect_stdout(StringIO()):
+            path: Path = Path(tmp)
+            cli: OblivionLevelManagerCLI = OblivionLevelManagerCLI(Character("tester"), path, journal_group_size=1)
+            cli.run_script("set skill blade major; inc blade 10; level-up str end spe; inc sneak 2; undo")
+            # A crash: the session is not ended
+            cli.close()
+
+            cli = OblivionLevelManagerCLI(Character("tester"), path, journal_group_size=1)
+            self.assertEqual(0, cli.recover())
+            self.assertEqual(2, cli.character.level)
+            self.assertEqual(55, cli.character.attributes[0].value)
+            # The journal is replaced by a checkpoint of the recovered state
+            checkpoint, command_strs = CommandJournal(path / "tester.olmj").recover()
+            self.assertEqual(2, decode_record(checkpoint).level)
+            self.assertEqual([], command_strs)
+            cli.end_session()
+            self.assertFalse((path / "tester.olmj").exists())
+
+    def test_recover_in_use(self):
+        with TemporaryDirectory() as tmp, redirect_stdout(StringIO()):
+            path: Path = Path(tmp)
+            cli: OblivionLevelManagerCLI = OblivionLevelManagerCLI(Character("tester"), path, journal_group_size=1)
+            cli.run_script("inc blade 1")
+
+            # Another session neither recovers nor replaces the journal of a running session
+            other: OblivionLevelManagerCLI = OblivionLevelManagerCLI(Character("tester"), path, journal_group_size=1)
+            self.assertEqual(0, other.recover())
+            other.run_script("inc blade 1")
+            self.assertIn("tester", other.unjournaled)
+            other.end_session()
+            cli.run_script("inc blade 1")
+            cli.close()
+            self.assertEqual(["inc blade 1", "inc blade 1"], CommandJournal(path / "tester.olmj").recover()[1])
+
+    def test_recover_failure(self):
+        with TemporaryDirectory() as tmp, redirect_stdout(StringIO()):
+            file: Path = Path(tmp) / "tester.olmj"
+            journal: CommandJournal = CommandJournal(file, group_size=1)
+            journal.start(Character("tester"))
+            journal.append("inc blade 1")
+            journal.append("fly")
+            journal.close()
+
+            # The journal is kept
+            cli: OblivionLevelManagerCLI = OblivionLevelManagerCLI(Character("tester"), Path(tmp), journal_group_size=1)
+            self.assertEqual(0, cli.recover())
+            self.assertEqual(["inc blade 1", "fly"], CommandJournal(file).recover()[1])
+            cli.run_script("inc blade 1")
+            cli.end_session()
+            self.assertTrue(file.exists())
+
+    def test_journal_failure(self):
+        # The journal never blocks a command
+        with TemporaryDirectory() as tmp, redirect_stdout(StringIO()) as out:
+            for character, path in [(Character("x" * 65), Path(tmp)), (Character("tester"), Path(tmp) / "missing")]:
+                cli: OblivionLevelManagerCLI = OblivionLevelManagerCLI(character, path, journal_group_size=1)
+                cli.run_script("inc blade 2; inc blade 1")
+                self.assertEqual(3, cli.character.skills[0].level_ups)
+                self.assertEqual({character.name}, cli.unjournaled)
+                cli.end_session()
+            self.assertEqual(2, out.getvalue().count("Warning: "))
+            self.assertEqual([], list(Path(tmp).iterdir()))
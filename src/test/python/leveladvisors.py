@@ -0,0 +1,47 @@
+from itertools import combinations
+from random import Random
+from unittest import TestCase
+
+from character import Character
+from leveladvisor import LevelUpAdvisor
+
+
+class LevelUpAdvisorTest(TestCase):
+    def test_random_session(self):
+        rng: Random = Random(0)
+        character: Character = Character("tester")
+        for name in ["blade", "blunt", "armorer", "block", "athletics", "security", "alchemy"]:
+            character.set_skill_mode(name, True)
+        names = [skill.name for skill in character.skills]
+        advisor: LevelUpAdvisor = LevelUpAdvisor(character)
+
+        for _ in range(300):
+            if character.can_level_up() and rng.random() < 0.3:
+                best, _ = advisor.get_ranking(1)[0]
+                character.level_up([attribute.name for attribute in best])
+            elif rng.random() < 0.1 and character.history.can_undo():
+                character.undo()
+            else:
+                character.increase_skill(rng.choice(names), rng.randint(0, 3))
+            advisor.refresh(character)
+
+            ranking = advisor.get_ranking()
+            self.assertEqual(len(ranking), 56)
+            expected = sorted([sum([attribute.get_attribute_gain() for attribute in triple])
+                               for triple in combinations(character.attributes, 3)], reverse=True)
+            self.assertEqual([total for _, total in ranking], expected)
+            for triple, total in ranking:
+                self.assertEqual(sum([attribute.get_attribute_gain() for attribute in triple]), total)
+
+    def test_next_increase(self):
+        character: Character = Character("tester")
+        advisor: LevelUpAdvisor = LevelUpAdvisor(character)
+        strength = character.attributes[0]
+
+        self.assertEqual(advisor.get_next_increase(strength)[:2], (1, 2))
+        character.increase_skill("blade", 6)
+        self.assertEqual(advisor.get_next_increase(strength)[:2], (2, 4))
+        character.increase_skill("blade", 4)
+        self.assertIsNone(advisor.get_next_increase(strength))
+        # Luck has no skills
+        self.assertIsNone(advisor.get_next_increase(character.attributes[-1]))
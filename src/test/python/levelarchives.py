@@ -0,0 +1,61 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from catalog import Catalog
+from character import Character
+from levelarchive import LevelArchive, load_level, save_level
+from savefile import save_character
+
+
+class LevelArchiveTest(TestCase):
+    def test_archive(self):
+        with TemporaryDirectory() as tmp:
+            path: Path = Path(tmp)
+            character: Character = Character("tester")
+            for level in [1, 2, 3]:
+                character.set_level_value(level)
+                character.set_attribute_value("str", 40 + level)
+                file, offset = save_level(path, character)
+            self.assertEqual(file.name, "tester.olma")
+
+            archive: LevelArchive = LevelArchive(file)
+            self.assertEqual(list(archive.get_levels().keys()), [1, 2, 3])
+            self.assertEqual(archive.get_levels()[3], offset)
+            self.assertEqual(archive.read_level(2).attributes[0].value, 42)
+            self.assertRaises(ValueError, archive.read_level, 4)
+
+            # Saving a level again replaces it
+            character.set_attribute_value("str", 60)
+            archive.append(character)
+            self.assertEqual(archive.read_level(3).attributes[0].value, 60)
+            self.assertEqual(archive.read_level(1).attributes[0].value, 41)
+
+            # A level beyond the table grows the archive
+            character.set_level_value(100)
+            archive.append(character)
+            self.assertEqual(list(archive.get_levels().keys()), [1, 2, 3, 100])
+            self.assertEqual(load_level(file, 3).attributes[0].value, 60)
+            self.assertEqual([character.level for character in archive.read_levels([100, 2]).values()], [100, 2])
+
+            # An interrupted save (the record was written but not the slot) leaves the archive as it was
+            with open(file, "ab") as f:
+                f.write(b"\0" * 50)
+            self.assertEqual(archive.read_level(100).level, 100)
+
+            # A corrupted record is detected
+            data: bytearray = bytearray(file.read_bytes())
+            data[archive.get_levels()[2] + 20] ^= 0xFF
+            file.write_bytes(bytes(data))
+            self.assertRaises(ValueError, archive.read_level, 2)
+
+    def test_catalog(self):
+        with TemporaryDirectory() as tmp:
+            path: Path = Path(tmp)
+            save_character(Character("tester", 1), path / "tester_lvl01.olm")
+            save_character(Character("tester", 2), path / "tester_lvl02.olm")
+            save_level(path, Character("tester", 2))
+
+            # The archive takes precedence over the save file of the same level
+            self.assertEqual({level: file.name for level, file in Catalog(path).get_levels("tester").items()},
+                             {1: "tester_lvl01.olm", 2: "tester.olma"})
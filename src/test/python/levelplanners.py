@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from character import Character
+from levelplanner import LevelPlanner
+
+
+def _new_character() -> Character:
+    character: Character = Character("tester")
+    for name in ["blade", "blunt", "armorer", "block", "athletics", "security", "alchemy"]:
+        character.set_skill_mode(name, True)
+
+    return character
+
+
+class LevelPlannerTest(TestCase):
+    def test_no_major_skills(self):
+        self.assertEqual(LevelPlanner(Character("tester")).solve(), [])
+
+    def test_best_gain(self):
+        character: Character = _new_character()
+        character.increase_skill("blade", 3)
+        character.increase_skill("sneak", 2)
+
+        plans = LevelPlanner(character).solve()
+
+        self.assertTrue(len(plans) > 0)
+        for plan in plans:
+            self.assertEqual(plan.get_total_gain(), 15)
+        increases = [plan.get_total_skill_increase() for plan in plans]
+        self.assertEqual(increases, sorted(increases))
+        self.assertEqual(plans[0].get_total_skill_increase(), 25)
+
+    def test_plan_is_applicable(self):
+        character: Character = _new_character()
+        character.increase_skill("blunt", 4)
+
+        plan = LevelPlanner(character).solve()[0]
+        for skill, n in plan.skill_increases:
+            character.increase_skill(skill.name, n)
+
+        self.assertTrue(character.can_level_up())
+        self.assertEqual([attribute.get_attribute_gain() for attribute in plan.attributes], plan.gains)
+
+    def test_attribute_cap(self):
+        character: Character = _new_character()
+        character.set_attribute_value("strength", 98)
+
+        plan = LevelPlanner(character).solve()[0]
+
+        self.assertNotIn("Strength", plan.get_attribute_names())
@@ -0,0 +1,91 @@
+import pickle
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from character import Character
+from savefile import check_character_name, convert_pickle, decode_character, encode_character, load_character, \
+    parse_save_file_name, save_character
+
+# Saves of the pickle format, written by the original (non-slotted) classes
+LEGACY_SAVES: Path = Path(__file__).resolve().parents[3] / "res" / "test" / "saves"
+
+
+def _new_character() -> Character:
+    character: Character = Character("tester", 7)
+    character.set_skill_mode("blade", True)
+    character.set_skill_value("blade", 42)
+    character.set_attribute_value("luck", 63)
+    character.increase_skill("blade", 3)
+    character.increase_skill("sneak", -1)
+    character.set_plan(["str", "agi"])
+
+    return character
+
+
+class SaveFileTest(TestCase):
+    def assertSameCharacter(self, a: Character, b: Character):
+        self.assertEqual(a.get_name(), b.get_name())
+        self.assertEqual([(s.name, s.value, s.level_ups, s.is_major) for s in a.skills],
+                         [(s.name, s.value, s.level_ups, s.is_major) for s in b.skills])
+        self.assertEqual([(x.name, x.value) for x in a.attributes], [(x.name, x.value) for x in b.attributes])
+        self.assertEqual([x.name for x in a.planned_attributes], [x.name for x in b.planned_attributes])
+        b.check_counters()
+
+    def test_round_trip(self):
+        character: Character = _new_character()
+
+        self.assertSameCharacter(character, decode_character(encode_character(character)))
+
+    def test_checksum(self):
+        data: bytearray = bytearray(encode_character(_new_character()))
+        data[-1] ^= 0xFF
+
+        with self.assertRaisesRegex(ValueError, "checksum"):
+            decode_character(data)
+        with self.assertRaisesRegex(ValueError, "truncated"):
+            decode_character(data[:-1])
+
+    def test_files(self):
+        character: Character = _new_character()
+
+        with TemporaryDirectory() as tmp:
+            path: Path = Path(tmp)
+            # Pickled by the slotted classes
+            with open(path / "tester_lvl06.pickle", "wb") as f:
+                pickle.dump(character, f)
+            save_character(character, path / "tester_lvl07.olm")
+
+            self.assertSameCharacter(character, load_character(path / "tester_lvl06.pickle"))
+            self.assertSameCharacter(character, load_character(path / "tester_lvl07.olm"))
+            self.assertSameCharacter(character, load_character(convert_pickle(path / "tester_lvl06.pickle")))
+
+    def test_legacy_pickle(self):
+        character: Character = load_character(LEGACY_SAVES / "legacy_lvl03.pickle")
+        character.check_counters()
+        self.assertEqual((character.name, character.level), ("legacy", 3))
+        skills = {skill.name: skill for skill in character.skills}
+        self.assertEqual((skills["Blade"].value, skills["Blade"].level_ups, skills["Blade"].is_major), (42, 3, True))
+        self.assertEqual(skills["Sneak"].level_ups, 2)
+        self.assertEqual(character.attributes[-1].value, 63)
+        self.assertEqual([x.name for x in character.planned_attributes], ["Strength", "Agility"])
+        self.assertSameCharacter(character, decode_character(encode_character(character)))
+
+        # Changes are recorded in the (rebuilt) history
+        character.increase_skill("blade", 1)
+        character.undo()
+        self.assertEqual(skills["Blade"].level_ups, 3)
+
+    def test_names(self):
+        check_character_name("x" * 64)
+        self.assertRaises(ValueError, check_character_name, "")
+        self.assertRaises(ValueError, check_character_name, "x" * 65)
+        for name in ["../x", "a/b", "a\\b", ".."]:
+            self.assertRaises(ValueError, check_character_name, name)
+        self.assertRaises(ValueError, encode_character, Character("x" * 65))
+
+    def test_file_names(self):
+        self.assertEqual(parse_save_file_name("tester_lvl06.pickle"), ("tester", 6))
+        self.assertEqual(parse_save_file_name("my_lvl_lvl12.olm"), ("my_lvl", 12))
+        self.assertIsNone(parse_save_file_name("tester_lvlxx.olm"))
+        self.assertIsNone(parse_save_file_name("tester_lvl01.txt"))
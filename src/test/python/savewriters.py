@@ -0,0 +1,38 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from catalog import Catalog
+from character import Character
+from levelarchive import LevelArchive
+from savewriter import SaveWriter
+
+
+class SaveWriterTest(TestCase):
+    def test_writer(self):
+        with TemporaryDirectory() as tmp:
+            path: Path = Path(tmp)
+            writer: SaveWriter = SaveWriter(path)
+            character: Character = Character("tester")
+            for value in range(40, 60):
+                character.set_attribute_value("str", value)
+                self.assertEqual(path / "tester.olma", writer.submit(character))
+            # The save is a snapshot: later changes are not saved
+            character.set_attribute_value("str", 99)
+            character.set_level_value(2)
+            writer.submit(character)
+            self.assertEqual([], writer.close())
+
+            self.assertEqual(59, LevelArchive(path / "tester.olma").read_level(1).attributes[0].value)
+            self.assertEqual([1, 2], list(Catalog(path).get_levels("tester").keys()))
+            stats = writer.get_stats()
+            self.assertEqual(stats["submitted"], stats["coalesced"] + stats["written"])
+            self.assertRaises(RuntimeError, writer.submit, character)
+
+    def test_errors(self):
+        with TemporaryDirectory() as tmp:
+            writer: SaveWriter = SaveWriter(Path(tmp) / "missing")
+            writer.submit(Character("tester"))
+            self.assertTrue(writer.flush(10))
+            self.assertEqual(1, len(writer.pop_errors()))
+            self.assertEqual([], writer.close())
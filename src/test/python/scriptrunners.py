@@ -0,0 +1,33 @@
+from io import StringIO
+from typing import List
+from unittest import TestCase
+
+from scriptrunner import ErrorPolicy, iter_script_commands, run_commands, ScriptReport
+
+
+def _run_command(command_str: str):
+    if command_str.startswith("bad"):
+        raise ValueError("Bad command: " + command_str)
+
+
+class ScriptRunnerTest(TestCase):
+    def test_iter_script_commands(self):
+        script: str = "inc blade 1; inc sneak 2\n\n  print all ;\nlevelup\nquit"
+        expected: List[str] = ["inc blade 1", "inc sneak 2", "print all", "levelup", "quit"]
+
+        # Commands split across chunks are put back together
+        for chunk_size in [1, 3, 7, 1 << 16]:
+            self.assertEqual(expected, list(iter_script_commands(StringIO(script), chunk_size)))
+
+    def test_error_policies(self):
+        command_strs: List[str] = ["ok 1", "bad 1", "ok 2", "bad 2"]
+
+        report: ScriptReport = run_commands(iter(command_strs), _run_command, ErrorPolicy.STOP)
+        self.assertEqual((2, 1, True), (report.n_commands, report.n_errors, report.stopped))
+
+        report = run_commands(iter(command_strs), _run_command, ErrorPolicy.SKIP)
+        self.assertEqual((4, 2, False), (report.n_commands, report.n_errors, report.stopped))
+
+        report = run_commands(iter(command_strs), _run_command, ErrorPolicy.COLLECT)
+        self.assertEqual([(2, "bad 1", "Bad command: bad 1"), (4, "bad 2", "Bad command: bad 2")], report.errors)
+        self.assertIn("bad 2", report.get_summary(with_errors=True))
@@ -0,0 +1,111 @@
+import asyncio
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase
+
+from character import Character
+from levelarchive import LevelArchive
+from savefile import get_save_file_name, save_character
+from server import APPLICATION_ERROR, CharacterServer, INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR
+
+
+class CharacterServerTest(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp: TemporaryDirectory = TemporaryDirectory()
+        self.path: Path = Path(self.tmp.name)
+        character: Character = Character("tester")
+        character.set_skill_mode("blade", True)
+        save_character(character, self.path / get_save_file_name(character))
+
+        self.server: CharacterServer = CharacterServer(self.path)
+        self.socket_path: Path = self.path / "server.sock"
+        await self.server.start(self.socket_path)
+        self.reader, self.writer = await asyncio.open_unix_connection(str(self.socket_path))
+        self.next_id: int = 0
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.server.close()
+        self.tmp.cleanup()
+
+    async def request(self, method: str, **params) -> dict:
+        self.next_id += 1
+        request: dict = {"jsonrpc": "2.0", "id": self.next_id, "method": method, "params": params}
+        self.writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+        response: dict = json.loads(await self.reader.readline())
+        self.assertEqual(response["id"], self.next_id)
+
+        return response
+
+    async def test_methods(self):
+        response: dict = await self.request("increase_skill", name="tester", skill="blade", value=10)
+        self.assertTrue(response["result"]["can_level_up"])
+
+        response = await self.request("level_up", name="tester", attributes=["str", "end", "spe"])
+        self.assertEqual(response["result"]["level"], 2)
+        self.assertEqual(response["result"]["attributes"][0]["value"], 55)
+
+        response = await self.request("save", name="tester")
+        self.assertEqual(response["result"], "tester.olma")
+        self.assertEqual(list(LevelArchive(self.path / "tester.olma").get_levels().keys()), [2])
+
+        await self.request("undo", name="tester")
+        self.assertEqual((await self.request("get_character", name="tester"))["result"]["level"], 1)
+
+    async def test_errors(self):
+        self.assertEqual((await self.request("fly", name="tester"))["error"]["code"], METHOD_NOT_FOUND)
+        self.assertEqual((await self.request("increase_skill", name="tester"))["error"]["code"], INVALID_PARAMS)
+        self.assertEqual((await self.request("increase_skill", name="tester", skill="blade", value="1"))["error"]
+                         ["code"], INVALID_PARAMS)
+        self.assertEqual((await self.request("level_up", name="tester", attributes=["str", "end", "spe"]))["error"]
+                         ["code"], APPLICATION_ERROR)
+        self.assertEqual((await self.request("get_character", name="nobody"))["error"]["code"], APPLICATION_ERROR)
+        for name in ["", "../x", "a/b", "a\\b", "x" * 65]:
+            self.assertEqual((await self.request("new", name=name))["error"]["code"], INVALID_PARAMS)
+        self.assertEqual((await self.request("increase_skill", name="tester", skill=5))["error"]["code"],
+                         INVALID_PARAMS)
+        for attributes in [["str", "str", "end"], ["str", "end"]]:
+            self.assertEqual((await self.request("level_up", name="tester", attributes=attributes))["error"]["code"],
+                             INVALID_PARAMS)
+        self.assertEqual((await self.request("set_plan", name="tester", attributes=["str", "fly"]))["error"]["code"],
+                         APPLICATION_ERROR)
+        # Only the characters in memory keep a lock
+        self.assertEqual(list(self.server._locks.keys()), ["tester"])
+
+        self.writer.write(b"{not json\n")
+        self.assertEqual(json.loads(await self.reader.readline())["error"]["code"], PARSE_ERROR)
+
+    async def test_concurrent_clients(self):
+        await self.request("new", name="other")
+
+        async def client(name: str, n: int):
+            reader, writer = await asyncio.open_unix_connection(str(self.socket_path))
+            for i in range(n):
+                writer.write(json.dumps({"jsonrpc": "2.0", "id": i, "method": "increase_skill",
+                                         "params": [name, "sneak", 1]}).encode("utf-8") + b"\n")
+                await writer.drain()
+                self.assertIn("result", json.loads(await reader.readline()))
+            writer.close()
+
+        await asyncio.gather(*[client(name, 25) for name in ["tester", "other"] * 4])
+
+        for name in ["tester", "other"]:
+            skills = (await self.request("get_character", name=name))["result"]["skills"]
+            self.assertEqual([skill["level_ups"] for skill in skills if skill["name"] == "Sneak"], [100])
+
+    async def test_suggest(self):
+        await self.request("increase_skill", name="tester", skill="blade", value=4)
+        suggestions: list = (await self.request("suggest", name="tester", n=1))["result"]
+        self.assertEqual(suggestions[0]["attributes"][0], "Strength")
+        self.assertIn({"attribute": "Strength", "skills_increase": 1, "gain": 3}, suggestions[0]["next_increases"])
+
+        await self.request("increase_skill", name="tester", skill="blade", value=1)
+        suggestions = (await self.request("suggest", name="tester", n=1))["result"]
+        self.assertEqual(suggestions[0]["total_gain"], 5)
+
+        await self.request("unload", name="tester")
+        self.assertEqual(self.server._locks, {})
+        self.assertEqual(self.server._advisors, {})
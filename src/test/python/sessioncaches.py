@@ -0,0 +1,62 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List
+from unittest import TestCase
+
+from character import Character
+from levelarchive import LevelArchive
+from savefile import get_save_file_name, save_character
+from sessioncache import SessionCache
+
+
+class SessionCacheTest(TestCase):
+    def setUp(self):
+        self.tmp: TemporaryDirectory = TemporaryDirectory()
+        self.path: Path = Path(self.tmp.name)
+        for name in ["a", "b", "c"]:
+            character: Character = Character(name)
+            save_character(character, self.path / get_save_file_name(character))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lru_write_back(self):
+        evicted: List[str] = []
+        cache: SessionCache = SessionCache(self.path, 2, on_evict=evicted.append)
+
+        a: Character = cache.get("a")
+        self.assertIs(a, cache.get("a"))
+        a.increase_skill("blade", 3)
+        cache.get("b")
+        # 'a' is the least recently used: it is written back and dropped
+        cache.get("c")
+        self.assertEqual(["b", "c"], list(cache.characters.keys()))
+        self.assertEqual(["a"], evicted)
+        self.assertEqual(3, LevelArchive(self.path / "a.olma").read_level(1).skills[0].level_ups)
+        self.assertEqual({"size": 2, "hits": 1, "misses": 3, "evictions": 1, "write_backs": 1}, cache.get_stats())
+
+        # Not dirty: dropped without writing
+        cache.get("a")
+        self.assertEqual(1, cache.write_backs)
+        self.assertRaises(ValueError, cache.get, "nobody")
+
+    def test_dirty(self):
+        cache: SessionCache = SessionCache(self.path, write_back_interval=0)
+        b: Character = cache.get("b")
+        b.increase_skill("sneak")
+        self.assertEqual(["b"], cache.get_dirty())
+        b.undo()
+        self.assertEqual([], cache.get_dirty())
+
+        cache.put(Character("d"))
+        b.set_level_value(3)
+        self.assertEqual(["b.olma", "d.olma"], sorted([file.name for file in cache.write_back_due()]))
+        self.assertEqual([], cache.get_dirty())
+        self.assertEqual([1, 3], list(cache.catalog.get_levels("b").keys()))
+
+    def test_can_evict(self):
+        cache: SessionCache = SessionCache(self.path, 1, can_evict=lambda name: name != "a")
+        cache.get("a")
+        cache.get("b")
+        cache.get("c")
+        self.assertEqual(["a", "c"], list(cache.characters.keys()))
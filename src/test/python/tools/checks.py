@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from character import Character, get_skills_increase, set_counter_checks
+from commands.printcommand import PrintCommand
+from oblivionlevelmanagercli import OblivionLevelManagerCLI
+from scriptrunner import ErrorPolicy, ScriptReport
+from tools.checks import check_typed_list, get_validation_mode, set_validation_mode, ValidationMode
+
+
+class ValidationModeTest(TestCase):
+    def setUp(self):
+        self.mode: ValidationMode = get_validation_mode()
+
+    def tearDown(self):
+        set_validation_mode(self.mode)
+
+    def test_modes(self):
+        set_validation_mode(ValidationMode.FULL)
+        self.assertFalse(check_typed_list([1], str))
+        self.assertFalse(check_typed_list([1], str, boundary=True))
+
+        set_validation_mode(ValidationMode.BOUNDARY)
+        self.assertTrue(check_typed_list([1], str))
+        self.assertFalse(check_typed_list([1], str, boundary=True))
+
+        set_validation_mode(ValidationMode.OFF)
+        self.assertTrue(check_typed_list([1], str))
+        self.assertTrue(check_typed_list([1], str, boundary=True))
+
+    def test_boundary(self):
+        set_validation_mode(ValidationMode.BOUNDARY)
+
+        # Command arguments are input; internal calls are trusted
+        with self.assertRaises(AssertionError):
+            PrintCommand().run(Character("tester"), [1])
+        self.assertEqual(get_skills_increase([]), 0)
+
+    def test_full_session(self):
+        set_validation_mode(ValidationMode.FULL)
+        set_counter_checks(True)
+        try:
+            with self.assertRaises(AssertionError):
+                get_skills_increase([None])
+
+            cli: OblivionLevelManagerCLI = OblivionLevelManagerCLI(Character("tester"))
+            report: ScriptReport = cli.run_commands(iter(["increase blade 3", "inc sneak 2", "set skill athletics 40",
+                                                          "plan str end agi", "print all", "help"]),
+                                                    ErrorPolicy.COLLECT)
+        finally:
+            set_counter_checks(False)
+
+        self.assertEqual(report.n_errors, 0)
+        self.assertEqual(report.n_commands, 6)
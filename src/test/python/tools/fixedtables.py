@@ -0,0 +1,49 @@
+from random import Random
+from typing import List
+from unittest import TestCase
+
+from tabulate import tabulate
+
+from tools.common import tabulated_with_centered_header
+from tools.fixedtable import Cell, FixedTable, LEFT, NUMERIC, RIGHT, styled
+from tools.formatting import BColors
+
+
+def _random_cell(rng: Random, align: str) -> Cell:
+    r: float = rng.random()
+    if r < 0.2:
+        return None
+    if align == LEFT:
+        name: str = rng.choice(["Blade", "Hand to Hand", "Luck", "x"])
+        return styled(name, BColors.BOLD) if r < 0.5 else name
+    n: int = rng.randint(-20, 150)
+    if r < 0.4:
+        return styled(str(n), [BColors.ITALIC, BColors.FAIL])
+    if r < 0.6:
+        return "+" + str(n) if n >= 0 else str(n)
+
+    return n
+
+
+class FixedTableTest(TestCase):
+    def test_same_as_tabulate(self):
+        rng: Random = Random(0)
+        for _ in range(500):
+            n_columns: int = rng.randint(1, 6)
+            aligns: List[str] = [rng.choice([LEFT, NUMERIC]) for _ in range(n_columns)]
+            colalign = None
+            if rng.random() < 0.3:
+                aligns[0] = RIGHT
+                colalign = ("right",)
+            headers = None
+            if rng.random() < 0.7:
+                headers = [rng.choice(["Attribute", "pts", "inc", "pts@12", "a"]) for _ in range(n_columns)]
+            rows: List[List[Cell]] = [[_random_cell(rng, align) for align in aligns]
+                                      for _ in range(rng.randint(1, 25))]
+
+            plain_rows = [[cell[0] if isinstance(cell, tuple) else cell for cell in row] for row in rows]
+            expected: str = tabulate(plain_rows, headers=() if headers is None else headers, colalign=colalign)
+
+            table: FixedTable = FixedTable(aligns)
+            self.assertEqual(expected, table.render(rows, headers))
+            self.assertEqual(tabulated_with_centered_header(expected, "TITLE"), table.render(rows, headers, "TITLE"))
@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from tools.namedobject import NamedObject, NameIndex, find_by_name
+
+
+class NameIndexTest(TestCase):
+    def setUp(self):
+        self.objects = [NamedObject(name) for name in ["Blade", "Blunt", "Block", "Alchemy", "Alteration", "Athletics"]]
+        self.index = NameIndex(self.objects, "skill")
+
+    def test_find(self):
+        for name in ["bl", "BLA", "al", "alt", "Athletics", "xyz", "athleticss"]:
+            self.assertEqual(self.index.find(name), find_by_name(self.objects, name))
+
+    def test_find_unique(self):
+        self.assertEqual(self.index.find_unique("blu"), 1)
+        self.assertEqual(self.index.get_unique("ALC").name, "Alchemy")
+        self.assertEqual([obj.name for obj in self.index.get_unique_by_names(["bla", "blo", "at"])],
+                         ["Blade", "Block", "Athletics"])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.index.find_unique("b")
+        with self.assertRaisesRegex(ValueError, "Cannot find skill"):
+            self.index.find_unique("xyz")
+        with self.assertRaisesRegex(ValueError, r"Multiple skill found matching: bl \(Blade, Blunt, Block\)"):
+            self.index.find_unique("bl")